@@ -0,0 +1,76 @@
+"""
+Draft engine throughput on a synthetic board (benchmarks.mock_api players
+with season-long projections): latency of each live pick (board update)
+and recommendation through a full snake draft, then mock drafts per second
+as the process pool grows.
+
+    python -m benchmarks.draft --board 320 --mock 4000 --workers 1,2,4
+"""
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.leagues import default_workers
+from benchmarks.mock_api import generate_fixtures
+from draft import DraftBoard, mock_drafts
+from lineup_optimizer import POSITION_CODES, normalize_position
+
+DST_TEAMS = 32
+
+
+def build_board(size, teams, seed):
+    """The top `size` mock players by projection plus one D/ST per NFL team (the mock dump has none)"""
+    rng = random.Random(seed)
+    fixtures = generate_fixtures(max(size * 4, 2000), seed)
+    dump = fixtures['/sleeper/players/nfl']
+    projections = next(value for key, value in fixtures.items() if key.startswith('/sleeper/projections/nfl/regular'))
+    players = sorted(
+        ((player_id, record) for player_id, record in dump.items() if record['team']),
+        key=lambda item: -projections[item[0]]['pts_ppr']
+    )[:size - DST_TEAMS]
+    ids = [player_id for player_id, _ in players] + [f"DST{i}" for i in range(DST_TEAMS)]
+    positions = [POSITION_CODES[normalize_position(record['position'])] for _, record in players] + \
+        [POSITION_CODES['D/ST']] * DST_TEAMS
+    points = [projections[player_id]['pts_ppr'] * 17 for player_id, _ in players] + \
+        [rng.uniform(80, 160) for _ in range(DST_TEAMS)]
+    return DraftBoard(ids, positions, points, teams=teams)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live draft updates and mock draft throughput")
+    parser.add_argument('--board', type=int, default=320)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--mock', type=int, default=4000)
+    parser.add_argument('--workers', help="comma-separated worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    board = build_board(args.board, args.teams, args.seed)
+    updates, recommendations = [], []
+    while board.on_clock() is not None:
+        start = time.perf_counter()
+        best = board.recommend(limit=10)
+        recommendations.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        board.pick(best[0]['player_id'])
+        updates.append(time.perf_counter() - start)
+
+    def us(values, q):
+        return round(statistics.quantiles(values, n=100)[q - 1] * 1e6, 1)
+
+    print(f"{len(board)} players, {board.teams} teams x {board.rounds} rounds ({len(updates)} picks)")
+    print(f"{'step':16} {'p50 us':>8} {'p99 us':>8}")
+    for name, values in (('pick + re-rank', updates), ('recommend', recommendations)):
+        print(f"{name:16} {us(values, 50):>8} {us(values, 99):>8}")
+
+    board.reset()
+    worker_counts = [int(count) for count in args.workers.split(',')] if args.workers else default_workers()
+    print(f"\n{'workers':>8} {'drafts':>8} {'seconds':>9} {'drafts/s':>9}")
+    for workers in worker_counts:
+        result = mock_drafts(board, args.mock, args.seed, processes=workers)
+        print(f"{workers:>8} {result['drafts']:>8} {result['elapsed_seconds']:>9} {result['drafts_per_second']:>9}")
+
+
+if __name__ == "__main__":
+    main()
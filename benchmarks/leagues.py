@@ -0,0 +1,78 @@
+"""
+Multi-league batch throughput (league_batch.LeagueBatchRunner) as the
+process pool grows. Rosters come from benchmarks.mock_api and are fetched
+once; each worker count then re-runs the analysis of every league.
+
+    python -m benchmarks.leagues --leagues 48 --workers 1,2,4,8
+"""
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.mock_api import MockApiServer, generate_fixtures, league_ids
+from benchmarks.run import make_data_manager
+from league_batch import LeagueBatchRunner
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+
+def default_workers():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leagues per second as the batch runner scales across processes")
+    parser.add_argument('--leagues', type=int, default=48)
+    parser.add_argument('--players', type=int, default=3000)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--workers', help="comma-separated worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument('--max-trade-players', type=int, default=2)
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(',')] if args.workers else default_workers()
+    leagues = league_ids(args.leagues)
+    server = MockApiServer(generate_fixtures(args.players, leagues=args.leagues, teams=args.teams), latency=0, jitter=0)
+
+    results = {}
+    with server, tempfile.TemporaryDirectory() as workdir:
+        data_manager = make_data_manager(server, workdir)
+        try:
+            for workers in worker_counts:
+                with LeagueBatchRunner(data_manager, workers, max_trade_players=args.max_trade_players) as runner:
+                    results[workers] = runner.run(leagues)['stats']
+        finally:
+            data_manager.close()
+
+    base = results[worker_counts[0]]['leagues_per_second']
+    print(f"{args.leagues} leagues x {args.teams} teams, {args.players} players "
+          f"({results[worker_counts[0]]['shared_bytes'] / 1024:.0f} KB shared)")
+    print(f"{'workers':>8} {'seconds':>9} {'leagues/s':>10} {'speedup':>8}")
+    for workers, stats in results.items():
+        print(f"{workers:>8} {stats['analysis_seconds']:>9} {stats['leagues_per_second']:>10} "
+              f"{stats['leagues_per_second'] / base:>7.2f}x")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"leagues-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'config': vars(args),
+                'cpus': os.cpu_count(),
+                'benchmarks': {str(workers): stats for workers, stats in results.items()}
+            }, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Live scoring throughput on a synthetic Sunday slate: every game's plays
+replayed as fast as possible through live_scoring.LiveScoreboard, with
+subscribers following a share of the leagues. Reports per-batch latency
+(apply + publish) against rescoring every team from scratch each batch.
+
+    python -m benchmarks.live --leagues 5000 --subscribers 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks.mock_api import TEAMS, generate_fixtures
+from live_scoring import LiveScoreboard, LiveScorer, stat_vector
+
+PLAY_STATS = {
+    'QB': [{'passing_yards': 8}, {'passing_yards': 15, 'passing_touchdowns': 1}, {'interceptions': 1}],
+    'RB': [{'rushing_yards': 4}, {'rushing_yards': 12}, {'rushing_touchdowns': 1, 'rushing_yards': 3}],
+    'WR': [{'receptions': 1, 'receiving_yards': 11}, {'receptions': 1, 'receiving_yards': 24, 'receiving_touchdowns': 1}],
+    'TE': [{'receptions': 1, 'receiving_yards': 7}],
+    'K': [{}]
+}
+STARTERS = {'QB': 1, 'RB': 2, 'WR': 3, 'TE': 1, 'K': 1}
+
+
+def build_slate(players, leagues, teams, seed):
+    rng = random.Random(seed)
+    dump = generate_fixtures(players, seed)['/sleeper/players/nfl']
+    by_position = {}
+    for player_id, record in dump.items():
+        if record['team']:
+            by_position.setdefault(record['position'], []).append(player_id)
+
+    scorer = LiveScorer()
+    scorer.add_players(list(dump), [record['team'] for record in dump.values()],
+                       [rng.uniform(0, 25) for _ in dump])
+    for league in range(leagues):
+        lineups = [
+            [player_id for position, count in STARTERS.items() for player_id in rng.sample(by_position[position], count)]
+            for _ in range(teams)
+        ]
+        scorer.add_league(league, {
+            matchup: {str(2 * matchup): lineups[2 * matchup], str(2 * matchup + 1): lineups[2 * matchup + 1]}
+            for matchup in range(teams // 2)
+        })
+
+    # One batch per snap: a play in every game plus both teams' game clocks
+    games = [(TEAMS[i], TEAMS[i + 1]) for i in range(0, len(TEAMS) - 6, 2)]
+    roster = {team: [pid for pid, record in dump.items() if record['team'] == team] for team in TEAMS}
+    batches = []
+    for snap in range(150):
+        batch = []
+        for home, away in games:
+            offense = rng.choice((home, away))
+            for player_id in rng.sample(roster[offense], min(2, len(roster[offense]))):
+                batch.append({'player_id': player_id, 'stats': rng.choice(PLAY_STATS[dump[player_id]['position']])})
+            batch.append({'team': home, 'progress': (snap + 1) / 150})
+            batch.append({'team': away, 'progress': (snap + 1) / 150})
+        batches.append(batch)
+    return scorer, batches
+
+
+def full_rescore(scorer, events):
+    """Baseline: apply the stat deltas, then rescore every player and team from the accumulators"""
+    for event in events:
+        if 'player_id' in event:
+            scorer.stats[scorer.player_rows[event['player_id']]] += stat_vector(event['stats'])
+        else:
+            scorer.progress[scorer.nfl_team_codes[event['team']]] = event['progress']
+    points = scorer.stats @ scorer.engine.weights
+    finals = points + (1 - scorer.progress[scorer.player_team])[:, None] * scorer.projected[:, None]
+    members = np.concatenate(scorer.team_starters)
+    owners = np.repeat(np.arange(len(scorer.team_starters)), [len(s) for s in scorer.team_starters])
+    profiles = np.asarray(scorer.team_profile)[owners]
+    team_points = np.bincount(owners, points[members, profiles], minlength=len(scorer.teams))
+    team_finals = np.bincount(owners, finals[members, profiles], minlength=len(scorer.teams))
+    return team_points, team_finals
+
+
+async def run_live(scorer, batches, subscribers, seed):
+    board = LiveScoreboard(scorer)
+    leagues = random.Random(seed).sample(range(len(scorer.league_matchups)), subscribers)
+    subscriptions = [board.subscribe(leagues=[league], snapshot=False) for league in leagues]
+    received = [0]
+
+    async def consume(subscription):
+        async for _ in subscription:
+            received[0] += 1
+
+    consumers = [asyncio.create_task(consume(subscription)) for subscription in subscriptions]
+    latencies = []
+    for batch in batches:
+        start = time.perf_counter()
+        board.apply(batch)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+    board.close()
+    await asyncio.gather(*consumers)
+    return latencies, received[0], sum(subscription.dropped for subscription in subscriptions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental live scoring vs full rescoring on a Sunday slate")
+    parser.add_argument('--players', type=int, default=3000)
+    parser.add_argument('--leagues', type=int, default=5000)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--subscribers', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scorer, batches = build_slate(args.players, args.leagues, args.teams, args.seed)
+    scorer.apply([])  # build the player -> team index outside the measurement
+    setup = time.perf_counter() - started
+
+    latencies, received, dropped = asyncio.run(run_live(scorer, batches, min(args.subscribers, args.leagues), args.seed))
+    events = sum(len(batch) for batch in batches)
+
+    baseline_scorer, _ = build_slate(args.players, args.leagues, args.teams, args.seed)
+    baseline = []
+    for batch in batches:
+        start = time.perf_counter()
+        full_rescore(baseline_scorer, batch)
+        baseline.append(time.perf_counter() - start)
+
+    def ms(values, q):
+        return round(statistics.quantiles(values, n=100)[q - 1] * 1000, 3)
+
+    print(f"{args.leagues} leagues x {args.teams} teams ({len(scorer.teams)} teams), "
+          f"{len(batches)} batches / {events} events, setup {setup:.2f}s")
+    print(f"{'mode':14} {'p50 ms':>8} {'p99 ms':>8} {'events/s':>10}")
+    for name, values in (('incremental', latencies), ('full rescore', baseline)):
+        print(f"{name:14} {ms(values, 50):>8} {ms(values, 99):>8} {events / sum(values):>10.0f}")
+    print(f"{received} updates delivered to {min(args.subscribers, args.leagues)} subscribers, {dropped} dropped")
+
+
+if __name__ == "__main__":
+    main()
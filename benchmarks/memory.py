@@ -0,0 +1,85 @@
+"""
+Peak memory of a player registry refresh: the Sleeper dump decoded with
+response.json() versus the streaming path DataManager uses
+(_get_sleeper_players). 'retained' is what the registry keeps either
+way; the gap to the peak is the transient cost of parsing. Each mode
+runs in a fresh interpreter against benchmarks.mock_api, so the peak RSS
+of one mode doesn't affect the other.
+
+    python -m benchmarks.memory --players 11000
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.mock_api import MockApiServer, generate_fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, resource, sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+from pathlib import Path
+from data_manager import DataManager
+from player_registry import compact_player
+
+dm = DataManager()
+dm.SLEEPER_API_URL = {base_url!r} + '/sleeper'
+dm.set_response_store(None)  # both modes fetch the same URL; keep the second one from getting a 304
+dm.player_registry.snapshot_path = Path({workdir!r}) / 'players_snapshot.json'
+dm._get_sleeper_data('state/nfl')  # load requests and open the connection outside the measurement
+
+baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+start = time.perf_counter()
+if {mode!r} == 'json':
+    raw = dm._get_sleeper_data('players/nfl')
+    dm.player_registry.update({{pid: compact_player(data) for pid, data in raw.items()}})
+    del raw
+else:
+    dm.player_registry.refresh()
+elapsed = time.perf_counter() - start
+retained, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    'players': len(dm.player_registry),
+    'seconds': round(elapsed, 3),
+    'traced_peak_mb': round(peak / 2 ** 20, 1),
+    'retained_mb': round(retained / 2 ** 20, 1),
+    'rss_growth_mb': round((peak_rss - baseline_rss) / 1024, 1)
+}}))
+dm.close()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of a player dump refresh, buffered vs streamed")
+    parser.add_argument('--players', type=int, default=11000)
+    args = parser.parse_args()
+
+    fixtures = generate_fixtures(args.players)
+    server = MockApiServer(fixtures, latency=0, jitter=0)
+    payload_mb = len(server.body('/sleeper/players/nfl')) / 2 ** 20
+    results = {}
+    with server, tempfile.TemporaryDirectory() as workdir:
+        for mode in ('json', 'stream'):
+            code = CHILD.format(root=str(ROOT), base_url=server.base_url, workdir=workdir, mode=mode)
+            Path(workdir, 'players_snapshot.json').unlink(missing_ok=True)
+            output = subprocess.run(
+                [sys.executable, '-c', code], capture_output=True, text=True, check=True
+            ).stdout
+            results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"player dump: {args.players} players, {payload_mb:.1f} MB of JSON")
+    print(f"{'mode':8} {'seconds':>8} {'traced peak MB':>15} {'retained MB':>12} {'RSS growth MB':>14}")
+    for mode, result in results.items():
+        print(f"{mode:8} {result['seconds']:>8} {result['traced_peak_mb']:>15} "
+              f"{result['retained_mb']:>12} {result['rss_growth_mb']:>14}")
+
+
+if __name__ == "__main__":
+    main()
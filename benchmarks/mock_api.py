@@ -0,0 +1,305 @@
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB',
+    'HOU', 'IND', 'JAX', 'KC', 'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG',
+    'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'
+]
+POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'K']
+FIRST_NAMES = ['Josh', 'Patrick', 'Travis', 'Justin', 'Tyreek', 'Christian', 'Davante', 'Cooper', 'Mike', 'Chris']
+LAST_NAMES = ['Allen', 'Mahomes', 'Kelce', 'Jefferson', 'Hill', 'McCaffrey', 'Adams', 'Kupp', 'Evans', 'Olave']
+
+
+def generate_fixtures(players=2000, seed=0, season='2024', week=5, leagues=0, teams=12, roster_size=16):
+    """
+    Deterministic synthetic payloads shaped like the Sleeper/ESPN/NFL
+    responses DataManager consumes. Keys are request paths under /sleeper,
+    /espn and /nfl; '{id}' entries are per-player templates. leagues adds
+    that many Sleeper leagues (ids from league_ids()) with random rosters.
+    """
+    rng = random.Random(seed)
+    dump = {}
+    for i in range(players):
+        player_id = str(1000 + i)
+        first, last = rng.choice(FIRST_NAMES), f"{rng.choice(LAST_NAMES)}{i}"
+        dump[player_id] = {
+            'player_id': player_id,
+            'full_name': f"{first} {last}",
+            'first_name': first,
+            'last_name': last,
+            'search_full_name': f"{first}{last}".lower(),
+            'position': rng.choice(POSITIONS),
+            'fantasy_positions': None,
+            'team': rng.choice(TEAMS + [None]),
+            'status': 'Active',
+            'injury_status': rng.choice([None] * 8 + ['Questionable', 'Out']),
+            'age': rng.randint(21, 36),
+            'years_exp': rng.randint(0, 14),
+            'college': 'State',
+            'height': '72',
+            'weight': '210',
+            'number': rng.randint(1, 99),
+            'depth_chart_order': rng.randint(1, 4),
+            'search_rank': rng.randint(1, 9999999),
+            'espn_id': rng.randint(1, 5000000),
+            'yahoo_id': rng.randint(1, 50000),
+            'rotowire_id': rng.randint(1, 20000),
+            'sportradar_id': f"{rng.getrandbits(128):032x}",
+            'birth_date': '1996-01-01',
+            'hashtag': f"#{first}{last}-NFL".lower(),
+            'metadata': {'channel_id': str(rng.getrandbits(64))}
+        }
+
+    ids = list(dump)
+    projections = {
+        player_id: {
+            'pts_ppr': round(rng.uniform(0, 25), 2),
+            'pass_yd': round(rng.uniform(0, 300), 1) if dump[player_id]['position'] == 'QB' else 0,
+            'rush_yd': round(rng.uniform(0, 90), 1),
+            'rec_yd': round(rng.uniform(0, 90), 1)
+        }
+        for player_id in ids
+    }
+    games = [
+        {'home': TEAMS[i], 'away': TEAMS[i + 1], 'week': week}
+        for i in range(0, len(TEAMS), 2)
+    ]
+    # Later weeks (for strength of schedule): random pairings with two teams on bye.
+    # Own generator, so the other fixtures stay as they were for a given seed.
+    schedule_rng = random.Random(seed + 1)
+    schedules = {}
+    for later in range(week + 1, 19):
+        order = schedule_rng.sample(TEAMS, len(TEAMS))[2:]
+        schedules[f'/sleeper/schedule/nfl/{later}'] = [
+            {'home': order[i], 'away': order[i + 1], 'week': later} for i in range(0, len(order) - 1, 2)
+        ]
+    league_rosters = {
+        f'/sleeper/league/{league_id}/rosters': [
+            {'roster_id': team + 1, 'owner_id': str(team + 1), 'players': drafted[team::teams]}
+            for team in range(teams)
+        ]
+        for league_id, drafted in (
+            (league_id, rng.sample(ids, min(len(ids), teams * roster_size))) for league_id in league_ids(leagues)
+        )
+    }
+    # Week matchups pair consecutive rosters; the first nine players start
+    league_matchups = {
+        f'/sleeper/league/{path.split("/")[3]}/matchups/{week}': [
+            {'roster_id': roster['roster_id'], 'matchup_id': (roster['roster_id'] + 1) // 2,
+             'starters': roster['players'][:9], 'players': roster['players'], 'points': 0}
+            for roster in rosters
+        ]
+        for path, rosters in league_rosters.items()
+    }
+    return {
+        **league_rosters,
+        **league_matchups,
+        '/sleeper/players/nfl': dump,
+        '/sleeper/state/nfl': {'season': season, 'week': week},
+        '/sleeper/injuries/nfl': [
+            {'player_id': player_id, 'status': data['injury_status']}
+            for player_id, data in dump.items() if data['injury_status']
+        ],
+        '/sleeper/stats/nfl/trending/add': [
+            {'player_id': player_id, 'count': rng.randint(1, 5000)}
+            for player_id in rng.sample(ids, min(50, len(ids)))
+        ],
+        f'/sleeper/projections/nfl/regular/{season}/{week}': projections,
+        f'/sleeper/schedule/nfl/{week}': games,
+        **schedules,
+        f'/sleeper/stats/nfl/regular/{season}/{week}': {},  # live stats; empty until kickoff
+        '/sleeper/stats/nfl/player/{id}': {'receptions': 5, 'receiving_yards': 64, 'fumbles': 0},
+        '/sleeper/projections/nfl/player/{id}': {'points': 12.5, 'receiving_yards': 55.0},
+        '/espn/players/{id}/stats': {'rushing_yards': 40, 'rushing_touchdowns': 1, 'interceptions': 0},
+        '/espn/players/{id}/projections': {'points': 13.1, 'rushing_yards': 42.0},
+        '/espn/players/projections': [
+            {'player_id': player_id, 'stats': {'points': value['pts_ppr'] * 0.95}}
+            for player_id, value in projections.items()
+        ],
+        '/nfl': {'passing_yards': 0, 'passing_touchdowns': 0, 'receiving_touchdowns': 1}
+    }
+
+
+def league_ids(count):
+    """Ids of the synthetic leagues generate_fixtures(leagues=count) creates"""
+    return [str(900000 + i) for i in range(count)]
+
+
+def load_fixtures(path=FIXTURES_DIR):
+    """
+    Recorded fixtures: one JSON file per endpoint in path, named by the
+    request path with '/' replaced by '__' (e.g. sleeper__players__nfl.json).
+    """
+    fixtures = {}
+    for file in sorted(Path(path).glob('*.json')):
+        with open(file) as f:
+            fixtures['/' + file.stem.replace('__', '/')] = json.load(f)
+    return fixtures
+
+
+def save_fixtures(fixtures, path=FIXTURES_DIR):
+    """Write fixtures (e.g. captured from the live APIs) in load_fixtures' layout"""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for route, payload in fixtures.items():
+        with open(path / (route.strip('/').replace('/', '__') + '.json'), 'w') as f:
+            json.dump(payload, f)
+
+
+class MockApiServer:
+    """
+    Local stand-in for the Sleeper, ESPN and NFL endpoints DataManager calls,
+    served from fixtures with configurable latency, jitter and error rate.
+    Like the real APIs, 200s carry an ETag (If-None-Match gets a 304) and
+    are gzipped when the client accepts it.
+    """
+
+    def __init__(self, fixtures=None, latency=0.02, jitter=0.01, error_rate=0.0, seed=0,
+                 validators=True, compress=True):
+        self.fixtures = fixtures if fixtures is not None else (load_fixtures() or generate_fixtures())
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.validators = validators
+        self.compress = compress
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.encoded = {}
+        self.etags = {}
+        self.compressed = {}
+        self.templates = [
+            (re.compile('^' + re.escape(route).replace(re.escape('{id}'), r'[^/]+') + '$'), route)
+            for route in self.fixtures if '{id}' in route
+        ]
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def configure(self, data_manager):
+        """Point a DataManager's API base URLs at this server"""
+        data_manager.SLEEPER_API_URL = f"{self.base_url}/sleeper"
+        data_manager.ESPN_API_URL = f"{self.base_url}/espn"
+        data_manager.NFL_API_URL = f"{self.base_url}/nfl"
+        return data_manager
+
+    def resolve(self, path):
+        if path in self.fixtures:
+            return path
+        for pattern, route in self.templates:
+            if pattern.match(path):
+                return route
+        return None
+
+    def body(self, route):
+        if route not in self.encoded:
+            self.encoded[route] = json.dumps(self.fixtures[route]).encode()
+        return self.encoded[route]
+
+    def etag(self, route):
+        if route not in self.etags:
+            self.etags[route] = '"' + hashlib.sha1(self.body(route)).hexdigest()[:16] + '"'
+        return self.etags[route]
+
+    def gzipped(self, route):
+        if route not in self.compressed:
+            self.compressed[route] = gzip.compress(self.body(route), compresslevel=5)
+        return self.compressed[route]
+
+    def update(self, route, data):
+        """Replace a fixture; its ETag changes so the next conditional request gets a 200"""
+        self.fixtures[route] = data
+        for encoded in (self.encoded, self.etags, self.compressed):
+            encoded.pop(route, None)
+
+    def _delay_and_fail(self):
+        with self.rng_lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            failed = self.rng.random() < self.error_rate
+        return delay, failed
+
+    def start(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Buffer writes so headers and body go out in one segment; separate
+            # small writes on a keep-alive socket stall on delayed ACKs (~40ms)
+            wbufsize = 65536
+
+            def _respond(self):
+                path = self.path.split('?', 1)[0]
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                delay, failed = mock._delay_and_fail()
+                time.sleep(delay)
+                mock.requests += 1
+
+                route = mock.resolve(path)
+                headers = {}
+                if failed:
+                    status, body = 503, b'{"error": "injected failure"}'
+                elif route is None:
+                    status, body = 404, b'{"error": "not found"}'
+                elif mock.validators and self.headers.get('If-None-Match') == mock.etag(route):
+                    status, body = 304, b''
+                    headers['ETag'] = mock.etag(route)
+                    mock.not_modified += 1
+                else:
+                    status, body = 200, mock.body(route)
+                    if mock.validators:
+                        headers['ETag'] = mock.etag(route)
+                    if mock.compress and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                        body = mock.gzipped(route)
+                        headers['Content-Encoding'] = 'gzip'
+                mock.bytes_sent += len(body)
+
+                self.send_response(status)
+                if status != 304:
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='mock-api', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,233 @@
+"""
+Offline benchmarks for DataManager and FantasyFootballAssistant.
+
+Runs every call against benchmarks.mock_api instead of the live APIs and
+reports p50/p99 latency, throughput and peak traced memory per benchmark.
+Results are written to benchmarks/results/<timestamp>.json and compared
+with the previous run (or --baseline).
+
+    python -m benchmarks.run
+    python -m benchmarks.run --latency 0.05 --error-rate 0.02 --iterations 200
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.mock_api import MockApiServer, generate_fixtures, load_fixtures
+from cache import TieredCache
+from data_manager import DataManager
+from http_store import ResponseStore
+from main import FantasyFootballAssistant
+from rate_limiter import RateLimiter
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+QUERIES = [
+    "Get stats for Patrick Mahomes",
+    "How is Travis Kelce doing?",
+    "Who should I start this week?",
+    "Any injured players?",
+    "stats for mahomse",
+    "What's the weather like?"
+]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure(fn, iterations, setup=None):
+    """
+    Time iterations calls of fn(i) and trace peak memory across them.
+    setup(i), if given, runs before each call outside the timed region.
+    """
+    latencies = []
+    errors = 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(iterations):
+        if setup is not None:
+            setup(i)
+        t0 = time.perf_counter()
+        try:
+            fn(i)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3),
+        'throughput_per_s': round(iterations / elapsed, 2) if elapsed else None,
+        'peak_memory_kb': round(peak / 1024, 1)
+    }
+
+
+def make_data_manager(server, workdir, respect_rate_limits=False):
+    """DataManager wired to the mock server with an in-memory cache and a scratch registry snapshot"""
+    dm = server.configure(DataManager())
+    dm.cache = TieredCache(use_disk=False)
+    dm.set_response_store(None)
+    dm.player_registry.snapshot_path = Path(workdir) / 'players_snapshot.json'
+    if not respect_rate_limits:
+        dm.rate_limiters = {source: RateLimiter(source, {}) for source in dm.rate_limiters}
+    return dm
+
+
+def run_benchmarks(server, iterations, workdir, respect_rate_limits=False, seed=0):
+    rng = random.Random(seed)
+    dm = make_data_manager(server, workdir, respect_rate_limits)
+    results = {}
+    try:
+        names = [
+            record['full_name'] for record in server.fixtures.get('/sleeper/players/nfl', {}).values()
+            if record.get('full_name')
+        ]
+        sample = [rng.choice(names) for _ in range(iterations)] if names else ['Patrick Mahomes'] * iterations
+
+        # Registry load from the players dump (first call pays for it)
+        results['registry_load'] = measure(lambda i: dm.get_registry(), 1)
+
+        # Player dump refreshes revalidated against a stored copy: one 200, then 304s
+        dm.set_response_store(ResponseStore(Path(workdir) / 'http'))
+        results['registry_refresh_conditional'] = measure(lambda i: dm.player_registry.refresh(), 5)
+        results['transfer'] = dm.get_transfer_stats()
+        dm.set_response_store(None)
+
+        # Cold: every call misses the cache and fans out to all three sources
+        results['get_player_stats_cold'] = measure(
+            lambda i: dm.get_player_stats(sample[i]), iterations,
+            setup=lambda i: dm.cache.delete('player_stats', sample[i].lower())
+        )
+        results['get_player_stats_warm'] = measure(lambda i: dm.get_player_stats(sample[i]), iterations)
+
+        results['get_waiver_recommendations_cold'] = measure(
+            lambda i: dm.get_waiver_recommendations(), max(1, iterations // 10),
+            setup=lambda i: dm.cache.clear()
+        )
+        results['get_waiver_recommendations_warm'] = measure(lambda i: dm.get_waiver_recommendations(), iterations)
+
+        trades = [(rng.sample(sample, 2), rng.sample(sample, 2)) for _ in range(iterations)]
+        results['evaluate_trade_cold'] = measure(
+            lambda i: dm.evaluate_trade(*trades[i]), max(1, iterations // 10),
+            setup=lambda i: dm.cache.clear()
+        )
+        results['evaluate_trade_warm'] = measure(lambda i: dm.evaluate_trade(*trades[0]), iterations)
+
+        results['cache'] = dm.cache.stats()
+        results['rate_limits'] = dm.get_rate_limit_stats()
+    finally:
+        dm.close()
+
+    assistant = FantasyFootballAssistant()
+    results['process_query'] = measure(
+        lambda i: assistant.process_query(QUERIES[i % len(QUERIES)]), iterations * 10
+    )
+    return results
+
+
+def latest_result(exclude=None):
+    runs = sorted(p for p in RESULTS_DIR.glob('[0-9]*.json') if p != exclude)
+    return runs[-1] if runs else None
+
+
+def compare(current, baseline):
+    """Per-benchmark percentage change in p50/p99 latency and throughput against a baseline run"""
+    changes = {}
+    for name, result in current['benchmarks'].items():
+        before = baseline.get('benchmarks', {}).get(name)
+        if not before or 'p50_ms' not in result or 'p50_ms' not in before:
+            continue
+        changes[name] = {
+            metric: round((result[metric] - before[metric]) / before[metric] * 100, 1)
+            for metric in ('p50_ms', 'p99_ms', 'throughput_per_s', 'peak_memory_kb')
+            if before.get(metric) and result.get(metric) is not None
+        }
+    return changes
+
+
+def print_report(report, changes):
+    print(f"{'benchmark':34} {'p50 ms':>10} {'p99 ms':>10} {'ops/s':>10} {'peak KB':>10}")
+    for name, result in report['benchmarks'].items():
+        if 'p50_ms' not in result:
+            continue
+        line = (f"{name:34} {result['p50_ms']:>10} {result['p99_ms']:>10} "
+                f"{result['throughput_per_s']:>10} {result['peak_memory_kb']:>10}")
+        if name in changes and 'p50_ms' in changes[name]:
+            line += f"   p50 {changes[name]['p50_ms']:+.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a local mock of the fantasy APIs")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--players', type=int, default=2000, help="synthetic players when no recorded fixtures exist")
+    parser.add_argument('--latency', type=float, default=0.02, help="mock response latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fixtures', help="directory of recorded fixtures (see mock_api.load_fixtures)")
+    parser.add_argument('--respect-rate-limits', action='store_true')
+    parser.add_argument('--baseline', help="result file to compare against (default: previous run)")
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else None
+    if not fixtures:
+        fixtures = load_fixtures() or generate_fixtures(args.players, args.seed)
+
+    server = MockApiServer(fixtures, args.latency, args.jitter, args.error_rate, args.seed)
+    with server, tempfile.TemporaryDirectory() as workdir:
+        benchmarks = run_benchmarks(server, args.iterations, workdir, args.respect_rate_limits, args.seed)
+        requests_served, bytes_served = server.requests, server.bytes_sent
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {
+            'iterations': args.iterations,
+            'players': len(fixtures.get('/sleeper/players/nfl', {})),
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'error_rate': args.error_rate,
+            'seed': args.seed,
+            'respect_rate_limits': args.respect_rate_limits
+        },
+        'mock_server': {'requests': requests_served, 'bytes_sent': bytes_served},
+        'benchmarks': benchmarks
+    }
+
+    baseline_path = Path(args.baseline) if args.baseline else latest_result()
+    changes = {}
+    if baseline_path is not None and baseline_path.exists():
+        with open(baseline_path) as f:
+            changes = compare(report, json.load(f))
+        report['baseline'] = {'path': str(baseline_path), 'changes_pct': changes}
+
+    print_report(report, changes)
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
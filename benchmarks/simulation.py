@@ -0,0 +1,61 @@
+"""
+Monte Carlo simulation throughput: simulations per second for one
+head-to-head matchup as the simulation count grows, then a whole league
+week (simulation.simulate_league_week, lineups and schedule fetched from
+benchmarks.mock_api) as the process pool grows.
+
+    python -m benchmarks.simulation --sims 20000 --teams 12 --workers 1,2,4
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.leagues import default_workers
+from benchmarks.mock_api import MockApiServer, generate_fixtures, league_ids
+from benchmarks.run import make_data_manager
+from simulation import lineup_from_ids, opponents_from_schedule, simulate_league_week, simulate_matchup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulations per second for a matchup and a league week")
+    parser.add_argument('--sims', type=int, default=20000)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--workers', help="comma-separated worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(',')] if args.workers else default_workers()
+    league_id = league_ids(1)[0]
+    server = MockApiServer(generate_fixtures(args.players, args.seed, leagues=1, teams=args.teams), latency=0, jitter=0)
+
+    with server, tempfile.TemporaryDirectory() as workdir:
+        data_manager = make_data_manager(server, workdir)
+        try:
+            start = time.perf_counter()
+            matchups = data_manager.get_league_matchups(league_id)
+            rosters = list(matchups['1'].values())
+            lineup_a, lineup_b = (lineup_from_ids(data_manager, starters) for starters in rosters)
+            opponents = opponents_from_schedule(data_manager.get_matchups())
+            print(f"Lineups and schedule fetched in {time.perf_counter() - start:.3f}s "
+                  f"({len(lineup_a)} vs {len(lineup_b)} starters)")
+
+            print(f"\n{'sims':>8} {'seconds':>9} {'sims/s':>10}")
+            for sims in (args.sims // 10, args.sims, args.sims * 10):
+                start = time.perf_counter()
+                simulate_matchup(lineup_a, lineup_b, sims, args.seed, opponents)
+                elapsed = time.perf_counter() - start
+                print(f"{sims:>8} {elapsed:>9.4f} {round(sims / elapsed):>10}")
+
+            simulate_league_week(data_manager, league_id, 10, args.seed, processes=1)  # warm the caches
+            print(f"\nLeague week: {len(matchups)} matchups x {args.sims} simulations")
+            print(f"{'workers':>8} {'seconds':>9} {'sims/s':>10}")
+            for workers in worker_counts:
+                result = simulate_league_week(data_manager, league_id, args.sims, args.seed, processes=workers)
+                print(f"{workers:>8} {result['elapsed_seconds']:>9} {result['simulations_per_second']:>10}")
+        finally:
+            data_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Startup-time benchmarks: each sample is a fresh interpreter, timed from
+process start to the first answer.
+
+- cli_first_query: import main, build the assistant, answer one query
+- data_manager_cold: first player lookup + injury check with empty
+  caches (mock API), then the first waiver query (which loads pandas)
+- data_manager_warm: the same after load_warm_snapshot()
+
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.mock_api import MockApiServer, generate_fixtures
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+CHILD_PRELUDE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+"""
+
+CLI_FIRST_QUERY = CHILD_PRELUDE + """
+from main import FantasyFootballAssistant
+answer = FantasyFootballAssistant().process_query("Get stats for Patrick Mahomes")
+print(json.dumps({{'in_process_ms': (time.perf_counter() - start) * 1000, 'ok': 'Mahomes' in answer}}))
+"""
+
+DATA_MANAGER_FIRST_QUERY = CHILD_PRELUDE + """
+from pathlib import Path
+from cache import TieredCache
+from data_manager import DataManager
+dm = DataManager()
+dm.SLEEPER_API_URL = {base_url!r} + '/sleeper'
+dm.ESPN_API_URL = {base_url!r} + '/espn'
+dm.NFL_API_URL = {base_url!r} + '/nfl'
+dm.cache = TieredCache(use_disk=False)
+dm.set_response_store(None)
+dm.player_registry.snapshot_path = Path({workdir!r}) / 'players_snapshot.json'
+warm = {snapshot!r} is not None and dm.load_warm_snapshot({snapshot!r})
+player = dm.get_registry().find({player!r})
+injuries = dm.get_injuries()
+elapsed = (time.perf_counter() - start) * 1000
+waivers = dm.get_waiver_recommendations()
+waiver_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    'in_process_ms': elapsed, 'waiver_ms': waiver_ms,
+    'ok': bool(player and injuries and waivers), 'warm': warm
+}}))
+dm.close()
+"""
+
+
+def run_child(code):
+    """Run code in a fresh interpreter; returns (wall ms, child's JSON report)"""
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=tempfile.gettempdir(),
+        capture_output=True, text=True, check=True
+    ).stdout
+    wall = (time.perf_counter() - started) * 1000
+    return wall, json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    walls = [wall for wall, _ in samples]
+    in_process = [report['in_process_ms'] for _, report in samples]
+    summary = {
+        'samples': len(samples),
+        'ok': all(report['ok'] for _, report in samples),
+        'wall_ms_median': round(statistics.median(walls), 1),
+        'wall_ms_min': round(min(walls), 1),
+        'in_process_ms_median': round(statistics.median(in_process), 1),
+        'in_process_ms_min': round(min(in_process), 1)
+    }
+    if 'waiver_ms' in samples[0][1]:
+        summary['waiver_ms_median'] = round(statistics.median(report['waiver_ms'] for _, report in samples), 1)
+    return summary
+
+
+def build_snapshot(server, workdir):
+    from cache import TieredCache
+    from data_manager import DataManager
+
+    dm = server.configure(DataManager())
+    dm.cache = TieredCache(use_disk=False)
+    dm.set_response_store(None)
+    dm.player_registry.snapshot_path = Path(workdir) / 'players_snapshot.json'
+    try:
+        return str(dm.save_warm_snapshot(Path(workdir) / 'warm_snapshot.pkl'))
+    finally:
+        dm.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first answer from a cold process")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.05, help="mock API latency in seconds")
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args()
+
+    results = {}
+    results['cli_first_query'] = summarize([
+        run_child(CLI_FIRST_QUERY.format(root=str(ROOT))) for _ in range(args.repeat)
+    ])
+
+    server = MockApiServer(generate_fixtures(args.players), latency=args.latency, jitter=0)
+    with server, tempfile.TemporaryDirectory() as workdir:
+        snapshot = build_snapshot(server, workdir)
+        player = next(iter(server.fixtures['/sleeper/players/nfl'].values()))['full_name']
+        for name, path in (('data_manager_cold', None), ('data_manager_warm', snapshot)):
+            code = DATA_MANAGER_FIRST_QUERY.format(
+                root=str(ROOT), base_url=server.base_url, workdir=workdir, snapshot=path, player=player
+            )
+            results[name] = summarize([run_child(code) for _ in range(args.repeat)])
+        results['snapshot_bytes'] = Path(snapshot).stat().st_size
+
+    print(f"{'benchmark':22} {'wall ms':>10} {'first answer ms':>16} {'+ waivers ms':>13}")
+    for name, result in results.items():
+        if isinstance(result, dict):
+            print(f"{name:22} {result['wall_ms_median']:>10} {result['in_process_ms_median']:>16} "
+                  f"{result.get('waiver_ms_median', ''):>13}")
+    print(f"warm snapshot: {results['snapshot_bytes'] / 1024:.0f} KB for {args.players} players")
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        with open(path, 'w') as f:
+            json.dump({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'config': vars(args),
+                'benchmarks': results
+            }, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
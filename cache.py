@@ -0,0 +1,209 @@
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from config import CACHE_CONFIG
+from metrics import metrics
+
+# Data type -> CACHE_CONFIG expiry key
+CACHE_TTL_KEYS = {
+    'player_stats': 'PLAYER_STATS_EXPIRY',
+    'matchups': 'MATCHUP_EXPIRY',
+    'news': 'NEWS_EXPIRY',
+    'projections': 'PROJECTIONS_EXPIRY',
+    'injuries': 'INJURIES_EXPIRY',
+    'trending': 'TRENDING_EXPIRY',
+    'rosters': 'ROSTERS_EXPIRY'
+}
+
+_MISSING = object()
+
+
+def ttl_for(category):
+    """Expiry in seconds for a data type, falling back to CACHE_CONFIG['DEFAULT_EXPIRY']"""
+    return CACHE_CONFIG.get(CACHE_TTL_KEYS.get(category), CACHE_CONFIG['DEFAULT_EXPIRY'])
+
+
+class MemoryTier:
+    """In-memory LRU bounded by entry count and (pickled) payload bytes"""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (expires_at, value, size)
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[0] <= now:
+            self.delete(key)
+            return _MISSING
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value, expires_at, size):
+        self.delete(key)
+        self.entries[key] = (expires_at, value, size)
+        self.bytes += size
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+class DiskTier:
+    """sqlite-backed tier under CACHE_DIR so cached data survives restarts"""
+
+    def __init__(self, cache_dir):
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(cache_dir / 'data_cache.sqlite3'), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+        )
+        self.conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        self.conn.commit()
+
+    def get(self, key, now):
+        row = self.conn.execute("SELECT expires_at, value FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING, 0
+        if row[0] <= now:
+            self.delete(key)
+            return _MISSING, 0
+        return row[1], row[0]
+
+    def set(self, key, blob, expires_at):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)",
+            (key, expires_at, blob)
+        )
+        self.conn.commit()
+
+    def delete(self, key):
+        self.conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        self.conn.commit()
+
+    def clear(self):
+        self.conn.execute("DELETE FROM cache")
+        self.conn.commit()
+
+
+class TieredCache:
+    """
+    Two-tier TTL cache used by DataManager: an in-memory LRU in front of an
+    optional sqlite disk tier. Entries are grouped by data type so each type
+    gets its own expiry from CACHE_CONFIG.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, cache_dir=None, use_disk=None):
+        self.memory = MemoryTier(
+            max_entries or CACHE_CONFIG['MAX_ENTRIES'],
+            max_bytes or CACHE_CONFIG['MAX_MEMORY_BYTES']
+        )
+        if use_disk is None:
+            use_disk = CACHE_CONFIG['DISK_CACHE']
+        self.disk = DiskTier(cache_dir or CACHE_CONFIG['CACHE_DIR']) if use_disk else None
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(category, key):
+        return f"{category}:{key}"
+
+    def get(self, category, key, default=None):
+        """Return a cached value, promoting disk hits into memory"""
+        if not metrics.enabled:
+            value, _ = self._lookup(category, key)
+        else:
+            start = time.perf_counter()
+            value, result = self._lookup(category, key)
+            metrics.observe('cache_lookup_seconds', time.perf_counter() - start, category=category)
+            metrics.inc('cache_lookups_total', category=category, result=result)
+        return default if value is _MISSING else value
+
+    def _lookup(self, category, key):
+        """(value or _MISSING, 'memory' | 'disk' | 'miss')"""
+        full_key = self._key(category, key)
+        now = time.time()
+        with self.lock:
+            value = self.memory.get(full_key, now)
+            if value is not _MISSING:
+                self.hits += 1
+                return value, 'memory'
+            if self.disk is not None:
+                blob, expires_at = self.disk.get(full_key, now)
+                if blob is not _MISSING:
+                    value = pickle.loads(blob)
+                    self.memory.set(full_key, value, expires_at, len(blob))
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value, 'disk'
+            self.misses += 1
+            return _MISSING, 'miss'
+
+    def set(self, category, key, value, ttl=None):
+        """Store a value with the data type's expiry (or an explicit ttl)"""
+        full_key = self._key(category, key)
+        expires_at = time.time() + (ttl if ttl is not None else ttl_for(category))
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.memory.set(full_key, value, expires_at, len(blob))
+            if self.disk is not None:
+                self.disk.set(full_key, blob, expires_at)
+
+    def get_or_load(self, category, key, loader, ttl=None):
+        """Return the cached value or call loader(); None results are not cached"""
+        value = self.get(category, key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with metrics.timer('cache_load_seconds', category=category):
+            value = loader()
+        if value is not None:
+            self.set(category, key, value, ttl)
+        return value
+
+    def delete(self, category, key):
+        full_key = self._key(category, key)
+        with self.lock:
+            self.memory.delete(full_key)
+            if self.disk is not None:
+                self.disk.delete(full_key)
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            if self.disk is not None:
+                self.disk.clear()
+
+    def stats(self):
+        """Hit/miss/eviction counters and current memory usage"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.memory.evictions,
+                'entries': len(self.memory.entries),
+                'memory_bytes': self.memory.bytes
+            }
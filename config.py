@@ -1,8 +1,24 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+
+def _find_dotenv(start=os.path.dirname(os.path.abspath(__file__))):
+    """Nearest .env walking up from this directory (what load_dotenv() would find), or None"""
+    directory = start
+    while True:
+        path = os.path.join(directory, '.env')
+        if os.path.isfile(path):
+            return path
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+# Load environment variables from .env file; python-dotenv is only imported when one exists
+_DOTENV_PATH = _find_dotenv()
+if _DOTENV_PATH:
+    from dotenv import load_dotenv
+    load_dotenv(_DOTENV_PATH)
 
 # API Configuration
 API_KEYS = {
@@ -24,7 +40,39 @@ CACHE_CONFIG = {
     'PLAYER_STATS_EXPIRY': 1800,  # 30 minutes
     'MATCHUP_EXPIRY': 3600,  # 1 hour
     'NEWS_EXPIRY': 900,  # 15 minutes
-    'PROJECTIONS_EXPIRY': 7200  # 2 hours
+    'PROJECTIONS_EXPIRY': 7200,  # 2 hours
+    'INJURIES_EXPIRY': 1800,  # 30 minutes
+    'TRENDING_EXPIRY': 900,  # 15 minutes
+    'ROSTERS_EXPIRY': 900,  # 15 minutes
+    'MAX_ENTRIES': 4096,  # In-memory LRU entry bound
+    'MAX_MEMORY_BYTES': 64 * 1024 * 1024,  # In-memory LRU size bound (pickled bytes)
+    'DISK_CACHE': True,  # Persist cached responses to CACHE_DIR
+    'HTTP_STORE': True,  # Keep GET bodies with their ETag/Last-Modified for conditional requests
+    'HTTP_STORE_MAX_PARSED': 256,  # Parsed bodies kept in memory to answer 304s without re-parsing
+    'CACHE_DIR': os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache'))
+}
+
+# Instrumentation (upstream calls, cache lookups, query handling)
+METRICS_CONFIG = {
+    'ENABLED': os.getenv('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off')
+}
+
+# HTTP server (server.py)
+SERVER_CONFIG = {
+    'HOST': os.getenv('SERVER_HOST', '127.0.0.1'),
+    'PORT': int(os.getenv('SERVER_PORT', '8080')),
+    'WORKERS': int(os.getenv('SERVER_WORKERS', '1')),  # Processes sharing the port via SO_REUSEPORT
+    'THREADS': 32  # Per-worker pool for blocking DataManager calls
+}
+
+# Multi-league batch runs (league_batch.py)
+BATCH_CONFIG = {
+    'LEAGUE_IDS': [
+        league_id.strip()
+        for league_id in os.getenv('SLEEPER_LEAGUE_IDS', os.getenv('SLEEPER_LEAGUE_ID', '')).split(',')
+        if league_id.strip() and not league_id.strip().startswith('your_')
+    ],
+    'WORKERS': int(os.getenv('BATCH_WORKERS', '0'))  # 0 = one per CPU
 }
 
 # Scoring Settings (Default PPR)
@@ -62,11 +110,14 @@ UPDATE_INTERVALS = {
     'player_stats': 900,  # 15 minutes
     'injury_reports': 1800,  # 30 minutes
     'projections': 3600,  # 1 hour
-    'news': 600  # 10 minutes
+    'news': 600,  # 10 minutes
+    'trending': 600,  # 10 minutes - Sleeper's trending adds (waiver activity)
+    'players': 86400  # 24 hours - Sleeper asks clients to pull the full dump at most daily
 }
 
 # League Settings
 DEFAULT_LEAGUE_SETTINGS = {
+    'teams': 12,
     'roster_positions': {
         'QB': 1,
         'RB': 2,
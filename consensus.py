@@ -0,0 +1,277 @@
+"""
+Consensus weekly projections across sources.
+
+Every source's projections for a week live in one players x sources x
+stats array (NaN where a source has no number). Weighted means, medians
+and the spread between sources are computed together for whole blocks of
+rows; when one source refreshes, only its slice is rewritten and only the
+players whose numbers moved are re-aggregated.
+
+Source weights come from SourceAccuracy, which keeps each source's running
+squared error against actual stats. Until a stat has enough finished
+games behind it, DATA_SOURCES_PRIORITY['projections'] ranks the sources.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from config import DATA_SOURCES_PRIORITY
+
+# Projected player-weeks needed per source and stat before learned weights replace the priority order
+MIN_ACCURACY_SAMPLES = 200
+
+
+def priority_weights(sources, stats):
+    """sources x stats weights from DATA_SOURCES_PRIORITY: 1 for the first listed source, 1/2 the next, ..."""
+    ranked = [source.upper() for source in DATA_SOURCES_PRIORITY['projections']]
+    weights = [
+        1.0 / (ranked.index(source.upper()) + 1) if source.upper() in ranked else 1.0 / (len(ranked) + 1)
+        for source in sources
+    ]
+    return np.repeat(np.asarray(weights)[:, None], len(stats), axis=1)
+
+
+class SourceAccuracy:
+    """Running squared error of each source's projections against actual stats, saved as JSON"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.errors = {}  # source -> stat -> [sum of squared errors, count]
+        self.weeks = set()  # "season-week" keys already scored
+        if path is not None:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading projection accuracy: {e}")
+            return
+        self.errors = saved.get('errors', {})
+        self.weeks = set(saved.get('weeks', []))
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'errors': self.errors, 'weeks': sorted(self.weeks)}, f)
+        os.replace(tmp_path, self.path)
+
+    def record(self, consensus, actuals, week_key=None):
+        """
+        Add one finished week: consensus is that week's ConsensusProjections,
+        actuals {player_id: {stat: value}} in its stat names. Returns False if
+        week_key was already recorded.
+        """
+        if week_key is not None:
+            if week_key in self.weeks:
+                return False
+            self.weeks.add(week_key)
+
+        rows, truth = [], []
+        for player_id, stats in actuals.items():
+            row = consensus.rows.get(str(player_id))
+            if row is not None:
+                rows.append(row)
+                truth.append([stats.get(stat, 0.0) for stat in consensus.stats])
+        if not rows:
+            return True
+
+        projected = consensus.values[np.asarray(rows)]  # players x sources x stats
+        errors = (projected - np.asarray(truth, dtype=float)[:, None, :]) ** 2
+        present = ~np.isnan(errors)
+        sums = np.where(present, errors, 0.0).sum(axis=0)
+        counts = present.sum(axis=0)
+        for s, source in enumerate(consensus.sources):
+            by_stat = self.errors.setdefault(source, {})
+            for k, stat in enumerate(consensus.stats):
+                total = by_stat.setdefault(stat, [0.0, 0])
+                total[0] += float(sums[s, k])
+                total[1] += int(counts[s, k])
+        return True
+
+    def weights(self, sources, stats):
+        """
+        sources x stats weights: inverse mean squared error where every
+        source has MIN_ACCURACY_SAMPLES for the stat, priority order otherwise
+        """
+        weights = priority_weights(sources, stats)
+        for k, stat in enumerate(stats):
+            totals = [self.errors.get(source, {}).get(stat, [0.0, 0]) for source in sources]
+            if all(count >= MIN_ACCURACY_SAMPLES for _, count in totals):
+                weights[:, k] = [count / max(sum_sq, 1e-9) for sum_sq, count in totals]
+        return weights
+
+
+class ConsensusProjections:
+    """One week's projections from every source, with weighted consensus per player"""
+
+    def __init__(self, sources, stats, weights=None):
+        self.sources = list(sources)
+        self.stats = list(stats)
+        self.source_index = {source: s for s, source in enumerate(self.sources)}
+        self.weights = np.asarray(weights if weights is not None else priority_weights(self.sources, self.stats), dtype=float)
+
+        self.ids = []
+        self.rows = {}  # player_id -> row
+        self.values = np.full((0, len(self.sources), len(self.stats)), np.nan)
+        self.mean = np.full((0, len(self.stats)), np.nan)
+        self.median = np.full((0, len(self.stats)), np.nan)
+        self.spread = np.full((0, len(self.stats)), np.nan)
+        self.counts = np.zeros((0, len(self.stats)), dtype=np.int8)
+
+        self.payloads = {}  # source -> last payload applied, to skip unchanged (304) refreshes
+        self.updated_at = 0.0
+        self.lock = threading.Lock()
+        self._frames = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getstate__(self):
+        # Payloads are only for change detection; frames and the lock are rebuilt
+        state = self.__dict__.copy()
+        state['payloads'] = {}
+        state['_frames'] = {}
+        del state['lock']
+        n = len(self.ids)
+        for name in ('values', 'mean', 'median', 'spread', 'counts'):
+            state[name] = state[name][:n].copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def age(self):
+        return time.time() - self.updated_at
+
+    def update_source(self, source, records, payload=None):
+        """
+        Replace one source's projections with records {player_id: {stat: value}}.
+        Passing the raw payload lets an unchanged one (same object, as a 304
+        returns) skip the work. Returns the number of players whose numbers changed.
+        """
+        with self.lock:
+            self.updated_at = time.time()
+            if payload is not None and self.payloads.get(source) is payload:
+                return 0
+            s = self.source_index[source]
+            rows = np.fromiter((self._row(player_id) for player_id in records), dtype=np.intp, count=len(records))
+            block = np.array(
+                [[stats.get(stat, np.nan) for stat in self.stats] for stats in records.values()],
+                dtype=float
+            ).reshape(len(rows), len(self.stats))
+
+            n = len(self.ids)
+            before = self.values[:n, s].copy()
+            self.values[:n, s] = np.nan
+            self.values[rows, s] = block
+            after = self.values[:n, s]
+            changed = np.flatnonzero(
+                ((before != after) & ~(np.isnan(before) & np.isnan(after))).any(axis=1)
+            )
+            if payload is not None:
+                self.payloads[source] = payload
+            if len(changed):
+                self._aggregate(changed)
+                self._frames = {}
+            return len(changed)
+
+    def set_weights(self, weights):
+        """Swap the source weights (sources x stats) and re-aggregate every player"""
+        with self.lock:
+            self.weights = np.asarray(weights, dtype=float)
+            self._aggregate(np.arange(len(self.ids)))
+            self._frames = {}
+
+    def _row(self, player_id):
+        player_id = str(player_id)
+        row = self.rows.get(player_id)
+        if row is None:
+            row = self.rows[player_id] = len(self.ids)
+            self.ids.append(player_id)
+            if row >= len(self.values):
+                self._grow(max(1024, 2 * len(self.values)))
+        return row
+
+    def _grow(self, capacity):
+        extra = capacity - len(self.values)
+        self.values = np.concatenate([self.values, np.full((extra,) + self.values.shape[1:], np.nan)])
+        for name in ('mean', 'median', 'spread'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.full((extra, len(self.stats)), np.nan)]))
+        self.counts = np.concatenate([self.counts, np.zeros((extra, len(self.stats)), dtype=np.int8)])
+
+    def _aggregate(self, rows):
+        """Weighted mean, median and spread (std) across sources for the given rows, in one pass"""
+        x = self.values[rows]  # rows x sources x stats
+        present = ~np.isnan(x)
+        filled = np.where(present, x, 0.0)
+        counts = present.sum(axis=1)
+        weights = np.where(present, self.weights, 0.0)
+        weight_totals = weights.sum(axis=1)
+
+        # NaNs sort last, so the middle of the first `counts` entries is the median
+        ordered = np.sort(x, axis=1)
+        low = np.take_along_axis(ordered, np.maximum(counts - 1, 0)[:, None, :] // 2, axis=1)[:, 0]
+        high = np.take_along_axis(ordered, (counts // 2)[:, None, :], axis=1)[:, 0]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean[rows] = (filled * weights).sum(axis=1) / weight_totals
+            self.median[rows] = np.where(counts > 0, (low + high) / 2, np.nan)
+            average = filled.sum(axis=1) / counts
+            self.spread[rows] = np.sqrt(
+                (np.where(present, x - average[:, None, :], 0.0) ** 2).sum(axis=1) / counts
+            )
+        self.counts[rows] = counts
+
+    def player(self, player_id):
+        """Consensus (weighted mean) stats for one player, or None"""
+        row = self.rows.get(str(player_id))
+        if row is None or not self.counts[row].any():
+            return None
+        return {stat: float(value) for stat, value in zip(self.stats, self.mean[row]) if value == value}
+
+    def summary(self, player_id):
+        """Mean, median, spread and each source's numbers for one player, or None"""
+        row = self.rows.get(str(player_id))
+        if row is None or not self.counts[row].any():
+            return None
+
+        def as_dict(values):
+            return {stat: float(value) for stat, value in zip(self.stats, values) if value == value}
+
+        return {
+            'mean': as_dict(self.mean[row]),
+            'median': as_dict(self.median[row]),
+            'spread': as_dict(self.spread[row]),
+            'sources': {
+                source: as_dict(self.values[row, s])
+                for s, source in enumerate(self.sources) if not np.isnan(self.values[row, s]).all()
+            }
+        }
+
+    def frame(self, kind='mean'):
+        """
+        DataFrame of one aggregate ('mean', 'median' or 'spread') indexed by
+        player id, for players with at least one projection; None when empty
+        """
+        with self.lock:
+            if kind in self._frames:
+                return self._frames[kind]
+            import pandas as pd
+
+            n = len(self.ids)
+            keep = np.flatnonzero(self.counts[:n].any(axis=1))
+            if not len(keep):
+                return None
+            frame = pd.DataFrame(getattr(self, kind)[keep], index=[self.ids[row] for row in keep], columns=self.stats)
+            self._frames[kind] = frame
+            return frame
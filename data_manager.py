@@ -1,9 +1,46 @@
+import asyncio
 import json
-import pandas as pd
-import requests
-from pathlib import Path
-from datetime import datetime
+import os
+import pickle
+import threading
 import time
+from pathlib import Path
+
+from cache import TieredCache, ttl_for
+from config import CACHE_CONFIG, DATA_SOURCES_PRIORITY
+from http_client import AsyncHttpClient
+from http_store import ACCEPT_ENCODING, ResponseStore, request_key
+from json_stream import iter_object_items
+from metrics import record_upstream
+from player_registry import PlayerRegistry, compact_player
+from rate_limiter import AsyncSingleFlight, RateLimiter, SingleFlight
+from scheduler import data_manager_scheduler
+
+# Projection stats kept when combining sources
+PROJECTION_STATS = ['points', 'passing_yards', 'rushing_yards', 'receiving_yards']
+
+# Sleeper's abbreviated projection keys -> PROJECTION_STATS names
+SLEEPER_PROJECTION_FIELDS = {
+    'pts_ppr': 'points',
+    'pass_yd': 'passing_yards',
+    'rush_yd': 'rushing_yards',
+    'rec_yd': 'receiving_yards'
+}
+
+SOURCES = ('ESPN', 'NFL', 'Sleeper')
+
+# Read size when streaming large responses (the Sleeper player dump)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Bump when the warm snapshot layout changes; older files are ignored
+WARM_SNAPSHOT_VERSION = 2
+
+# How long a fallback (NFL state, or a matchup index missing schedules)
+# stands in after a failed Sleeper lookup before it is asked again
+STATE_RETRY_SECONDS = 60
+
+# Recent weeks of history behind each defense's points allowed by position
+DEFENSE_WINDOW_WEEKS = 17
 
 class DataManager:
     def __init__(self):
@@ -14,10 +51,56 @@ class DataManager:
         self.ESPN_API_URL = "https://fantasy.espn.com/apis/v3/games/ffl"
         self.NFL_API_URL = "https://api.nfl.com/v3/shield"
         self.SLEEPER_API_URL = "https://api.sleeper.app/v1"
+        self.NFL_HEADERS = {
+            "Authorization": "Bearer YOUR_NFL_API_TOKEN",
+            "Content-Type": "application/json"
+        }
+
+        # Stored GET bodies with their validators, so refreshes are
+        # conditional requests and a 304 reuses the local copy
+        self.responses = ResponseStore() if CACHE_CONFIG['HTTP_STORE'] else None
+
+        # One keep-alive session per source: requests for sync calls,
+        # aiohttp (on a background loop) for concurrent fan-out. Both are
+        # imported and opened on first use to keep startup cheap.
+        self.sessions = {}
+        self.http = AsyncHttpClient(response_store=self.responses)
+
+        # Per-source limits from config.RATE_LIMITS, and coalescing of
+        # identical in-flight requests (threads and async tasks respectively)
+        self.rate_limiters = {source: RateLimiter.for_source(source) for source in SOURCES}
+        self.inflight = SingleFlight()
+        self.inflight_async = AsyncSingleFlight()
         
-        # Cache data to avoid excessive API calls
-        self.cache = {}
-        self.cache_expiry = 3600  # 1 hour
+        # Cache data to avoid excessive API calls (per-type TTLs from CACHE_CONFIG)
+        self.cache = TieredCache()
+
+        # Indexed player universe, loaded lazily on first lookup
+        self.player_registry = PlayerRegistry(
+            lambda: self._get_sleeper_players("players/nfl"),
+            self.data_dir
+        )
+        self._registry_loaded = False
+        self._registry_lock = threading.Lock()
+
+        # Multi-season weekly stats, opened on first use (see history)
+        self._history = None
+
+        # Background refresh of injuries/projections/news/players, off by default
+        self.scheduler = None
+
+        # Prebuilt state for fast starts (see save_warm_snapshot)
+        self.warm_snapshot_path = self.data_dir / 'warm_snapshot.pkl'
+
+        # Weekly consensus projections, (season, week) -> ConsensusProjections,
+        # weighted by each source's track record (see learn_projection_weights)
+        self.consensus = {}
+        self._projection_accuracy = None
+
+        # Weekly schedule and defense-vs-position arrays,
+        # (season, week) -> (MatchupIndex, expiry or None when every schedule loaded)
+        self.matchup_indexes = {}
+        self._last_state = None
         
     def _get_espn_data(self, endpoint, params=None):
         """
@@ -25,34 +108,25 @@ class DataManager:
         Documentation: https://github.com/cwendt94/espn-api/wiki
         """
         url = f"{self.ESPN_API_URL}/{endpoint}"
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching ESPN data: {e}")
-            return None
+
+        def fetch():
+            return self._fetch_json('ESPN', endpoint, 'GET', url, params=params)
+
+        return self._throttled('ESPN', self._request_key(endpoint, params), fetch)
 
     def _get_nfl_data(self, query):
         """
         Get data from NFL's Official API
         Requires registration at https://api.nfl.com/
         """
-        headers = {
-            "Authorization": "Bearer YOUR_NFL_API_TOKEN",
-            "Content-Type": "application/json"
-        }
-        try:
-            response = requests.post(
-                self.NFL_API_URL,
-                headers=headers,
+        def fetch():
+            return self._fetch_json(
+                'NFL', 'graphql', 'POST', self.NFL_API_URL,
+                headers=self.NFL_HEADERS,
                 json={"query": query}
             )
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching NFL data: {e}")
-            return None
+
+        return self._throttled('NFL', query, fetch)
 
     def _get_sleeper_data(self, endpoint):
         """
@@ -60,40 +134,315 @@ class DataManager:
         Documentation: https://docs.sleeper.app/
         """
         url = f"{self.SLEEPER_API_URL}/{endpoint}"
+
+        def fetch():
+            return self._fetch_json('Sleeper', endpoint, 'GET', url)
+
+        return self._throttled('Sleeper', endpoint, fetch)
+
+    def _get_sleeper_players(self, endpoint="players/nfl"):
+        """
+        Stream Sleeper's full player dump, reducing each entry to
+        PLAYER_FIELDS as it is parsed so the full nested document is never
+        in memory. Returns {player_id: compact record}, or None on error.
+        """
+        url = f"{self.SLEEPER_API_URL}/{endpoint}"
+
+        def fetch():
+            return self._fetch_json('Sleeper', endpoint, 'GET', url, item_parser=compact_player)
+
+        # Its own in-flight key: a concurrent _get_sleeper_data(endpoint) returns the raw shape
+        return self._throttled('Sleeper', f"{endpoint}#compact", fetch)
+
+    async def _get_espn_data_async(self, endpoint, params=None):
+        """Async variant of _get_espn_data on the shared ESPN session"""
+        return await self._throttled_async(
+            'ESPN', self._request_key(endpoint, params),
+            lambda: self.http.get_json('ESPN', f"{self.ESPN_API_URL}/{endpoint}", params=params, endpoint=endpoint)
+        )
+
+    async def _get_nfl_data_async(self, query):
+        """Async variant of _get_nfl_data on the shared NFL session"""
+        return await self._throttled_async(
+            'NFL', query,
+            lambda: self.http.post_json(
+                'NFL', self.NFL_API_URL, {"query": query}, headers=self.NFL_HEADERS, endpoint='graphql'
+            )
+        )
+
+    async def _get_sleeper_data_async(self, endpoint):
+        """Async variant of _get_sleeper_data on the shared Sleeper session"""
+        return await self._throttled_async(
+            'Sleeper', endpoint,
+            lambda: self.http.get_json('Sleeper', f"{self.SLEEPER_API_URL}/{endpoint}", endpoint=endpoint)
+        )
+
+    def _session(self, source):
+        session = self.sessions.get(source)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+            session = self.sessions.setdefault(source, session)
+        return session
+
+    def _fetch_json(self, source, endpoint, method, url, item_parser=None, headers=None, **kwargs):
+        """
+        Blocking request on the source's session, recording latency, size and
+        outcome. GETs are conditional on the stored copy in self.responses;
+        a 304 returns the stored (already parsed when possible) body, shared
+        with other callers, so treat it as read-only. With item_parser the
+        body (a JSON object) is streamed and returned as
+        {key: item_parser(value)}, one entry decoded at a time.
+        """
+        import requests
+
+        session = self._session(source)
+        store = self.responses if method == 'GET' else None
+        key = request_key(url, kwargs.get('params'), item_parser.__name__ if item_parser else None)
+        headers = dict(headers or {})
+        if store is not None:
+            headers.update(store.conditional_headers(key))
+
+        def parse_stream(chunks):
+            return {name: item_parser(value) for name, value in iter_object_items(chunks)}
+
+        start = time.perf_counter()
+        size, status = None, 'error'
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error fetching Sleeper data: {e}")
+            with session.request(
+                method, url, headers=headers, stream=item_parser is not None, **kwargs
+            ) as response:
+                status = str(response.status_code)
+                if response.status_code == 304 and store is not None:
+                    size, status = 0, 'not_modified'
+                    return store.not_modified_body(
+                        key, source,
+                        (lambda f: parse_stream(iter(lambda: f.read(STREAM_CHUNK_SIZE), b''))) if item_parser else None
+                    )
+                response.raise_for_status()
+                keep = store is not None and store.cacheable(response.headers)
+
+                if item_parser is None:
+                    body = response.content
+                    size, status = len(body), 'invalid_json'
+                    data = response.json()
+                    if keep:
+                        store.save(key, response.headers, body, data)
+                else:
+                    # Stream the body through the parser, teeing it to disk when it can be revalidated later
+                    status, received = 'invalid_json', [0]
+                    tmp_path = store.temp_path(key) if keep else None
+
+                    def chunks(copy=None):
+                        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                            received[0] += len(chunk)
+                            if copy is not None:
+                                copy.write(chunk)
+                            yield chunk
+
+                    if keep:
+                        try:
+                            with open(tmp_path, 'wb') as copy:
+                                data = parse_stream(chunks(copy))
+                        except BaseException:
+                            tmp_path.unlink(missing_ok=True)
+                            raise
+                        store.save_file(key, response.headers, tmp_path, data)
+                    else:
+                        data = parse_stream(chunks())
+                    size = received[0]
+
+                if store is not None:
+                    store.count_compression(source, response.headers, size)
+            status = 'ok'
+            return data
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching {source} data: {e}")
             return None
+        finally:
+            record_upstream(source, endpoint, time.perf_counter() - start, size, status)
+
+    @staticmethod
+    def _request_key(endpoint, params=None):
+        return (endpoint, tuple(sorted(params.items()))) if params else endpoint
+
+    def _throttled(self, source, key, fetch):
+        """Run a sync fetch under the source's rate limit, sharing it with identical in-flight calls"""
+        def limited():
+            self.rate_limiters[source].acquire()
+            return fetch()
+        return self.inflight.call((source, key), limited)
+
+    async def _throttled_async(self, source, key, fetch):
+        """Async _throttled; fetch is a coroutine function"""
+        async def limited():
+            await self.rate_limiters[source].acquire_async()
+            return await fetch()
+        return await self.inflight_async.call((source, key), limited)
+
+    def get_rate_limit_stats(self):
+        """Per-source limiter queue depth and wait times, plus coalesced request counts"""
+        stats = {source: limiter.stats() for source, limiter in self.rate_limiters.items()}
+        stats['coalesced'] = self.inflight.coalesced + self.inflight_async.coalesced
+        return stats
+
+    def set_response_store(self, store):
+        """Use another http_store.ResponseStore (None disables conditional requests)"""
+        self.responses = store
+        self.http.response_store = store
+
+    def get_transfer_stats(self):
+        """Stored responses, 304s served from them and bytes saved by 304s and compression"""
+        return self.responses.stats() if self.responses is not None else {}
+
+    def start_background_refresh(self):
+        """
+        Refresh each dataset on its UPDATE_INTERVALS cadence in the background
+        so get_* readers always hit a warm cache. Returns the scheduler, whose
+        subscribe() publishes only what changed between refreshes.
+        """
+        if self.scheduler is None:
+            self.scheduler = data_manager_scheduler(self).start()
+        return self.scheduler
+
+    def close(self):
+        """Stop background refresh and release pooled HTTP connections"""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        self.http.close()
+        for session in self.sessions.values():
+            session.close()
+
+    @property
+    def history(self):
+        """Multi-season weekly stats, memory-mapped from data/history"""
+        if self._history is None:
+            from history_store import HistoricalStatsStore
+            self._history = HistoricalStatsStore(self.data_dir / 'history')
+        return self._history
+
+    @property
+    def projection_accuracy(self):
+        """Per-source projection errors, read from data/projection_accuracy.json on first use"""
+        if self._projection_accuracy is None:
+            from consensus import SourceAccuracy
+            self._projection_accuracy = SourceAccuracy(self.data_dir / 'projection_accuracy.json')
+        return self._projection_accuracy
+
+    def get_registry(self):
+        """Return the player registry, loading the snapshot or refreshing it when due"""
+        with self._registry_lock:
+            if not self._registry_loaded:
+                self.player_registry.load()
+                self._registry_loaded = True
+            else:
+                self.player_registry.refresh_if_stale()
+        return self.player_registry
+
+    def save_warm_snapshot(self, path=None):
+        """
+        Write the player registry (with its indexes), week state, injuries,
+        trending adds and the current week's projections to one pickle file,
+        so a later process can start warm with a single read.
+        """
+        path = Path(path) if path else self.warm_snapshot_path
+        registry = self.get_registry()
+        state = self._get_current_state()
+        season, week = self._season_week()
+        consensus = self.get_projection_consensus()
+
+        snapshot = {
+            'version': WARM_SNAPSHOT_VERSION,
+            'created_at': time.time(),
+            'registry': registry.state(),
+            'state': None if state.get('estimated') else state,
+            'injuries': self.get_injuries(),
+            'trending': self.cache.get_or_load(
+                'trending', 'add', lambda: self._get_sleeper_data("stats/nfl/trending/add")
+            ),
+            'projections': {
+                'season': season,
+                'week': week,
+                # NumPy arrays only, so loading the snapshot doesn't need pandas
+                'consensus': consensus
+            }
+        }
+
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    def load_warm_snapshot(self, path=None):
+        """
+        Seed the registry and cache from save_warm_snapshot's file. Entries
+        older than their cache TTL are skipped, so stale parts are fetched
+        normally. Returns False when there is no usable snapshot.
+        """
+        path = Path(path) if path else self.warm_snapshot_path
+        try:
+            snapshot = pickle.loads(path.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Error loading warm snapshot: {e}")
+            return False
+        if not isinstance(snapshot, dict) or snapshot.get('version') != WARM_SNAPSHOT_VERSION:
+            return False
+
+        age = time.time() - snapshot['created_at']
+        with self._registry_lock:
+            self.player_registry.restore(snapshot['registry'])
+            self._registry_loaded = True
+
+        for category, key, value in (
+            ('state', 'nfl', snapshot['state']),
+            ('injuries', 'nfl', snapshot['injuries']),
+            ('trending', 'add', snapshot['trending'])
+        ):
+            ttl = ttl_for(category) - age
+            if value is not None and ttl > 0:
+                self.cache.set(category, key, value, ttl=ttl)
+
+        # The consensus keeps its own refresh time, so it expires like a fetched one
+        projections = snapshot['projections']
+        if projections['consensus'] is not None and projections['consensus'].age() < ttl_for('projections'):
+            self.consensus[(projections['season'], projections['week'])] = projections['consensus']
+        return True
 
     def get_player_stats(self, player_name):
         """Get comprehensive player stats from multiple sources"""
-        cache_key = f"player_stats_{player_name}_{datetime.now().strftime('%Y-%m-%d')}"
-        
-        if cache_key in self.cache and time.time() - self.cache[cache_key]['timestamp'] < self.cache_expiry:
-            return self.cache[cache_key]['data']
-        
-        # Get player ID from Sleeper
-        players = self._get_sleeper_data("players")
-        player_id = None
-        for pid, data in players.items():
-            if data.get('full_name', '').lower() == player_name.lower():
-                player_id = pid
-                break
+        return self.cache.get_or_load(
+            'player_stats', player_name.lower(),
+            lambda: self.http.run(self._fetch_player_stats_async(player_name))
+        )
+
+    async def get_player_stats_async(self, player_name):
+        """Async get_player_stats; the three sources are queried concurrently"""
+        # A cache miss reaches sqlite, so keep cache access off the event loop
+        stats = await asyncio.to_thread(self.cache.get, 'player_stats', player_name.lower())
+        if stats is None:
+            stats = await self.http.submit(self._fetch_player_stats_async(player_name))
+            if stats is not None:
+                await asyncio.to_thread(self.cache.set, 'player_stats', player_name.lower(), stats)
+        return stats
+
+    async def get_player_stats_many(self, player_names):
+        """Fetch stats for many players concurrently, returning {name: stats}"""
+        results = await asyncio.gather(*(self.get_player_stats_async(name) for name in player_names))
+        return dict(zip(player_names, results))
+
+    async def _fetch_player_stats_async(self, player_name):
+        """Fetch and combine player stats, bypassing the cache"""
+        # Get player ID from the Sleeper registry (may refresh it, so keep it off the loop)
+        registry = await asyncio.to_thread(self.get_registry)
+        player_id = registry.find_id(player_name)
         
         if not player_id:
             return None
             
-        # Get stats from multiple sources
-        stats = {}
-        
-        # ESPN Stats
-        espn_stats = self._get_espn_data(f"players/{player_id}/stats")
-        if espn_stats:
-            stats['espn'] = espn_stats
-            
         # NFL Stats
         nfl_query = """
         {
@@ -110,25 +459,21 @@ class DataManager:
             }
         }
         """ % player_id
-        nfl_stats = self._get_nfl_data(nfl_query)
-        if nfl_stats:
-            stats['nfl'] = nfl_stats
-            
-        # Sleeper Stats
-        sleeper_stats = self._get_sleeper_data(f"stats/nfl/player/{player_id}")
-        if sleeper_stats:
-            stats['sleeper'] = sleeper_stats
+
+        # Get stats from ESPN, NFL and Sleeper at the same time
+        espn_stats, nfl_stats, sleeper_stats = await asyncio.gather(
+            self._get_espn_data_async(f"players/{player_id}/stats"),
+            self._get_nfl_data_async(nfl_query),
+            self._get_sleeper_data_async(f"stats/nfl/player/{player_id}")
+        )
+
+        stats = {}
+        for source, data in (('espn', espn_stats), ('nfl', nfl_stats), ('sleeper', sleeper_stats)):
+            if data:
+                stats[source] = data
             
         # Combine stats from different sources
-        combined_stats = self._combine_stats(stats)
-        
-        # Cache the results
-        self.cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': combined_stats
-        }
-        
-        return combined_stats
+        return self._combine_stats(stats)
 
     def _combine_stats(self, stats):
         """Combine stats from different sources with priority order"""
@@ -149,109 +494,416 @@ class DataManager:
 
     def get_injuries(self):
         """Get latest injury reports"""
-        cache_key = f"injuries_{datetime.now().strftime('%Y-%m-%d_%H')}"
-        
-        if cache_key in self.cache and time.time() - self.cache[cache_key]['timestamp'] < self.cache_expiry:
-            return self.cache[cache_key]['data']
-            
-        injuries = self._get_sleeper_data("injuries/nfl")
-        
-        self.cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': injuries
+        return self.cache.get_or_load(
+            'injuries', 'nfl',
+            lambda: self._get_sleeper_data("injuries/nfl")
+        )
+
+    def get_league_rosters(self, league_id):
+        """A Sleeper league's rosters as {roster_id: [player ids]}"""
+        return self.cache.get_or_load(
+            'rosters', str(league_id),
+            lambda: self._league_rosters(self._get_sleeper_data(f"league/{league_id}/rosters"))
+        )
+
+    def get_league_rosters_many(self, league_ids):
+        """get_league_rosters for many leagues, fetching the uncached ones concurrently"""
+        return self._get_leagues_many(
+            'rosters', league_ids, lambda league_id: f"league/{league_id}/rosters", self._league_rosters
+        )
+
+    def get_league_matchups(self, league_id, week=None):
+        """A Sleeper league's matchups for a week as {matchup_id: {roster_id: [starter ids]}}"""
+        return self.get_league_matchups_many([league_id], week)[str(league_id)]
+
+    def get_league_matchups_many(self, league_ids, week=None):
+        """get_league_matchups for many leagues, fetching the uncached ones concurrently"""
+        if week is None:
+            week = self._get_current_week()
+        return self._get_leagues_many(
+            'matchups', league_ids, lambda league_id: f"league/{league_id}/matchups/{week}",
+            self._league_matchups, key_suffix=f"_week_{week}"
+        )
+
+    def _get_leagues_many(self, category, league_ids, endpoint, transform, key_suffix=''):
+        """Cached per-league Sleeper data; misses are requested concurrently, {league_id: value or None}"""
+        values = {
+            str(league_id): self.cache.get(category, f"{league_id}{key_suffix}") for league_id in league_ids
         }
-        
-        return injuries
+        missing = [league_id for league_id, value in values.items() if value is None]
+
+        async def fetch_all():
+            return await asyncio.gather(*(
+                self._get_sleeper_data_async(endpoint(league_id)) for league_id in missing
+            ))
+
+        for league_id, payload in zip(missing, self.http.run(fetch_all()) if missing else []):
+            values[league_id] = transform(payload)
+            if values[league_id] is not None:
+                self.cache.set(category, f"{league_id}{key_suffix}", values[league_id])
+        return values
+
+    @staticmethod
+    def _league_rosters(payload):
+        if not isinstance(payload, list):
+            return None
+        return {
+            str(roster.get('roster_id')): [str(player_id) for player_id in roster.get('players') or []]
+            for roster in payload
+        }
+
+    @staticmethod
+    def _league_matchups(payload):
+        if not isinstance(payload, list):
+            return None
+        matchups = {}
+        for entry in payload:
+            if entry.get('matchup_id') is not None:
+                matchups.setdefault(str(entry['matchup_id']), {})[str(entry.get('roster_id'))] = [
+                    str(player_id) for player_id in entry.get('starters') or [] if player_id and player_id != '0'
+                ]
+        return matchups
+
+    async def get_live_stats_async(self, week=None):
+        """
+        Cumulative stats so far for every player in a week (Sleeper's
+        {player_id: {stat: value}}), uncached, for live scoring polls.
+        Repeat polls are conditional requests, so an unchanged feed is a 304.
+        """
+        season, week = await asyncio.to_thread(self._season_week, week)
+        return await self.http.submit(self._get_sleeper_data_async(f"stats/nfl/regular/{season}/{week}"))
 
     def get_projections(self, player_id):
-        """Get player projections from multiple sources"""
+        """
+        Get player projections from multiple sources: the week's consensus
+        when it covers the player, otherwise a per-player fetch
+        """
+        consensus = self.get_projection_consensus()
+        projections = consensus.player(player_id) if consensus is not None else None
+        if projections is not None:
+            return projections
+        return self.cache.get_or_load(
+            'projections', str(player_id),
+            lambda: self.http.run(self._fetch_projections_async(player_id))
+        )
+
+    async def _fetch_projections_async(self, player_id):
+        """Fetch and combine player projections, bypassing the cache"""
+        espn_proj, sleeper_proj = await asyncio.gather(
+            self._get_espn_data_async(f"players/{player_id}/projections"),
+            self._get_sleeper_data_async(f"projections/nfl/player/{player_id}")
+        )
+
         projections = {}
-        
-        # ESPN Projections
-        espn_proj = self._get_espn_data(f"players/{player_id}/projections")
         if espn_proj:
-            projections['espn'] = espn_proj
-            
-        # Sleeper Projections
-        sleeper_proj = self._get_sleeper_data(f"projections/nfl/player/{player_id}")
+            projections['ESPN'] = espn_proj
         if sleeper_proj:
-            projections['sleeper'] = sleeper_proj
+            projections['SLEEPER'] = sleeper_proj
             
         return self._combine_projections(projections)
 
     def _combine_projections(self, projections):
-        """Average out projections from different sources"""
+        """Weighted average of projections from different sources ({source: stats})"""
         if not projections:
             return None
-            
+
+        sources = DATA_SOURCES_PRIORITY['projections']
+        weights = self.projection_accuracy.weights(sources, PROJECTION_STATS)
+        normalized = {source.upper(): self._projection_stats(proj) for source, proj in projections.items()}
+
         combined = {}
-        for stat_type in ['points', 'passing_yards', 'rushing_yards', 'receiving_yards']:
-            values = [
-                proj[stat_type] for source, proj in projections.items()
-                if stat_type in proj
-            ]
-            if values:
-                combined[stat_type] = sum(values) / len(values)
+        for k, stat_type in enumerate(PROJECTION_STATS):
+            total = weight_total = 0.0
+            for s, source in enumerate(sources):
+                value = normalized.get(source, {}).get(stat_type)
+                if value is not None:
+                    total += float(weights[s, k]) * value
+                    weight_total += float(weights[s, k])
+            if weight_total:
+                combined[stat_type] = total / weight_total
                 
         return combined
 
+    def get_week_projections(self, week=None):
+        """
+        Projections for every player in a week, as a DataFrame indexed by
+        Sleeper player id with PROJECTION_STATS columns: the weighted
+        consensus of get_projection_consensus, cached per week.
+        """
+        season, week = self._season_week(week)
+
+        def load():
+            consensus = self.get_projection_consensus(week)
+            return consensus.frame() if consensus is not None else None
+
+        return self.cache.get_or_load('projections', f"week_{season}_{week}", load)
+
+    def get_projection_consensus(self, week=None):
+        """
+        The week's ConsensusProjections (players x sources x stats, with
+        weighted mean, median and spread per player). Refreshed from every
+        source once older than the projections TTL; None if nothing loads.
+        """
+        season, week = self._season_week(week)
+
+        consensus = self.consensus.get((season, week))
+        if consensus is None or consensus.age() >= ttl_for('projections'):
+            consensus = self.http.run(self._refresh_consensus_async(season, week))
+        return consensus if consensus is not None and len(consensus) else None
+
+    async def _refresh_consensus_async(self, season, week):
+        """
+        Fetch bulk weekly projections from each source concurrently and apply
+        them to the week's consensus, one source slice at a time. Unchanged
+        payloads (a 304 hands back the stored object) are skipped.
+        """
+        from consensus import ConsensusProjections
+
+        espn_proj, sleeper_proj = await asyncio.gather(
+            self._get_espn_data_async("players/projections", params={'season': season, 'week': week}),
+            self._get_sleeper_data_async(f"projections/nfl/regular/{season}/{week}")
+        )
+
+        consensus = self.consensus.get((season, week))
+        if consensus is None:
+            consensus = ConsensusProjections(
+                DATA_SOURCES_PRIORITY['projections'], PROJECTION_STATS,
+                self.projection_accuracy.weights(DATA_SOURCES_PRIORITY['projections'], PROJECTION_STATS)
+            )
+        for source, payload in (('ESPN', espn_proj), ('SLEEPER', sleeper_proj)):
+            if payload:
+                consensus.update_source(source, self._projection_records(payload), payload)
+        # Stamped even when both sources failed, so callers don't retry on every lookup
+        consensus.updated_at = time.time()
+        self.consensus[(season, week)] = consensus
+        return consensus
+
+    async def _fetch_week_projections_async(self, season, week):
+        """Refresh the week's consensus and return it as a DataFrame (see get_week_projections)"""
+        consensus = await self._refresh_consensus_async(season, week)
+        return consensus.frame()
+
+    def learn_projection_weights(self, week):
+        """
+        Score each source's projections for a finished week against Sleeper's
+        actual stats, then reweight every loaded consensus by the running
+        accuracy. Each week counts once. Returns the new sources x stats weights.
+        """
+        season, week = self._season_week(week)
+        consensus = self.get_projection_consensus(week)
+        actuals = self._get_sleeper_data(f"stats/nfl/regular/{season}/{week}")
+        if consensus is None or not actuals:
+            return None
+
+        accuracy = self.projection_accuracy
+        if accuracy.record(consensus, self._projection_records(actuals), f"{season}-{week}"):
+            accuracy.save()
+        weights = accuracy.weights(DATA_SOURCES_PRIORITY['projections'], PROJECTION_STATS)
+        for (loaded_season, loaded_week), loaded in list(self.consensus.items()):
+            loaded.set_weights(weights)
+            self.cache.delete('projections', f"week_{loaded_season}_{loaded_week}")
+        return weights
+
+    @staticmethod
+    def _projection_stats(stats):
+        """One player's projection stats under PROJECTION_STATS names (Sleeper keys are mapped)"""
+        record = {}
+        for key, value in stats.items():
+            key = SLEEPER_PROJECTION_FIELDS.get(key, key)
+            if key in PROJECTION_STATS and isinstance(value, (int, float)):
+                record[key] = value
+        return record
+
+    @classmethod
+    def _projection_records(cls, payload):
+        """
+        Normalize a bulk projections payload to {player_id: stats}. Accepts
+        either {player_id: stats} or [{'player_id': ..., 'stats': {...}}].
+        """
+        if isinstance(payload, dict):
+            rows = payload.items()
+        elif isinstance(payload, list):
+            rows = ((entry.get('player_id'), entry.get('stats', entry)) for entry in payload)
+        else:
+            rows = ()
+
+        records = {}
+        for player_id, stats in rows:
+            if player_id is None or not isinstance(stats, dict):
+                continue
+            record = cls._projection_stats(stats)
+            if record:
+                records[str(player_id)] = record
+        return records
+
+    def get_historical_stats(self, columns=None, **filters):
+        """
+        Weekly stats from the local history store, e.g.
+        get_historical_stats(['receptions'], positions=['WR'], last_weeks=4).
+        Returns None until the store has been built (history.import_seasons).
+        """
+        if not self.history.exists():
+            return None
+        return self.history.query(columns, **filters)
+
     def get_matchups(self, week=None):
         """Get NFL matchups for specified week"""
         if week is None:
             week = self._get_current_week()
             
-        cache_key = f"matchups_week_{week}"
-        
-        if cache_key in self.cache and time.time() - self.cache[cache_key]['timestamp'] < self.cache_expiry:
-            return self.cache[cache_key]['data']
-            
-        matchups = self._get_sleeper_data(f"schedule/nfl/{week}")
-        
-        self.cache[cache_key] = {
-            'timestamp': time.time(),
-            'data': matchups
-        }
-        
-        return matchups
+        return self.cache.get_or_load(
+            'matchups', f"week_{week}",
+            lambda: self._get_sleeper_data(f"schedule/nfl/{week}")
+        )
+
+    def get_matchup_index(self, week=None):
+        """
+        The week's MatchupIndex: opponents, home/away and byes from the
+        schedule, rest-of-season strength of schedule from the later weeks'
+        schedules, and points allowed by position from the history store
+        (neutral until it is built). Built once per week and kept, unless a
+        schedule failed to load; then it is rebuilt after STATE_RETRY_SECONDS.
+        """
+        from matchup_index import REGULAR_SEASON_WEEKS, MatchupIndex
+
+        season, week = self._season_week(week)
+        index, expires_at = self.matchup_indexes.get((season, week), (None, None))
+        if index is None or (expires_at is not None and time.time() >= expires_at):
+            weeks = list(range(week, max(week, REGULAR_SEASON_WEEKS) + 1))
+            schedules = self._get_schedules(weeks)
+            allowed = None
+            if self.history.exists():
+                allowed = self.history.points_allowed(
+                    last_weeks=DEFENSE_WINDOW_WEEKS, before=int(season) * 100 + week
+                )
+            index = MatchupIndex.build(week, schedules, allowed)
+            complete = all(schedule is not None for schedule in schedules.values())
+            self.matchup_indexes[(season, week)] = (index, None if complete else time.time() + STATE_RETRY_SECONDS)
+        return index
+
+    def _get_schedules(self, weeks):
+        """
+        {week: schedule or None} for several weeks, cached like get_matchups.
+        The cache is read here, off the event loop; only misses are fetched,
+        concurrently.
+        """
+        schedules = {week: self.cache.get('matchups', f"week_{week}") for week in weeks}
+        missing = [week for week, games in schedules.items() if games is None]
+
+        async def fetch_all():
+            return await asyncio.gather(*(self._get_sleeper_data_async(f"schedule/nfl/{week}") for week in missing))
+
+        for week, games in zip(missing, self.http.run(fetch_all()) if missing else []):
+            schedules[week] = games
+            if games is not None:
+                self.cache.set('matchups', f"week_{week}", games)
+        return schedules
+
+    def _get_current_state(self):
+        """
+        Get current NFL state (season, week, ...). If Sleeper can't be reached,
+        the last state seen (or a calendar estimate) stands in for
+        STATE_RETRY_SECONDS before the next attempt.
+        """
+        state = self.cache.get_or_load('state', 'nfl', lambda: self._get_sleeper_data("state/nfl"))
+        if state:
+            self._last_state = state
+            return state
+        from matchup_index import estimated_state
+        state = self._last_state or estimated_state()
+        self.cache.set('state', 'nfl', state, ttl=STATE_RETRY_SECONDS)
+        return state
 
     def _get_current_week(self):
         """Get current NFL week"""
-        return self._get_sleeper_data("state/nfl")['week']
+        return self._season_week()[1]
+
+    def _season_week(self, week=None):
+        """(season, week) for a week of the current season, defaulting to the current week"""
+        state = self._get_current_state()
+        return state.get('season'), week or state.get('week') or 1
+
+    def get_waiver_recommendations(self, position=None, limit=20):
+        """
+        Get waiver wire recommendations based on trends and projections, with
+        each player's opponent this week and how favorable it is
+        (matchup_factor) and the rest of the schedule (schedule_factor);
+        1.0 is an average defense against the position
+        """
+        import pandas as pd
+        from lineup_optimizer import POSITION_CODES, normalize_position
+
+        registry = self.get_registry()
+        trends = self.cache.get_or_load(
+            'trending', 'add',
+            lambda: self._get_sleeper_data("stats/nfl/trending/add")
+        ) or []
+        if not trends:
+            return []
+
+        # Join trending adds with the registry and the week's bulk projections in memory
+        table = pd.DataFrame(trends, columns=['player_id', 'count'])
+        table['player_id'] = table['player_id'].astype(str)
+        table = table.rename(columns={'count': 'trend_score'}).drop_duplicates('player_id')
+        players = [registry.get(player_id) or {} for player_id in table['player_id']]
+        for field in ('full_name', 'position', 'team'):
+            table[field] = [player.get(field) for player in players]
+        table = table[table['full_name'].notna()]
+
+        if position is not None:
+            table = table[table['position'] == position]
+        table = table.nlargest(limit, 'trend_score')
+
+        projections = self.get_week_projections()
+        if projections is not None:
+            table = table.join(projections, on='player_id')
+
+        # Opponent strength for the whole table in one gather per factor
+        matchups = self.get_matchup_index()
+        teams = matchups.team_codes(table['team'].tolist())
+        positions = [POSITION_CODES.get(normalize_position(p), -1) for p in table['position']]
+        table['matchup_factor'] = matchups.matchup[teams, positions]
+        table['schedule_factor'] = matchups.sos[teams, positions]
 
-    def get_waiver_recommendations(self, position=None):
-        """Get waiver wire recommendations based on trends and projections"""
-        players = self._get_sleeper_data("players/nfl")
-        trends = self._get_sleeper_data("stats/nfl/trending/add")
-        
         recommendations = []
-        for trend in trends[:20]:  # Top 20 trending players
-            player = players.get(str(trend['player_id']))
-            if player and (position is None or player['position'] == position):
-                proj = self.get_projections(trend['player_id'])
-                recommendations.append({
-                    'name': player['full_name'],
-                    'position': player['position'],
-                    'team': player['team'],
-                    'trend_score': trend['count'],
-                    'projections': proj
-                })
+        for row in table.to_dict('records'):
+            proj = {
+                stat: row[stat] for stat in PROJECTION_STATS
+                if stat in row and pd.notna(row[stat])
+            }
+            recommendations.append({
+                'name': row['full_name'],
+                'position': row['position'],
+                'team': row['team'],
+                'trend_score': row['trend_score'],
+                'projections': proj or None,
+                'matchup': matchups.game(row['team']),
+                'matchup_factor': round(float(row['matchup_factor']), 3),
+                'schedule_factor': round(float(row['schedule_factor']), 3)
+            })
                 
-        return sorted(recommendations, key=lambda x: x['trend_score'], reverse=True)
+        return recommendations
 
     def evaluate_trade(self, players_giving, players_receiving):
         """Evaluate trade based on current stats, projections, and trends"""
         giving_value = 0
         receiving_value = 0
+
+        # Warm the stats cache for both sides in one concurrent batch
+        self.http.run(self.get_player_stats_many(list(players_giving) + list(players_receiving)))
+        registry = self.get_registry()
         
         for player in players_giving:
             stats = self.get_player_stats(player)
-            proj = self.get_projections(player)
+            player_id = registry.find_id(player)
+            proj = self.get_projections(player_id) if player_id else None
             if stats and proj:
                 giving_value += self._calculate_player_value(stats, proj)
                 
         for player in players_receiving:
             stats = self.get_player_stats(player)
-            proj = self.get_projections(player)
+            player_id = registry.find_id(player)
+            proj = self.get_projections(player_id) if player_id else None
             if stats and proj:
                 receiving_value += self._calculate_player_value(stats, proj)
                 
@@ -264,20 +916,8 @@ class DataManager:
 
     def _calculate_player_value(self, stats, projections):
         """Calculate player value based on stats and projections"""
-        # Complex value calculation algorithm
-        value = 0
-        
-        # Weight recent performance more heavily
-        if stats:
-            value += stats.get('passing_yards', 0) * 0.04
-            value += stats.get('passing_touchdowns', 0) * 4
-            value += stats.get('rushing_yards', 0) * 0.1
-            value += stats.get('rushing_touchdowns', 0) * 6
-            value += stats.get('receiving_yards', 0) * 0.1
-            value += stats.get('receiving_touchdowns', 0) * 6
-            
-        # Add projected value
-        if projections:
-            value += projections.get('points', 0) * 0.5
-            
-        return value
+        from scoring import player_values
+
+        # Same math as scoring.player_values, which scores a whole pool at once
+        projected_points = (projections or {}).get('points', 0)
+        return float(player_values([stats or {}], [projected_points])[0])
@@ -0,0 +1,463 @@
+"""
+Draft assistant: value over replacement (VOR) for every player on the board,
+kept current pick by pick, plus a snake-draft simulator.
+
+A position's replacement level is the best player still available once
+every open starting slot in the league is filled: dedicated slots take the
+top players at their position, flex slots the best of what's left among
+the eligible positions. A pick only changes the drafting team's open slots
+and one position's available list, so after each pick the demand,
+replacement levels, scarcity and VOR are rederived from small per-position
+arrays instead of rescoring the board.
+
+    board = DraftBoard.from_data_manager(data_manager, teams=12)
+    board.recommend()          # for the team on the clock
+    board.pick('4046')
+
+mock_drafts() runs thousands of drafts at once, one row per draft, with
+every team taking the best allowed player on its own noisy copy of the
+board's rankings (ADP-style spread), and reports the distribution of value
+taken at each pick and each draft slot.
+
+    python draft.py --teams 12 --mock 2000 --workers 4
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from config import DEFAULT_LEAGUE_SETTINGS
+from lineup_optimizer import FLEX_ELIGIBILITY, POSITION_CODES, POSITIONS, LineupOptimizer, normalize_position
+
+# Recommendation weight of VOR at positions where the team has no open starting slot
+BENCH_WEIGHT = 0.35
+
+# Players a team may hold beyond its starting slots (dedicated plus eligible flex), per position
+BENCH_LIMITS = {'QB': 1, 'RB': 3, 'WR': 3, 'TE': 1, 'D/ST': 0, 'K': 0}
+
+# Mock drafts: spread of each room's rankings (x the board's points std) and drafts per task
+ADP_NOISE = 0.15
+MOCK_CHUNK = 250
+DEFAULT_MOCK_DRAFTS = 2000
+
+
+def roster_slots(roster_positions=None):
+    """
+    Drafted slots of a roster: (dedicated starting slots per POSITIONS code,
+    [(flex slot, count, eligible codes)] narrowest first, bench size). IR is
+    not drafted.
+    """
+    roster_positions = roster_positions or DEFAULT_LEAGUE_SETTINGS['roster_positions']
+    dedicated = np.zeros(len(POSITIONS), dtype=np.int64)
+    flex, bench = [], 0
+    for slot, count in roster_positions.items():
+        slot = normalize_position(slot)
+        if slot in POSITION_CODES:
+            dedicated[POSITION_CODES[slot]] += count
+        elif slot in FLEX_ELIGIBILITY:
+            flex.append((slot, count, [POSITION_CODES[p] for p in FLEX_ELIGIBILITY[slot]]))
+        elif slot == 'BE':
+            bench += count
+    flex.sort(key=lambda entry: len(entry[2]))
+    return dedicated, flex, bench
+
+
+def snake_team(pick, teams):
+    """Team (0-based) on the clock at a 0-based overall pick"""
+    draft_round, slot = divmod(pick, teams)
+    return slot if draft_round % 2 == 0 else teams - 1 - slot
+
+
+class DraftBoard:
+    """
+    A live draft over a fixed board of players with season point
+    projections. Player arrays are indexed by board row; positions are
+    POSITIONS codes.
+    """
+
+    def __init__(self, player_ids, positions, points, names=None, teams=None, roster_positions=None):
+        self.ids = [str(player_id) for player_id in player_ids]
+        self.index = {player_id: row for row, player_id in enumerate(self.ids)}
+        self.names = list(names) if names is not None else list(self.ids)
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.points = np.asarray(points, dtype=np.float64)
+        self.teams = teams or DEFAULT_LEAGUE_SETTINGS['teams']
+        self.roster_positions = roster_positions or DEFAULT_LEAGUE_SETTINGS['roster_positions']
+
+        self.dedicated, self.flex, self.bench = roster_slots(self.roster_positions)
+        self.rounds = int(self.dedicated.sum()) + sum(count for _, count, _ in self.flex) + self.bench
+        # Starting-slot allowance per position (dedicated plus every flex it can fill) and hard caps
+        self.allowance = self.dedicated.copy()
+        for _, count, codes in self.flex:
+            self.allowance[codes] += count
+        self.caps = self.allowance + np.array([BENCH_LIMITS.get(position, 0) for position in POSITIONS])
+
+        # Each position's rows, best projection first
+        order = np.argsort(-self.points, kind='stable')
+        self.by_position = [order[self.positions[order] == code] for code in range(len(POSITIONS))]
+        self.reset()
+
+    @classmethod
+    def from_data_manager(cls, data_manager, teams=None, roster_positions=None, board_size=None, week=None):
+        """
+        Board of the registry's players with a season projection: the week's
+        consensus points times the games left (this week unless on bye, plus
+        the rest of the schedule from the matchup index). board_size keeps
+        the top players only.
+        """
+        registry = data_manager.get_registry()
+        projections = data_manager.get_week_projections(week)
+        if projections is None:
+            return cls([], [], [], teams=teams, roster_positions=roster_positions)
+        matchups = data_manager.get_matchup_index(week)
+
+        player_ids = [player_id for player_id in projections.index if player_id in registry.players]
+        records = [registry.players[player_id] for player_id in player_ids]
+        positions = np.array(
+            [POSITION_CODES.get(normalize_position(record.get('position')), -1) for record in records], dtype=np.int64
+        )
+        weekly = projections['points'].reindex(player_ids).fillna(0).to_numpy()
+        team_codes = matchups.team_codes([record.get('team') for record in records])
+        games = np.where(team_codes >= 0, matchups.remaining_games[team_codes] + ~matchups.bye[team_codes], 0)
+        points = weekly * games
+
+        keep = np.flatnonzero((positions >= 0) & (points > 0))
+        if board_size is not None:
+            keep = keep[np.argsort(-points[keep], kind='stable')[:board_size]]
+        return cls(
+            [player_ids[row] for row in keep], positions[keep], points[keep],
+            [records[row].get('full_name') or player_ids[row] for row in keep],
+            teams, roster_positions
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Live draft
+
+    def reset(self):
+        """Clear every pick"""
+        teams = self.teams
+        self.available = np.ones(len(self.ids), dtype=bool)
+        self.need = np.tile(self.dedicated, (teams, 1))  # open dedicated slots, teams x positions
+        self.flex_need = np.tile([count for _, count, _ in self.flex], (teams, 1)).reshape(teams, len(self.flex))
+        self.bench_left = np.full(teams, self.bench)
+        self.held = np.zeros((teams, len(POSITIONS)), dtype=np.int64)
+        self.picks = []  # (team, row, slot filled)
+        self.remaining = [rows.copy() for rows in self.by_position]
+        self._update()
+        self.initial_vor = self.vor.copy()
+
+    def on_clock(self):
+        """Team (0-based) making the next pick, or None once the draft is over"""
+        if len(self.picks) >= self.teams * self.rounds:
+            return None
+        return snake_team(len(self.picks), self.teams)
+
+    def pick(self, player_id, team=None):
+        """Record a pick (by the team on the clock unless given) and update the board"""
+        row = self.index.get(str(player_id))
+        if row is None or not self.available[row]:
+            raise ValueError(f"Player {player_id} is not available")
+        team = self.on_clock() if team is None else team
+        code = self.positions[row]
+
+        # Fill a dedicated slot, else the narrowest open flex slot, else the bench
+        if self.need[team, code] > 0:
+            slot = ('need', code)
+            self.need[team, code] -= 1
+        else:
+            slot = ('bench', None)
+            for f, (_, _, codes) in enumerate(self.flex):
+                if code in codes and self.flex_need[team, f] > 0:
+                    slot = ('flex', f)
+                    self.flex_need[team, f] -= 1
+                    break
+            else:
+                self.bench_left[team] -= 1
+
+        self.available[row] = False
+        self.held[team, code] += 1
+        self.picks.append((team, row, slot))
+        self._refresh_position(code)
+        self._update()
+        return self.player(row)
+
+    def undo(self):
+        """Take back the last pick"""
+        if not self.picks:
+            return None
+        team, row, (kind, where) = self.picks.pop()
+        if kind == 'need':
+            self.need[team, where] += 1
+        elif kind == 'flex':
+            self.flex_need[team, where] += 1
+        else:
+            self.bench_left[team] += 1
+        code = self.positions[row]
+        self.available[row] = True
+        self.held[team, code] -= 1
+        self._refresh_position(code)
+        self._update()
+        return self.player(row)
+
+    def _refresh_position(self, code):
+        rows = self.by_position[code]
+        self.remaining[code] = rows[self.available[rows]]
+
+    def _update(self):
+        """Starter demand, replacement level, scarcity and VOR from the current picks"""
+        points, remaining = self.points, self.remaining
+        demand = self.need.sum(axis=0)
+        # Open flex slots go to the best players left beyond each position's dedicated demand
+        for f, (_, _, codes) in enumerate(self.flex):
+            open_slots = int(self.flex_need[:, f].sum())
+            if not open_slots:
+                continue
+            candidates = np.concatenate([remaining[code][demand[code]:] for code in codes])
+            if len(candidates) > open_slots:
+                candidates = candidates[np.argpartition(-points[candidates], open_slots - 1)[:open_slots]]
+            demand = demand + np.bincount(self.positions[candidates], minlength=len(POSITIONS))
+        self.demand = demand
+
+        replacement = np.zeros(len(POSITIONS))
+        scarcity = np.zeros(len(POSITIONS))
+        for code, rows in enumerate(remaining):
+            if len(rows) > demand[code]:
+                replacement[code] = points[rows[demand[code]]]
+            if len(rows):
+                # What waiting a full round costs at this position
+                scarcity[code] = points[rows[0]] - points[rows[min(self.teams, len(rows) - 1)]]
+        self.replacement = replacement
+        self.scarcity = scarcity
+        self.vor = points - replacement[self.positions]
+
+    def open_positions(self, team):
+        """Positions the team still has a starting slot for"""
+        open_slots = self.need[team] > 0
+        for f, (_, _, codes) in enumerate(self.flex):
+            if self.flex_need[team, f] > 0:
+                open_slots[codes] = True
+        return open_slots
+
+    def recommend(self, team=None, limit=10):
+        """
+        Best available players for a team (default: on the clock) by VOR,
+        discounted by BENCH_WEIGHT where it has no open starting slot; with
+        the bench full, or only enough picks left for its starters, only
+        open positions are offered (unless none of those are left).
+        """
+        team = self.on_clock() if team is None else team
+        if team is None:
+            return []
+        open_slots = self.open_positions(team)
+        picks_left = self.rounds - int(self.held[team].sum())
+        starters_left = int(self.need[team].sum() + self.flex_need[team].sum())
+        allowed = open_slots | ((self.bench_left[team] > 0) & (picks_left > starters_left) & (self.held[team] < self.caps))
+
+        vor = self.vor
+        score = np.where(open_slots[self.positions], vor, np.minimum(vor, vor * BENCH_WEIGHT))
+        if not (self.available & allowed[self.positions]).any():
+            allowed[:] = True
+        score = np.where(self.available & allowed[self.positions], score, -np.inf)
+        limit = min(limit, int(np.isfinite(score).sum()))
+        if not limit:
+            return []
+        top = np.argpartition(-score, limit - 1)[:limit]
+        top = top[np.argsort(-score[top], kind='stable')]
+        return [dict(self.player(row), score=round(float(score[row]), 2)) for row in top]
+
+    def player(self, row):
+        return {
+            'player_id': self.ids[row],
+            'name': self.names[row],
+            'position': POSITIONS[self.positions[row]],
+            'points': round(float(self.points[row]), 2),
+            'vor': round(float(self.vor[row]), 2)
+        }
+
+    def summary(self):
+        """Pick number, team on the clock and per-position demand, replacement level and scarcity"""
+        return {
+            'pick': len(self.picks) + 1,
+            'team': self.on_clock(),
+            'positions': {
+                position: {
+                    'starters_left': int(self.demand[code]),
+                    'replacement': round(float(self.replacement[code]), 2),
+                    'scarcity': round(float(self.scarcity[code]), 2)
+                }
+                for code, position in enumerate(POSITIONS)
+            }
+        }
+
+
+# Snake-draft simulation
+
+def _mock_draft_chunk(args):
+    """Run n drafts at once; returns (picked rows, drafts x picks) and starting-lineup points (drafts x teams)"""
+    board, n, seed, noise = args
+    rng = np.random.default_rng(seed)
+    teams, rounds, n_players = board.teams, board.rounds, len(board)
+    positions = board.positions
+    drafts = np.arange(n)
+
+    # Each room ranks by the pre-draft VOR plus its own noise
+    scores = board.initial_vor + rng.normal(0.0, noise * (board.points.std() or 1.0), (n, n_players))
+    need = np.broadcast_to(board.dedicated, (n, teams, len(POSITIONS))).copy()
+    flex_need = np.broadcast_to([count for _, count, _ in board.flex], (n, teams, len(board.flex))).copy()
+    flex_codes = np.zeros((len(board.flex), len(POSITIONS)), dtype=bool)
+    for f, (_, _, eligible) in enumerate(board.flex):
+        flex_codes[f, eligible] = True
+    bench_left = np.full((n, teams), board.bench)
+    held = np.zeros((n, teams, len(POSITIONS)), dtype=np.int64)
+    picked = np.zeros((n, teams * rounds), dtype=np.int64)
+
+    for pick in range(teams * rounds):
+        team = snake_team(pick, teams)
+        open_slots = (need[:, team] > 0) | ((flex_need[:, team] > 0)[:, :, None] & flex_codes[None]).any(axis=1)
+        picks_left = rounds - pick // teams
+        starters_left = need[:, team].sum(axis=1) + flex_need[:, team].sum(axis=1)
+        spare = (bench_left[:, team] > 0) & (picks_left > starters_left)
+        allowed = open_slots | (spare[:, None] & (held[:, team] < board.caps))
+
+        masked = np.where(allowed[:, positions], scores, -np.inf)
+        row = np.argmax(masked, axis=1)
+        # A room with nobody left at its open positions takes the best available player
+        stuck = np.flatnonzero(~np.isfinite(masked[drafts, row]))
+        if len(stuck):
+            row[stuck] = np.argmax(scores[stuck], axis=1)
+        code = positions[row]
+        picked[:, pick] = row
+        scores[drafts, row] = -np.inf
+        held[drafts, team, code] += 1
+
+        dedicated = need[drafts, team, code] > 0
+        need[drafts[dedicated], team, code[dedicated]] -= 1
+        rest = ~dedicated
+        for f in range(len(board.flex)):
+            fills = rest & flex_codes[f, code] & (flex_need[:, team, f] > 0)
+            flex_need[fills, team, f] -= 1
+            rest &= ~fills
+        bench_left[rest, team] -= 1
+
+    # Each drafted roster's best starting lineup, every draft's rosters solved in one batch
+    team_of_pick = np.array([snake_team(pick, teams) for pick in range(teams * rounds)])
+    by_team = np.argsort(team_of_pick, kind='stable').reshape(teams, rounds)
+    rosters = picked[:, by_team].reshape(n * teams, rounds)
+    points = board.points[rosters]
+    assignment = LineupOptimizer(board.roster_positions).assign(
+        points, positions[rosters], np.ones_like(rosters, dtype=bool)
+    )
+    lineup = np.where(assignment >= 0, np.take_along_axis(points, assignment.clip(0), axis=1), 0.0).sum(axis=1)
+    return picked, lineup.reshape(n, teams)
+
+
+def _distribution(values, axis=0):
+    p10, p50, p90 = np.percentile(values, [10, 50, 90], axis=axis)
+    return np.mean(values, axis=axis), p10, p50, p90
+
+
+def mock_drafts(board, n_drafts=DEFAULT_MOCK_DRAFTS, seed=None, noise=ADP_NOISE, processes=None, top=3):
+    """
+    Simulate n_drafts snake drafts of the board across a process pool.
+    Drafts run in fixed-size chunks with their own child seeds, so results
+    repeat for a given seed whatever the worker count. Returns, per overall
+    pick, the distribution (mean, p10, p50, p90) of the points and pre-draft
+    VOR taken and the most frequent players; per draft slot, the
+    distribution of its best starting lineup's points.
+    """
+    if len(board) < board.teams * board.rounds:
+        raise ValueError(f"Board has {len(board)} players for {board.teams * board.rounds} picks")
+    started = time.perf_counter()
+    sizes = [min(MOCK_CHUNK, n_drafts - start) for start in range(0, n_drafts, MOCK_CHUNK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(board, size, child, noise) for size, child in zip(sizes, seeds)]
+
+    processes = processes if processes is not None else os.cpu_count()
+    if processes and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(tasks))) as pool:
+            results = list(pool.map(_mock_draft_chunk, tasks))
+    else:
+        results = [_mock_draft_chunk(task) for task in tasks]
+
+    picked = np.concatenate([result[0] for result in results])
+    lineups = np.concatenate([result[1] for result in results])
+    points_mean, points_p10, points_p50, points_p90 = _distribution(board.points[picked])
+    vor_mean, vor_p10, vor_p50, vor_p90 = _distribution(board.initial_vor[picked])
+    slot_mean, slot_p10, slot_p50, slot_p90 = _distribution(lineups)
+
+    picks = []
+    for pick in range(picked.shape[1]):
+        rows, counts = np.unique(picked[:, pick], return_counts=True)
+        frequent = np.argsort(-counts, kind='stable')[:top]
+        picks.append({
+            'pick': pick + 1,
+            'round': pick // board.teams + 1,
+            'team': snake_team(pick, board.teams) + 1,
+            'points': {'mean': round(float(points_mean[pick]), 2), 'p10': round(float(points_p10[pick]), 2),
+                       'p50': round(float(points_p50[pick]), 2), 'p90': round(float(points_p90[pick]), 2)},
+            'vor': {'mean': round(float(vor_mean[pick]), 2), 'p10': round(float(vor_p10[pick]), 2),
+                    'p50': round(float(vor_p50[pick]), 2), 'p90': round(float(vor_p90[pick]), 2)},
+            'players': [
+                {'name': board.names[rows[i]], 'position': POSITIONS[board.positions[rows[i]]],
+                 'share': round(float(counts[i]) / len(picked), 3)}
+                for i in frequent
+            ]
+        })
+
+    elapsed = time.perf_counter() - started
+    return {
+        'drafts': len(picked),
+        'picks': picks,
+        'slots': [
+            {'slot': team + 1, 'lineup_points': {
+                'mean': round(float(slot_mean[team]), 2), 'p10': round(float(slot_p10[team]), 2),
+                'p50': round(float(slot_p50[team]), 2), 'p90': round(float(slot_p90[team]), 2)
+            }}
+            for team in range(board.teams)
+        ],
+        'elapsed_seconds': round(elapsed, 4),
+        'drafts_per_second': round(len(picked) / elapsed) if elapsed else None
+    }
+
+
+def main():
+    from data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Draft board with value over replacement, and mock snake drafts")
+    parser.add_argument('--teams', type=int, default=DEFAULT_LEAGUE_SETTINGS['teams'])
+    parser.add_argument('--board-size', type=int, default=400)
+    parser.add_argument('--mock', type=int, default=0, help="number of mock drafts to simulate")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    data_manager = DataManager()
+    try:
+        board = DraftBoard.from_data_manager(data_manager, args.teams, board_size=args.board_size)
+    finally:
+        data_manager.close()
+    if not len(board):
+        print("No projections available to build a draft board")
+        return
+
+    print(f"{len(board)} players, {board.teams} teams x {board.rounds} rounds")
+    for position, info in board.summary()['positions'].items():
+        print(f"  {position:5} replacement {info['replacement']:>7}  scarcity {info['scarcity']:>6}")
+    print("\nTop of the board:")
+    for player in board.recommend(limit=12):
+        print(f"  {player['name']} ({player['position']}) - {player['points']} pts, VOR {player['vor']}")
+
+    if args.mock:
+        result = mock_drafts(board, args.mock, args.seed, processes=args.workers)
+        print(f"\n{result['drafts']} mock drafts in {result['elapsed_seconds']}s ({result['drafts_per_second']}/s)")
+        for slot in result['slots']:
+            points = slot['lineup_points']
+            print(f"  slot {slot['slot']:>2}: lineup {points['mean']} pts (p10 {points['p10']}, p90 {points['p90']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import json
+from pathlib import Path
+
+import numpy as np
+
+from lineup_optimizer import normalize_position
+from scoring import STAT_COLUMNS
+
+# Stored stat columns: the scoring stats plus nflverse's own fantasy totals
+HISTORY_STAT_COLUMNS = STAT_COLUMNS + ['fantasy_points', 'fantasy_points_ppr']
+
+# nflverse weekly column -> store column; summed when several map to one
+NFLVERSE_COLUMNS = {
+    'passing_yards': 'passing_yards',
+    'passing_tds': 'passing_touchdowns',
+    'interceptions': 'interceptions',
+    'rushing_yards': 'rushing_yards',
+    'rushing_tds': 'rushing_touchdowns',
+    'receptions': 'receptions',
+    'receiving_yards': 'receiving_yards',
+    'receiving_tds': 'receiving_touchdowns',
+    'sack_fumbles_lost': 'fumbles_lost',
+    'rushing_fumbles_lost': 'fumbles_lost',
+    'receiving_fumbles_lost': 'fumbles_lost',
+    'passing_2pt_conversions': 'two_point_conversions',
+    'rushing_2pt_conversions': 'two_point_conversions',
+    'receiving_2pt_conversions': 'two_point_conversions',
+    'fantasy_points': 'fantasy_points',
+    'fantasy_points_ppr': 'fantasy_points_ppr'
+}
+
+KEY_COLUMNS = {'season': np.int16, 'week': np.int8, 'week_key': np.int32, 'player': np.int32}
+
+
+class HistoricalStatsStore:
+    """
+    Per-player, per-week stats for many seasons, stored column by column as
+    .npy files under data/history and opened with mmap. Rows are sorted by
+    (position, season, week), so a position filter is a contiguous range and
+    a week range inside it is found by binary search on 'week_key'
+    (season * 100 + week). Only the requested columns' pages are read.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else Path(__file__).parent / 'data' / 'history'
+        self.index = None
+        self._columns = {}
+        self._player_ids = None
+        self._player_rows = None
+
+    # Building
+
+    def import_seasons(self, seasons):
+        """Download weekly stats with nfl_data_py and (re)build the store"""
+        import nfl_data_py
+
+        weekly = nfl_data_py.import_weekly_data(list(seasons))
+        frame = weekly[['player_id', 'position', 'season', 'week']].copy()
+        if 'recent_team' in weekly and 'opponent_team' in weekly:
+            frame['team'] = weekly['recent_team'].to_numpy()
+            frame['opponent'] = weekly['opponent_team'].to_numpy()
+        for column in HISTORY_STAT_COLUMNS:
+            frame[column] = 0.0
+        for source, target in NFLVERSE_COLUMNS.items():
+            if source in weekly:
+                frame[target] += weekly[source].fillna(0).to_numpy()
+        return self.build(frame)
+
+    def build(self, frame):
+        """
+        Write a store from a DataFrame with player_id, position, season, week
+        and any HISTORY_STAT_COLUMNS (missing stats are stored as 0). Optional
+        team and opponent columns enable points_allowed.
+        """
+        import pandas as pd
+
+        frame = frame.copy()
+        frame['position'] = [normalize_position(p) or 'UNK' for p in frame['position']]
+        frame['week_key'] = frame['season'].astype(np.int32) * 100 + frame['week'].astype(np.int32)
+        frame = frame.sort_values(['position', 'week_key', 'player_id'], kind='stable').reset_index(drop=True)
+
+        player_ids, player_codes = np.unique(frame['player_id'].astype(str).to_numpy(), return_inverse=True)
+        frame['player'] = player_codes
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        for column, dtype in KEY_COLUMNS.items():
+            np.save(self.root / f"{column}.npy", frame[column].to_numpy(dtype=dtype))
+        for column in HISTORY_STAT_COLUMNS:
+            values = frame[column].to_numpy(dtype=np.float32) if column in frame else np.zeros(len(frame), np.float32)
+            np.save(self.root / f"{column}.npy", values)
+        # Fixed-width unicode so the id column can be memory-mapped too
+        np.save(self.root / 'player_ids.npy', player_ids.astype(str))
+
+        # Team and opponent as codes into index['teams'] (-1 where unknown)
+        teams = []
+        if 'team' in frame and 'opponent' in frame:
+            team_values = frame['team'].fillna('').astype(str).to_numpy()
+            opponent_values = frame['opponent'].fillna('').astype(str).to_numpy()
+            teams = sorted((set(team_values) | set(opponent_values)) - {''})
+            codes = {team: code for code, team in enumerate(teams)}
+            for column, values in (('team', team_values), ('opponent', opponent_values)):
+                np.save(self.root / f"{column}.npy", np.array([codes.get(v, -1) for v in values], dtype=np.int8))
+
+        # Player index: rows of each player, grouped via a stable sort on the player code
+        player_rows = np.argsort(player_codes, kind='stable').astype(np.int32)
+        np.save(self.root / 'player_rows.npy', player_rows)
+        np.save(self.root / 'player_offsets.npy', np.searchsorted(player_codes[player_rows], np.arange(len(player_ids) + 1)))
+
+        positions = frame['position'].to_numpy()
+        partitions = {}
+        for position in pd.unique(positions):
+            rows = np.flatnonzero(positions == position)
+            partitions[position] = [int(rows[0]), int(rows[-1]) + 1]
+
+        week_keys = np.unique(frame['week_key'].to_numpy())
+        self.index = {
+            'rows': len(frame),
+            'columns': HISTORY_STAT_COLUMNS,
+            'partitions': partitions,
+            'week_keys': [int(k) for k in week_keys],
+            'teams': teams
+        }
+        with open(self.root / 'index.json', 'w') as f:
+            json.dump(self.index, f)
+
+        self._columns, self._player_ids, self._player_rows = {}, None, None
+        return self
+
+    # Reading
+
+    def open(self):
+        """Load the small JSON index; columns are memory-mapped on first use"""
+        if self.index is None:
+            with open(self.root / 'index.json') as f:
+                self.index = json.load(f)
+        return self
+
+    def exists(self):
+        return (self.root / 'index.json').exists()
+
+    def column(self, name):
+        """Memory-mapped column (nothing is read until rows are sliced)"""
+        if name not in self._columns:
+            self._columns[name] = np.load(self.root / f"{name}.npy", mmap_mode='r')
+        return self._columns[name]
+
+    def player_ids(self):
+        if self._player_ids is None:
+            self._player_ids = np.load(self.root / 'player_ids.npy', mmap_mode='r')
+        return self._player_ids
+
+    def _rows_for_players(self, player_ids):
+        if self._player_rows is None:
+            ids = self.player_ids()
+            self._player_rows = (
+                {pid: code for code, pid in enumerate(ids.tolist())},
+                self.column('player_rows'),
+                self.column('player_offsets')
+            )
+        codes, rows, offsets = self._player_rows
+        selected = [
+            rows[offsets[codes[pid]]:offsets[codes[pid] + 1]]
+            for pid in map(str, player_ids) if pid in codes
+        ]
+        return np.sort(np.concatenate(selected)) if selected else np.zeros(0, dtype=np.int64)
+
+    def _week_bounds(self, seasons=None, weeks=None, last_weeks=None):
+        """Inclusive (low, high) week_key range covering the predicates; empty (1, 0) if none match"""
+        keys = self.index['week_keys']
+        if seasons is not None:
+            seasons = set(seasons) if not isinstance(seasons, int) else {seasons}
+            keys = [k for k in keys if k // 100 in seasons]
+        if weeks is not None:
+            low, high = weeks
+            keys = [k for k in keys if low <= k % 100 <= high]
+        if last_weeks is not None:
+            keys = keys[-last_weeks:]
+        if not keys:
+            return (1, 0)
+        return (keys[0], keys[-1])
+
+    def query(self, columns=None, positions=None, seasons=None, weeks=None, last_weeks=None, player_ids=None):
+        """
+        Rows matching the predicates, with only the requested stat columns.
+        weeks is an inclusive (first, last) week range; last_weeks keeps the
+        most recent N weeks after the season/week filters. Returns a
+        DataFrame with player_id, position, season, week and the columns.
+        """
+        import pandas as pd
+
+        self.open()
+        columns = list(columns or HISTORY_STAT_COLUMNS)
+        low, high = self._week_bounds(seasons, weeks, last_weeks)
+
+        if player_ids is not None:
+            rows = self._rows_for_players(player_ids)
+            week_key = self.column('week_key')[rows]
+            rows = rows[(week_key >= low) & (week_key <= high)]
+            if positions is not None:
+                keep = np.zeros(len(rows), dtype=bool)
+                for position in positions:
+                    start, end = self.index['partitions'].get(normalize_position(position), (0, 0))
+                    keep |= (rows >= start) & (rows < end)
+                rows = rows[keep]
+            ranges = None
+        else:
+            partitions = self.index['partitions']
+            wanted = [normalize_position(p) for p in positions] if positions is not None else list(partitions)
+            ranges = []
+            week_key = self.column('week_key')
+            for position in wanted:
+                if position not in partitions:
+                    continue
+                start, end = partitions[position]
+                segment = week_key[start:end]
+                ranges.append((
+                    position,
+                    start + int(np.searchsorted(segment, low, side='left')),
+                    start + int(np.searchsorted(segment, high, side='right'))
+                ))
+            rows = None
+
+        def read(name):
+            data = self.column(name)
+            if ranges is None:
+                return np.asarray(data[rows])
+            return np.concatenate([data[a:b] for _, a, b in ranges]) if ranges else np.zeros(0, data.dtype)
+
+        if ranges is None:
+            partitions = sorted(self.index['partitions'].items(), key=lambda item: item[1][0])
+            starts = np.array([start for _, (start, _) in partitions], dtype=np.int64)
+            names = np.array([position for position, _ in partitions], dtype=object)
+            position_labels = names[np.searchsorted(starts, rows, side='right') - 1] if len(rows) else []
+        else:
+            position_labels = np.repeat(
+                np.array([position for position, _, _ in ranges], dtype=object),
+                [b - a for _, a, b in ranges]
+            )
+
+        week_keys = read('week_key')
+        result = {
+            'player_id': self.player_ids()[read('player')],
+            'position': position_labels,
+            'season': week_keys // 100,
+            'week': week_keys % 100
+        }
+        for name in columns:
+            result[name] = read(name)
+        frame = pd.DataFrame(result)
+
+        # The key range spans whole seasons; trim rows outside the week/season filters
+        if weeks is not None:
+            frame = frame[(frame['week'] >= weeks[0]) & (frame['week'] <= weeks[1])]
+        if seasons is not None:
+            frame = frame[frame['season'].isin({seasons} if isinstance(seasons, int) else set(seasons))]
+        return frame.reset_index(drop=True)
+
+    def points_allowed(self, column='fantasy_points_ppr', last_weeks=None, before=None):
+        """
+        Fantasy points each defense gave up to each position: {'teams',
+        'positions', 'points' (teams x positions totals), 'games' (per team)}
+        over the most recent last_weeks week keys below before (season * 100
+        + week). None if the store was built without opponents.
+        """
+        self.open()
+        teams = self.index.get('teams')
+        if not teams:
+            return None
+        keys = [k for k in self.index['week_keys'] if before is None or k < before]
+        if last_weeks is not None:
+            keys = keys[-last_weeks:]
+        positions = list(self.index['partitions'])
+        points = np.zeros((len(teams), len(positions)))
+        games = np.zeros(len(teams), dtype=np.int64)
+        if not keys:
+            return {'teams': teams, 'positions': positions, 'points': points, 'games': games}
+
+        week_key, opponent, values = self.column('week_key'), self.column('opponent'), self.column(column)
+        played = []
+        for p, (start, end) in enumerate(self.index['partitions'].values()):
+            segment = week_key[start:end]
+            a = start + int(np.searchsorted(segment, keys[0], side='left'))
+            b = start + int(np.searchsorted(segment, keys[-1], side='right'))
+            defense = np.asarray(opponent[a:b], dtype=np.int64)
+            known = defense >= 0
+            points[:, p] = np.bincount(defense[known], np.asarray(values[a:b], dtype=np.float64)[known], minlength=len(teams))
+            played.append(defense[known] * 1000000 + np.asarray(week_key[a:b])[known])
+        # A defense's games are its distinct weeks with any opponent player on record
+        games = np.bincount(np.unique(np.concatenate(played)) // 1000000, minlength=len(teams))
+        return {'teams': teams, 'positions': positions, 'points': points, 'games': games}
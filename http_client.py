@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+
+from http_store import ACCEPT_ENCODING, request_key
+from metrics import record_upstream
+
+
+class AsyncHttpClient:
+    """
+    Background event loop owning one keep-alive aiohttp session per upstream
+    source. Synchronous callers use run(); coroutines running on another
+    event loop use submit(), so sessions are only ever touched by this loop.
+    aiohttp is imported with the first session, not at construction.
+    With a response_store (http_store.ResponseStore) GETs are conditional
+    and a 304 is answered from the stored copy.
+    """
+
+    def __init__(self, timeout=10, connections_per_source=20, response_store=None):
+        self.timeout = timeout
+        self.response_store = response_store
+        self.connections_per_source = connections_per_source
+        self.sessions = {}
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self.loop.run_forever,
+                    name='http-client-loop',
+                    daemon=True
+                )
+                self._thread.start()
+            return self.loop
+
+    def _session(self, source):
+        session = self.sessions.get(source)
+        if session is None or session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.connections_per_source,
+                keepalive_timeout=60
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Accept-Encoding': ACCEPT_ENCODING}
+            )
+            self.sessions[source] = session
+        return session
+
+    def run(self, coro):
+        """Run a coroutine on the client loop and block for its result"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def submit(self, coro):
+        """Await a coroutine on the client loop from any event loop"""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def get_json(self, source, url, params=None, headers=None, endpoint=None):
+        """GET a JSON document, returning None on any transport or HTTP error"""
+        return await self._request_json(source, 'GET', url, endpoint, params=params, headers=headers)
+
+    async def post_json(self, source, url, payload, headers=None, endpoint=None):
+        """POST a JSON body and return the decoded response, or None on error"""
+        return await self._request_json(source, 'POST', url, endpoint, json=payload, headers=headers)
+
+    async def _request_json(self, source, method, url, endpoint, headers=None, **kwargs):
+        """Send a request and decode its JSON body, recording latency, size and outcome under endpoint"""
+        import aiohttp
+
+        store = self.response_store if method == 'GET' else None
+        key = request_key(url, kwargs.get('params'))
+        headers = dict(headers or {})
+        if store is not None:
+            headers.update(store.conditional_headers(key))
+
+        start = time.perf_counter()
+        size, status = None, 'error'
+        try:
+            async with self._session(source).request(method, url, headers=headers, **kwargs) as response:
+                status = str(response.status)
+                if response.status == 304 and store is not None:
+                    size, status = 0, 'not_modified'
+                    return await asyncio.to_thread(store.not_modified_body, key, source)
+                response.raise_for_status()
+                body = await response.read()
+                size, status = len(body), 'invalid_json'
+                data = json.loads(body)
+                if store is not None:
+                    store.count_compression(source, response.headers, size)
+                    if store.cacheable(response.headers):
+                        await asyncio.to_thread(store.save, key, response.headers, body, data)
+                status = 'ok'
+                return data
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"Error fetching {source} data: {e}")
+            return None
+        finally:
+            record_upstream(source, endpoint or url, time.perf_counter() - start, size, status)
+
+    def close(self):
+        """Close all sessions and stop the background loop"""
+        if self.loop is None:
+            return
+
+        async def _close_sessions():
+            for session in self.sessions.values():
+                await session.close()
+            self.sessions.clear()
+
+        self.run(_close_sessions())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        self.loop = None
+        self._thread = None
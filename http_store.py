@@ -0,0 +1,190 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from config import CACHE_CONFIG
+from metrics import metrics
+
+
+def accept_encoding():
+    """Accept-Encoding we can decode: gzip/deflate always, br when a brotli module is installed"""
+    if importlib.util.find_spec('brotli') or importlib.util.find_spec('brotlicffi'):
+        return 'gzip, deflate, br'
+    return 'gzip, deflate'
+
+
+ACCEPT_ENCODING = accept_encoding()
+
+
+def request_key(url, params=None, mode=None):
+    """
+    Store key for a request. mode names how the body is parsed (e.g. the
+    streaming item parser), so a URL fetched in two shapes keeps two entries.
+    """
+    key = url
+    if params:
+        key += '?' + '&'.join(f"{name}={value}" for name, value in sorted(params.items()))
+    if mode:
+        key += '#' + mode
+    return key
+
+
+class ResponseStore:
+    """
+    On-disk copy of GET responses with their ETag / Last-Modified
+    validators, so refreshes can send conditional requests. Bodies live in
+    one file each under CACHE_DIR/http and validators in a small sqlite
+    index. A bounded in-memory map keeps the parsed form of recent
+    responses, so a 304 hands back the parsed object without re-reading or
+    re-parsing the body. That object is shared by every caller that gets
+    the 304 (which also lets them spot an unchanged payload by identity),
+    so callers must treat it as read-only and copy before modifying.
+    """
+
+    def __init__(self, root=None, max_parsed=None):
+        self.root = Path(root) if root else Path(CACHE_CONFIG['CACHE_DIR']) / 'http'
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.root / 'responses.sqlite3'), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, size INTEGER NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.max_parsed = max_parsed or CACHE_CONFIG['HTTP_STORE_MAX_PARSED']
+        self.parsed = OrderedDict()  # key -> parsed body of the stored response
+
+        self.not_modified = 0
+        self.bytes_saved = 0  # body bytes a 304 didn't have to resend
+        self.compressed_bytes_saved = 0  # decoded minus on-the-wire size of compressed 200s
+
+    def _body_path(self, key):
+        return self.root / (hashlib.sha1(key.encode()).hexdigest() + '.body')
+
+    def _entry(self, key):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT etag, last_modified, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def conditional_headers(self, key):
+        """If-None-Match / If-Modified-Since for a stored response (empty if none)"""
+        entry = self._entry(key)
+        if entry is None or not self._body_path(key).exists():
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def cacheable(self, response_headers):
+        return bool(response_headers.get('ETag') or response_headers.get('Last-Modified'))
+
+    def save(self, key, response_headers, body, parsed=None):
+        """Store a 200 body (bytes) with its validators; parsed is remembered for later 304s"""
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, self._body_path(key))
+        self._index(key, response_headers, len(body), parsed)
+
+    def save_file(self, key, response_headers, tmp_path, parsed=None):
+        """Store a body that was streamed into tmp_path (see temp_path())"""
+        path = self._body_path(key)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        self._index(key, response_headers, size, parsed)
+
+    def temp_path(self, key):
+        return self._body_path(key).with_suffix(f'.{threading.get_ident()}.part')
+
+    def _index(self, key, response_headers, size, parsed):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, size, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, response_headers.get('ETag'), response_headers.get('Last-Modified'), size, time.time())
+            )
+            self.conn.commit()
+            self.parsed.pop(key, None)
+            if parsed is not None:
+                self._remember(key, parsed)
+
+    def _remember(self, key, parsed):
+        self.parsed[key] = parsed
+        self.parsed.move_to_end(key)
+        while len(self.parsed) > self.max_parsed:
+            self.parsed.popitem(last=False)
+
+    def not_modified_body(self, key, source, parse=None):
+        """
+        The stored response for a 304: the remembered parsed form if there
+        is one, else the body from disk run through parse (json.load by
+        default). Returns None if the local copy has gone missing. The result
+        is shared between callers, not a copy.
+        """
+        entry = self._entry(key)
+        size = entry[2] if entry else 0
+        with self.lock:
+            parsed = self.parsed.get(key)
+            if parsed is not None:
+                self.parsed.move_to_end(key)
+        if parsed is None:
+            try:
+                with open(self._body_path(key), 'rb') as f:
+                    parsed = (parse or json.load)(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading stored response: {e}")
+                return None
+            with self.lock:
+                self._remember(key, parsed)
+
+        with self.lock:
+            self.not_modified += 1
+            self.bytes_saved += size
+        metrics.inc('http_not_modified_total', source=source)
+        metrics.inc('http_bytes_saved_total', size, source=source, reason='not_modified')
+        return parsed
+
+    def count_compression(self, source, response_headers, decoded_size):
+        """Record bytes saved by a compressed transfer (on-the-wire size from Content-Length)"""
+        if not response_headers.get('Content-Encoding'):
+            return
+        try:
+            wire_size = int(response_headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            return
+        if wire_size >= decoded_size:
+            return
+        with self.lock:
+            self.compressed_bytes_saved += decoded_size - wire_size
+        metrics.inc('http_bytes_saved_total', decoded_size - wire_size, source=source, reason='compression')
+
+    def stats(self):
+        with self.lock:
+            stored = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {
+                'stored_responses': stored[0],
+                'stored_bytes': stored[1],
+                'parsed_in_memory': len(self.parsed),
+                'not_modified': self.not_modified,
+                'bytes_saved_not_modified': self.bytes_saved,
+                'bytes_saved_compression': self.compressed_bytes_saved
+            }
+
+    def clear(self):
+        with self.lock:
+            keys = [row[0] for row in self.conn.execute("SELECT key FROM responses")]
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+            self.parsed.clear()
+        for key in keys:
+            self._body_path(key).unlink(missing_ok=True)
@@ -0,0 +1,81 @@
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_object_items(chunks, encoding='utf-8'):
+    """
+    Yield (key, value) pairs of a top-level JSON object as its bytes arrive.
+
+    chunks is any iterable of bytes (or str), e.g. requests'
+    response.iter_content(). Only the unparsed tail of the stream and the
+    value being decoded are held in memory, so a large {id: {...}, ...}
+    document is consumed one entry at a time. Raises ValueError on
+    malformed or truncated input.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buffer, pos, eof = '', 0, False
+    state, key = 'start', None  # start -> key -> colon -> value -> separator -> key ...
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if state == 'start':
+                if char != '{':
+                    raise ValueError(f"Expected a JSON object, found {char!r}")
+                pos += 1
+                state = 'first_key'
+                continue
+            if state in ('first_key', 'key'):
+                if char == '}' and state == 'first_key':
+                    return
+                if char != '"':
+                    raise ValueError(f"Expected an object key, found {char!r}")
+                try:
+                    key, pos = decoder.raw_decode(buffer, pos)
+                    state = 'colon'
+                    continue
+                except json.JSONDecodeError:
+                    pass  # key cut off by the chunk boundary
+            elif state == 'colon':
+                if char != ':':
+                    raise ValueError(f"Expected ':', found {char!r}")
+                pos += 1
+                state = 'value'
+                continue
+            elif state == 'value':
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    end = None  # value cut off by the chunk boundary
+                # A value ending exactly at the buffer end may be a number with more digits to come
+                if end is not None and (end < len(buffer) or eof):
+                    pos = end
+                    state = 'separator'
+                    yield key, value
+                    continue
+            elif state == 'separator':
+                if char == '}':
+                    return
+                if char != ',':
+                    raise ValueError(f"Expected ',' or '}}', found {char!r}")
+                pos += 1
+                state = 'key'
+                continue
+
+        # Need more input: drop the consumed prefix and append the next chunk
+        if eof:
+            raise ValueError("Unexpected end of JSON stream")
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            chunk = text.decode(b'', final=True)
+        elif isinstance(chunk, bytes):
+            chunk = text.decode(chunk)
+        buffer, pos = buffer[pos:] + chunk, 0
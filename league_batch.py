@@ -0,0 +1,381 @@
+"""
+Lineups, waiver pickups and trade scans for many leagues in one run.
+
+The global data every league shares (player positions, availability,
+projected points and trade values) is loaded once and written to a single
+multiprocessing.shared_memory block. Worker processes map that block as
+read-only NumPy arrays, so adding workers doesn't add copies of the player
+pool; each task only ships one league's rosters (a few hundred ids).
+
+    python league_batch.py 1048123 1048456 --workers 4
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import BATCH_CONFIG
+from lineup_optimizer import PLAYABLE_STATUSES, POSITION_CODES, POSITIONS, LineupOptimizer, normalize_position
+from scoring import STAT_COLUMNS, player_values
+from trade_engine import TradeEngine
+
+_ALIGNMENT = 8
+
+
+class SharedPlayerPool:
+    """
+    Player columns in one shared memory block, sorted by player id:
+    ids (fixed-width bytes), positions (POSITION_CODES, -1 unknown),
+    playable, points (weekly projection) and values (trade value).
+    handle() is a small picklable description that attach() turns back
+    into zero-copy views in another process.
+    """
+
+    def __init__(self, shm, layout, owner=False):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.columns = {}
+        for name, dtype, shape, offset in layout:
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            array.flags.writeable = False
+            self.columns[name] = array
+            setattr(self, name, array)
+
+    @classmethod
+    def create(cls, player_ids, positions, playable, points, values):
+        ids = np.array([str(player_id).encode() for player_id in player_ids], dtype=np.bytes_)
+        order = np.argsort(ids, kind='stable')
+        arrays = {
+            'ids': ids[order],
+            'positions': np.asarray(positions, dtype=np.int8)[order],
+            'playable': np.asarray(playable, dtype=bool)[order],
+            'points': np.nan_to_num(np.asarray(points, dtype=np.float64))[order],
+            'values': np.nan_to_num(np.asarray(values, dtype=np.float64))[order]
+        }
+
+        layout, size = [], 0
+        for name, array in arrays.items():
+            size = -(-size // _ALIGNMENT) * _ALIGNMENT
+            layout.append((name, array.dtype.str, array.shape, size))
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, dtype, shape, offset in layout:
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)[...] = arrays[name]
+        return cls(shm, layout, owner=True)
+
+    @classmethod
+    def from_data_manager(cls, data_manager, week=None, matchups=True):
+        """
+        The registry's players with the week's projected points, scaled by
+        each player's opponent (DataManager.get_matchup_index) unless
+        matchups is False. Trade values use the unadjusted projections.
+        """
+        players = data_manager.get_registry().players
+        player_ids = list(players)
+        projections = data_manager.get_week_projections(week)
+        if projections is not None:
+            points = projections['points'].reindex(player_ids).fillna(0).to_numpy()
+        else:
+            points = np.zeros(len(player_ids))
+        positions = np.array(
+            [POSITION_CODES.get(normalize_position(record.get('position')), -1) for record in players.values()],
+            dtype=np.intp
+        )
+        values = player_values(np.zeros((len(player_ids), len(STAT_COLUMNS))), points)
+        if matchups:
+            index = data_manager.get_matchup_index(week)
+            points = index.adjust(points, index.team_codes([record.get('team') for record in players.values()]), positions)
+        return cls.create(
+            player_ids,
+            positions,
+            [(record.get('injury_status') or record.get('status')) in PLAYABLE_STATUSES for record in players.values()],
+            points,
+            values
+        )
+
+    def handle(self):
+        return self.shm.name, self.layout
+
+    @classmethod
+    def attach(cls, handle):
+        name, layout = handle
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, layout)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        return self.shm.size
+
+    def rows(self, player_ids):
+        """Row index for each player id, -1 for ids not in the pool"""
+        if not len(player_ids):
+            return np.zeros(0, dtype=np.int64)
+        keys = np.array([str(player_id).encode() for player_id in player_ids], dtype=np.bytes_)
+        rows = np.searchsorted(self.ids, keys).clip(0, max(len(self.ids) - 1, 0))
+        found = (self.ids[rows] == keys) if len(self.ids) else np.zeros(len(keys), dtype=bool)
+        # Ids longer than the pool's width would have been compared truncated
+        found &= np.char.str_len(keys) <= self.ids.dtype.itemsize
+        return np.where(found, rows, -1)
+
+    def close(self):
+        """Release this process's mapping; the owner also frees the block"""
+        self.columns.clear()
+        for name in ('ids', 'positions', 'playable', 'points', 'values'):
+            setattr(self, name, None)
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            self.owner = False
+
+
+class LeagueAnalyzer:
+    """Per-league analysis against a SharedPlayerPool; one instance per worker process"""
+
+    def __init__(self, pool, roster_positions=None, waiver_limit=5, trade_top_k=10, max_trade_players=2):
+        self.pool = pool
+        self.optimizer = LineupOptimizer(roster_positions)
+        self.trade_engine = TradeEngine(roster_positions)
+        self.waiver_limit = waiver_limit
+        self.trade_top_k = trade_top_k
+        self.max_trade_players = max_trade_players
+
+    def analyze(self, rosters):
+        """rosters maps team -> [player ids]; returns lineups, waiver pickups and trades for the league"""
+        teams = list(rosters)
+        rows = [self.pool.rows(rosters[team]) for team in teams]
+        width = max((len(team_rows) for team_rows in rows), default=0)
+        index = np.full((len(teams), width), -1, dtype=np.int64)
+        for i, team_rows in enumerate(rows):
+            index[i, :len(team_rows)] = team_rows
+
+        known = index >= 0
+        safe = np.where(known, index, 0)
+        points = np.where(known, self.pool.points[safe], -np.inf)
+        positions = np.where(known, self.pool.positions[safe], -1)
+        assignment = self.optimizer.assign(points, positions, known & self.pool.playable[safe])
+
+        return {
+            'lineups': self._lineups(teams, rosters, points, assignment),
+            'waivers': self._waivers(teams, rosters, index, points, positions, assignment),
+            'trades': self._trades(rosters, index)
+        }
+
+    def _lineups(self, teams, rosters, points, assignment):
+        lineups = {}
+        for row, team in enumerate(teams):
+            filled = assignment[row] >= 0
+            lineups[team] = {
+                'starters': [
+                    (slot, rosters[team][column])
+                    for slot, column in zip(self.optimizer.slots, assignment[row]) if column >= 0
+                ],
+                'empty_slots': [slot for slot, ok in zip(self.optimizer.slots, filled) if not ok],
+                'projected_points': round(float(points[row, assignment[row][filled]].sum()), 2)
+            }
+        return lineups
+
+    def _waivers(self, teams, rosters, index, points, positions, assignment):
+        """
+        Best free agent (playable, on no roster in this league) per position
+        where they would beat a team's weakest starter there, or fill an
+        empty slot.
+        """
+        pool = self.pool
+        free = pool.playable.copy()
+        free[index[index >= 0]] = False
+        best = {}
+        for code in range(len(POSITIONS)):
+            candidates = np.flatnonzero(free & (pool.positions == code))
+            if len(candidates):
+                best[code] = candidates[np.argmax(pool.points[candidates])]
+
+        waivers = {}
+        for row, team in enumerate(teams):
+            started = assignment[row][assignment[row] >= 0]
+            weakest = {}
+            for column in started:
+                code = int(positions[row, column])
+                if code not in weakest or points[row, column] < points[row, weakest[code]]:
+                    weakest[code] = column
+            for slot, column in zip(self.optimizer.slots, assignment[row]):
+                if column < 0 and slot in POSITION_CODES:
+                    weakest.setdefault(POSITION_CODES[slot], None)
+
+            moves = []
+            for code, column in weakest.items():
+                if code not in best:
+                    continue
+                gain = float(pool.points[best[code]]) - (points[row, column] if column is not None else 0.0)
+                if gain > 0:
+                    moves.append({
+                        'add': pool.ids[best[code]].decode(),
+                        'drop': rosters[team][column] if column is not None else None,
+                        'position': POSITIONS[code],
+                        'gain': round(gain, 2)
+                    })
+            moves.sort(key=lambda move: move['gain'], reverse=True)
+            waivers[team] = moves[:self.waiver_limit]
+        return waivers
+
+    def _trades(self, rosters, index):
+        values, positions = {}, {}
+        for team_rows, player_ids in zip(index, rosters.values()):
+            for row, player_id in zip(team_rows, player_ids):
+                if row >= 0:
+                    values[player_id] = float(self.pool.values[row])
+                    code = int(self.pool.positions[row])
+                    positions[player_id] = POSITIONS[code] if code >= 0 else None
+        self.trade_engine.refresh(rosters, values, positions)
+        return self.trade_engine.league_trades(self.trade_top_k, self.max_trade_players)
+
+
+# Worker process state: the attached pool and an analyzer bound to it
+_analyzer = None
+
+
+def _init_worker(handle, roster_positions, options):
+    global _analyzer
+    _analyzer = LeagueAnalyzer(SharedPlayerPool.attach(handle), roster_positions, **options)
+
+
+def _analyze_league(job):
+    league_id, rosters = job
+    return league_id, _analyzer.analyze(rosters)
+
+
+class LeagueBatchRunner:
+    """
+    Runs LeagueAnalyzer over many leagues on a process pool. The player
+    pool is built once per week (load()) and shared with every worker;
+    rosters for all leagues are fetched concurrently before the analysis.
+    """
+
+    def __init__(self, data_manager=None, workers=None, roster_positions=None, **options):
+        if data_manager is None:
+            from data_manager import DataManager
+            data_manager = DataManager()
+        self.data_manager = data_manager
+        self.workers = workers or BATCH_CONFIG['WORKERS'] or os.cpu_count() or 1
+        self.roster_positions = roster_positions
+        self.options = options
+        self.pool = None
+        self.executor = None
+
+    def load(self, week=None):
+        """(Re)build the shared player pool; workers are restarted to map the new block"""
+        self._shutdown()
+        self.pool = SharedPlayerPool.from_data_manager(self.data_manager, week)
+        return self.pool
+
+    def _executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.pool.handle(), self.roster_positions, self.options)
+            )
+        return self.executor
+
+    def analyze(self, league_rosters):
+        """Analyze {league_id: rosters} on the worker pool; returns {league_id: result}"""
+        if self.pool is None:
+            self.load()
+        jobs = [(league_id, rosters) for league_id, rosters in league_rosters.items() if rosters]
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        return dict(self._executor().map(_analyze_league, jobs, chunksize=chunksize))
+
+    def run(self, league_ids, week=None):
+        """
+        Fetch rosters and analyze every league. Returns {'leagues': {id:
+        result}, 'failed': [ids without rosters], 'stats': {...}} where
+        stats includes leagues_per_second for the analysis phase.
+        """
+        start = time.perf_counter()
+        if self.pool is None:
+            self.load(week)
+        loaded = time.perf_counter()
+        league_rosters = self.data_manager.get_league_rosters_many(league_ids)
+        fetched = time.perf_counter()
+        results = self.analyze(league_rosters)
+        done = time.perf_counter()
+
+        return {
+            'leagues': results,
+            'failed': [league_id for league_id, rosters in league_rosters.items() if not rosters],
+            'stats': {
+                'leagues': len(results),
+                'workers': self.workers,
+                'players': len(self.pool),
+                'shared_bytes': self.pool.nbytes,
+                'load_seconds': round(loaded - start, 3),
+                'fetch_seconds': round(fetched - loaded, 3),
+                'analysis_seconds': round(done - fetched, 3),
+                'leagues_per_second': round(len(results) / (done - fetched), 2) if done > fetched else None
+            }
+        }
+
+    def _shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def close(self):
+        self._shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lineups, waivers and trade scans for many Sleeper leagues")
+    parser.add_argument('league_ids', nargs='*', help="default: SLEEPER_LEAGUE_IDS / SLEEPER_LEAGUE_ID")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--week', type=int)
+    parser.add_argument('--json', action='store_true', help="print the full results as JSON")
+    args = parser.parse_args()
+
+    league_ids = args.league_ids or BATCH_CONFIG['LEAGUE_IDS']
+    if not league_ids:
+        parser.error("no league ids given and SLEEPER_LEAGUE_IDS is not set")
+
+    with LeagueBatchRunner(workers=args.workers) as runner:
+        try:
+            report = runner.run(league_ids, args.week)
+        finally:
+            runner.data_manager.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for league_id, result in report['leagues'].items():
+        best = max(result['lineups'].values(), key=lambda lineup: lineup['projected_points'], default=None)
+        print(f"League {league_id}: {len(result['lineups'])} teams, "
+              f"top lineup {best['projected_points'] if best else 0} pts, "
+              f"{sum(len(moves) for moves in result['waivers'].values())} waiver moves, "
+              f"{len(result['trades'])} trades")
+    for league_id in report['failed']:
+        print(f"League {league_id}: rosters unavailable")
+    stats = report['stats']
+    print(f"\n{stats['leagues']} leagues in {stats['analysis_seconds']}s on {stats['workers']} worker(s): "
+          f"{stats['leagues_per_second']} leagues/s ({stats['shared_bytes'] / 1024:.0f} KB shared)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from config import DEFAULT_LEAGUE_SETTINGS
+
+POSITIONS = ['QB', 'RB', 'WR', 'TE', 'D/ST', 'K']
+POSITION_CODES = {position: code for code, position in enumerate(POSITIONS)}
+POSITION_ALIASES = {'DST': 'D/ST', 'DEF': 'D/ST', 'D': 'D/ST', 'PK': 'K'}
+
+# Flex slot -> eligible positions. Slots with fewer eligible positions are
+# filled first; for nested eligibility sets this keeps the greedy fill optimal.
+FLEX_ELIGIBILITY = {
+    'REC_FLEX': ('WR', 'TE'),
+    'FLEX': ('RB', 'WR', 'TE'),
+    'SUPER_FLEX': ('QB', 'RB', 'WR', 'TE')
+}
+NON_STARTING_SLOTS = ('BE', 'IR')
+
+# Statuses that can be started; anything else (Questionable, Out, IR, ...) is benched
+PLAYABLE_STATUSES = {None, '', 'Active', 'Healthy'}
+
+
+def normalize_position(position):
+    position = (position or '').upper()
+    return POSITION_ALIASES.get(position, position)
+
+
+class LineupOptimizer:
+    """
+    Fills starting slots to maximize projected points. Works on
+    (teams x roster) arrays so a whole league is solved in one batch.
+    """
+
+    def __init__(self, roster_positions=None, playable_statuses=PLAYABLE_STATUSES):
+        roster_positions = roster_positions or DEFAULT_LEAGUE_SETTINGS['roster_positions']
+        self.playable_statuses = set(playable_statuses)
+        self.slots = []
+        for slot, count in roster_positions.items():
+            slot = normalize_position(slot)
+            if slot not in NON_STARTING_SLOTS:
+                self.slots.extend([slot] * count)
+
+        # Fill order: dedicated positions, then flex slots from narrowest to widest
+        dedicated = [slot for slot in dict.fromkeys(self.slots) if slot in POSITION_CODES]
+        flex = sorted(
+            (slot for slot in dict.fromkeys(self.slots) if slot in FLEX_ELIGIBILITY),
+            key=lambda slot: len(FLEX_ELIGIBILITY[slot])
+        )
+        self.fill_order = [
+            (
+                [i for i, s in enumerate(self.slots) if s == slot],
+                [POSITION_CODES[p] for p in FLEX_ELIGIBILITY.get(slot, (slot,))]
+            )
+            for slot in dedicated + flex
+        ]
+
+    def assign(self, points, positions, available):
+        """
+        Core batch solver. points/positions/available are (teams x roster)
+        arrays (position codes from POSITION_CODES, -1 for empty roster spots).
+        Returns a (teams x slots) array of roster indexes, -1 where a slot
+        could not be filled.
+        """
+        points = np.asarray(points, dtype=np.float64)
+        positions = np.asarray(positions)
+        remaining = np.asarray(available, dtype=bool) & np.isfinite(points) & (positions >= 0)
+        assignment = np.full((points.shape[0], len(self.slots)), -1, dtype=np.int64)
+
+        for slot_columns, codes in self.fill_order:
+            eligible = remaining & np.isin(positions, codes)
+            candidates = np.where(eligible, points, -np.inf)
+            order = np.argsort(-candidates, axis=1, kind='stable')[:, :len(slot_columns)]
+            filled = np.isfinite(np.take_along_axis(candidates, order, axis=1))
+            assignment[:, slot_columns[:order.shape[1]]] = np.where(filled, order, -1)
+            np.put_along_axis(remaining, order, ~filled & np.take_along_axis(remaining, order, axis=1), axis=1)
+
+        return assignment
+
+    def optimize_league(self, rosters, points_key='projected_points'):
+        """
+        Solve every roster at once. rosters maps team -> list of player
+        dicts ('name', 'position', 'status', points_key). Returns team ->
+        {'starters': [(slot, player)], 'bench': [player], 'projected_points'}.
+        """
+        teams = list(rosters)
+        width = max((len(players) for players in rosters.values()), default=0)
+        points = np.full((len(teams), width), -np.inf)
+        positions = np.full((len(teams), width), -1, dtype=np.int64)
+        available = np.zeros((len(teams), width), dtype=bool)
+
+        for row, team in enumerate(teams):
+            for col, player in enumerate(rosters[team]):
+                points[row, col] = player.get(points_key) or 0.0
+                positions[row, col] = POSITION_CODES.get(normalize_position(player.get('position')), -1)
+                available[row, col] = player.get('status') in self.playable_statuses
+
+        assignment = self.assign(points, positions, available)
+
+        results = {}
+        for row, team in enumerate(teams):
+            players = rosters[team]
+            starters = [
+                (slot, players[index])
+                for slot, index in zip(self.slots, assignment[row])
+                if index >= 0
+            ]
+            started = set(int(index) for index in assignment[row] if index >= 0)
+            # Bench order: playable players by projection, then unavailable ones
+            bench = sorted(
+                (players[i] for i in range(len(players)) if i not in started),
+                key=lambda p: (p.get('status') in self.playable_statuses, p.get(points_key) or 0.0),
+                reverse=True
+            )
+            results[team] = {
+                'starters': starters,
+                'bench': bench,
+                'empty_slots': [slot for slot, index in zip(self.slots, assignment[row]) if index < 0],
+                'projected_points': round(sum(p.get(points_key) or 0.0 for _, p in starters), 2)
+            }
+        return results
+
+    def optimize(self, players, points_key='projected_points'):
+        """Solve a single roster; players is a list of dicts or {name: player dict}"""
+        if isinstance(players, Mapping):
+            players = [{'name': name, **data} for name, data in players.items()]
+        return self.optimize_league({None: players}, points_key)[None]
@@ -0,0 +1,582 @@
+"""
+Live game-day scoring.
+
+Stat deltas (a polled feed or a replay file) are applied to per-player
+stat accumulators; scoring is linear, so each delta's points are added to
+the player, then to every fantasy team starting that player and to the
+matchups those teams play in. Nothing else is rescored. Projected finals
+are live points plus the pregame projection scaled by how much of the
+player's NFL game is left, computed only for the updates that go out.
+
+Events are dicts, one per stat change or game clock update:
+
+    {'player_id': '4046', 'stats': {'passing_yards': 12, 'passing_touchdowns': 1}}
+    {'team': 'KC', 'progress': 0.5}   # fraction of KC's game played
+
+Updates go out to LiveScoreboard.subscribe() iterators, at most one per
+league (every changed matchup in it) and one per player for each batch:
+
+    async for update in scoreboard.subscribe(leagues=['1048123']):
+        ...
+"""
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from metrics import metrics
+from scoring import STAT_COLUMNS, ScoringEngine
+
+STAT_INDEX = {stat: i for i, stat in enumerate(STAT_COLUMNS)}
+
+# Sleeper's stat keys -> STAT_COLUMNS (several keys can feed one column)
+SLEEPER_STAT_FIELDS = {
+    'pass_yd': 'passing_yards',
+    'pass_td': 'passing_touchdowns',
+    'pass_int': 'interceptions',
+    'rush_yd': 'rushing_yards',
+    'rush_td': 'rushing_touchdowns',
+    'rec': 'receptions',
+    'rec_yd': 'receiving_yards',
+    'rec_td': 'receiving_touchdowns',
+    'fum_lost': 'fumbles_lost',
+    'pass_2pt': 'two_point_conversions',
+    'rush_2pt': 'two_point_conversions',
+    'rec_2pt': 'two_point_conversions'
+}
+
+DEFAULT_MAX_PENDING = 256
+
+
+def stat_vector(stats):
+    """A stats dict (STAT_COLUMNS or Sleeper keys) as a STAT_COLUMNS vector"""
+    vector = np.zeros(len(STAT_COLUMNS))
+    for stat, value in stats.items():
+        column = STAT_INDEX.get(SLEEPER_STAT_FIELDS.get(stat, stat))
+        if column is not None and isinstance(value, (int, float)):
+            vector[column] += value
+    return vector
+
+
+class LiveScorer:
+    """
+    Incremental scores for every player, fantasy team and matchup on a
+    slate. Players, teams and matchups are rows in flat arrays; a CSR map
+    from player row to the teams starting that player lets one delta
+    batch update every affected team with a few vectorized operations.
+    Game clock updates only change projected finals, which are computed
+    when a matchup or player update is built, so a tick costs a lookup of
+    the matchups with a starter in that NFL game.
+    """
+
+    def __init__(self, profiles=None):
+        self.engine = ScoringEngine(profiles)
+        self.profile_names = list(self.engine.profile_names)
+
+        # Players
+        self.player_ids = []
+        self.player_rows = {}
+        self.nfl_team_codes = {None: 0}
+        self.player_team = np.zeros(0, dtype=np.int64)
+        self.stats = np.zeros((0, len(STAT_COLUMNS)))
+        self.points = np.zeros((0, len(self.profile_names)))
+        self.projected = np.zeros(0)
+        self.progress = np.zeros(1)  # per NFL team code; code 0 is "no team"
+
+        # Fantasy teams and matchups
+        self.teams = []  # (league_id, team)
+        self.team_profile = []
+        self.team_matchup = []
+        self.team_starters = []  # player rows per team
+        self.matchups = []  # (league_id, matchup_id, [team indexes])
+        self.league_matchups = {}  # league_id -> [matchup indexes]
+        self.league_codes = {}  # league_id -> code, for vectorized filters
+        self.matchup_league = []  # league code per matchup
+        self.team_points = np.zeros(0)
+        self._index = None  # CSR maps, built on first apply (see _build_index)
+
+    # Setup
+
+    def add_players(self, player_ids, nfl_teams=None, projected=None):
+        """Register players with their NFL team and pregame projected points"""
+        rows = self._rows(player_ids)
+        for row, team in zip(rows, nfl_teams or []):
+            self.player_team[row] = self._team_code(team)
+        if projected is not None:
+            self.projected[rows] = np.nan_to_num(np.asarray(projected, dtype=np.float64))
+        self._index = None
+        return rows
+
+    def add_league(self, league_id, matchups, profile='ppr'):
+        """
+        Add a league's matchups, {matchup_id: {team: [starter player ids]}},
+        scored with one of the engine's profiles.
+        """
+        profile_column = self.profile_names.index(profile)
+        league_id = str(league_id)
+        for matchup_id, lineups in matchups.items():
+            matchup = len(self.matchups)
+            team_indexes = []
+            for team, starters in lineups.items():
+                team_indexes.append(len(self.teams))
+                self.teams.append((league_id, team))
+                self.team_profile.append(profile_column)
+                self.team_matchup.append(matchup)
+                self.team_starters.append(self._rows(starters))
+            self.matchups.append((league_id, str(matchup_id), team_indexes))
+            self.league_matchups.setdefault(league_id, []).append(matchup)
+            self.matchup_league.append(self.league_codes.setdefault(league_id, len(self.league_codes)))
+        self._index = None
+
+    def _team_code(self, team):
+        code = self.nfl_team_codes.get(team)
+        if code is None:
+            code = self.nfl_team_codes[team] = len(self.nfl_team_codes)
+            self.progress = np.append(self.progress, 0.0)
+        return code
+
+    def _rows(self, player_ids):
+        """Rows for player ids, adding unknown players"""
+        rows = []
+        for player_id in player_ids:
+            player_id = str(player_id)
+            row = self.player_rows.get(player_id)
+            if row is None:
+                row = self.player_rows[player_id] = len(self.player_ids)
+                self.player_ids.append(player_id)
+            rows.append(row)
+        added = len(self.player_ids) - len(self.projected)
+        if added:
+            self.player_team = np.concatenate([self.player_team, np.zeros(added, dtype=np.int64)])
+            self.stats = np.vstack([self.stats, np.zeros((added, len(STAT_COLUMNS)))])
+            self.points = np.vstack([self.points, np.zeros((added, len(self.profile_names)))])
+            self.projected = np.concatenate([self.projected, np.zeros(added)])
+            self._index = None
+        return np.array(rows, dtype=np.int64)
+
+    def _build_index(self):
+        """
+        CSR maps from player row to the teams starting the player (and
+        back), from matchup to its teams, and from NFL team code to its
+        players and to the matchups with one of its players starting; plus
+        the team totals.
+        """
+        counts = np.array([len(starters) for starters in self.team_starters], dtype=np.int64)
+        members = np.concatenate(self.team_starters) if self.team_starters else np.zeros(0, dtype=np.int64)
+        owners = np.repeat(np.arange(len(self.team_starters)), counts)
+        self.team_profile_array = np.array(self.team_profile, dtype=np.int64)
+        self.team_matchup_array = np.array(self.team_matchup, dtype=np.int64)
+        self.matchup_league_array = np.array(self.matchup_league, dtype=np.int64)
+
+        self.team_points = np.bincount(
+            owners, self.points[members, self.team_profile_array[owners]], minlength=len(self.teams)
+        )
+        nfl_teams = len(self.nfl_team_codes)
+        self._index = {
+            'player_teams': _csr(members, owners, len(self.player_ids)),
+            'team_players': _csr(owners, members, len(self.teams)),
+            'matchup_teams': _csr(self.team_matchup_array, np.arange(len(self.teams)), len(self.matchups)),
+            'nfl_players': _csr(self.player_team, np.arange(len(self.player_ids)), nfl_teams),
+            'nfl_matchups': _csr(*_distinct_pairs(
+                self.player_team[members], self.team_matchup_array[owners], len(self.matchups)
+            ), nfl_teams)
+        }
+
+    # Live updates
+
+    def apply(self, events):
+        """
+        Apply a batch of events. Returns (player rows, matchup indexes) whose
+        points or projected finals changed.
+        """
+        if self._index is None:
+            self._build_index()
+
+        stat_rows, deltas, clock_teams = [], [], []
+        for event in events:
+            if 'player_id' in event:
+                row = self.player_rows.get(str(event['player_id']))
+                if row is not None:
+                    stat_rows.append(row)
+                    deltas.append(stat_vector(event.get('stats') or {}))
+            elif 'team' in event and 'progress' in event:
+                code = self.nfl_team_codes.get(event['team'])
+                if code:
+                    self.progress[code] = min(max(float(event['progress']), 0.0), 1.0)
+                    clock_teams.append(code)
+
+        rows, matchups = [], []
+        if stat_rows:
+            stat_rows, deltas = np.array(stat_rows, dtype=np.int64), np.array(deltas)
+            point_changes = deltas @ self.engine.weights
+            np.add.at(self.stats, stat_rows, deltas)
+            np.add.at(self.points, stat_rows, point_changes)
+
+            # Spread each delta's points to every team starting the player
+            holders, teams = _gather(*self._index['player_teams'], stat_rows)
+            self.team_points += np.bincount(
+                teams, point_changes[holders, self.team_profile_array[teams]], minlength=len(self.teams)
+            )
+            rows.append(stat_rows)
+            matchups.append(self.team_matchup_array[teams])
+        if clock_teams:
+            clock_teams = np.array(clock_teams, dtype=np.int64)
+            rows.append(_gather(*self._index['nfl_players'], clock_teams)[1])
+            matchups.append(_gather(*self._index['nfl_matchups'], clock_teams)[1])
+
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        return (
+            _distinct(np.concatenate(rows), len(self.player_ids)),
+            _distinct(np.concatenate(matchups), len(self.matchups))
+        )
+
+    def totals_events(self, totals):
+        """
+        Events that bring the accumulators up to a feed of cumulative stats,
+        {player_id: stats} (e.g. DataManager.get_live_stats_async()); only
+        players whose totals moved produce an event.
+        """
+        events = []
+        for player_id, stats in (totals or {}).items():
+            row = self.player_rows.get(str(player_id))
+            if row is None or not isinstance(stats, dict):
+                continue
+            delta = stat_vector(stats) - self.stats[row]
+            if delta.any():
+                events.append({
+                    'player_id': str(player_id),
+                    'stats': {STAT_COLUMNS[i]: float(delta[i]) for i in np.flatnonzero(delta)}
+                })
+        return events
+
+    # Views
+
+    def remaining_projection(self, rows):
+        """Projected points still to come for player rows, from their NFL game's progress"""
+        return (1.0 - self.progress[self.player_team[rows]]) * self.projected[rows]
+
+    def player_update(self, row):
+        remaining = float(self.remaining_projection(row))
+        return {
+            'type': 'player',
+            'player_id': self.player_ids[row],
+            'stats': {stat: float(value) for stat, value in zip(STAT_COLUMNS, self.stats[row]) if value},
+            'points': {name: round(float(value), 2) for name, value in zip(self.profile_names, self.points[row])},
+            'projected_final': {
+                name: round(float(value) + remaining, 2) for name, value in zip(self.profile_names, self.points[row])
+            }
+        }
+
+    def league_updates(self, matchups):
+        """
+        {league_id: update} with the current points and projected finals of
+        each given matchup, grouped by league. Built in one vectorized pass.
+        """
+        if self._index is None:
+            self._build_index()
+        teams = _gather(*self._index['matchup_teams'], np.asarray(matchups, dtype=np.int64))[1]
+        holders, starters = _gather(*self._index['team_players'], teams)
+        points = self.team_points[teams]
+        finals = points + np.bincount(holders, self.remaining_projection(starters), minlength=len(teams))
+
+        updates = {}
+        for team, team_points, final in zip(teams.tolist(), np.round(points, 2).tolist(), np.round(finals, 2).tolist()):
+            league_id, name = self.teams[team]
+            update = updates.get(league_id)
+            if update is None:
+                update = updates[league_id] = {'type': 'league', 'league_id': league_id, 'matchups': {}}
+            matchup_id = self.matchups[self.team_matchup[team]][1]
+            update['matchups'].setdefault(matchup_id, {})[name] = {'points': team_points, 'projected_final': final}
+        return updates
+
+    def scoreboard(self, league_id):
+        """Current league update (every matchup) for one league, or None for an unknown league"""
+        league_id = str(league_id)
+        return self.league_updates(self.league_matchups.get(league_id, [])).get(league_id)
+
+
+def _csr(keys, values, size):
+    """(pointers, values sorted by key) so values for key k are values[pointers[k]:pointers[k + 1]]"""
+    order = np.argsort(keys, kind='stable')
+    pointers = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=pointers[1:])
+    return pointers, np.asarray(values)[order]
+
+
+def _distinct_pairs(keys, values, value_count):
+    """Unique (key, value) pairs"""
+    pairs = np.unique(keys * value_count + values)
+    return pairs // value_count, pairs % value_count
+
+
+def _distinct(indexes, size):
+    """Sorted unique indexes below size (a mask is cheaper than np.unique for large batches)"""
+    mask = np.zeros(size, dtype=bool)
+    mask[indexes] = True
+    return np.flatnonzero(mask)
+
+
+def _gather(pointers, values, rows):
+    """Concatenate values[pointers[r]:pointers[r + 1]] for each r; also returns each item's position in rows"""
+    starts, counts = pointers[rows], pointers[rows + 1] - pointers[rows]
+    holders = np.repeat(np.arange(len(rows)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return holders, values[np.repeat(starts, counts) + offsets]
+
+
+class Subscription:
+    """
+    Async iterator of updates for one subscriber. Each subscriber has a
+    bounded queue; when a slow consumer falls max_pending behind, its
+    oldest updates are dropped (every update carries absolute scores, so a
+    later one supersedes it) and the publisher never waits.
+    """
+
+    def __init__(self, scoreboard, leagues=None, players=None, max_pending=DEFAULT_MAX_PENDING):
+        self.scoreboard = scoreboard
+        self.leagues = set(map(str, leagues)) if leagues is not None else None
+        self.players = set(map(str, players)) if players is not None else None
+        self.queue = asyncio.Queue(max_pending)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, update):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._put(update)
+        else:
+            self.loop.call_soon_threadsafe(self._put, update)
+
+    def _put(self, update):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(update)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        update = await self.queue.get()
+        if update is None:
+            raise StopAsyncIteration
+        return update
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.scoreboard._unsubscribe(self)
+            self._put(None)
+
+
+class LiveScoreboard:
+    """
+    Runs a LiveScorer over a feed of event batches and publishes the
+    changed players and matchups to subscribers.
+    """
+
+    def __init__(self, scorer):
+        self.scorer = scorer
+        self.subscriptions = set()
+        self.everything = set()  # subscribers to every update
+        self.by_league = {}  # league_id -> subscribers
+        self.by_player = {}  # player_id -> subscribers
+        self.batches = 0
+        self.events = 0
+
+    def subscribe(self, leagues=None, players=None, snapshot=True, max_pending=DEFAULT_MAX_PENDING):
+        """
+        Subscribe to league updates for leagues and/or player updates for
+        players (both None: everything). Call from the event loop; the
+        current scoreboard of each league is queued first when snapshot is
+        set. Iterate the returned Subscription and close() it when done.
+        """
+        subscription = Subscription(self, leagues, players, max_pending)
+        self.subscriptions.add(subscription)
+        if leagues is None and players is None:
+            self.everything.add(subscription)
+        for league_id in subscription.leagues or ():
+            self.by_league.setdefault(league_id, set()).add(subscription)
+        for player_id in subscription.players or ():
+            self.by_player.setdefault(player_id, set()).add(subscription)
+        if snapshot and subscription.leagues:
+            for league_id, update in self.scorer.league_updates(
+                [m for league_id in subscription.leagues for m in self.scorer.league_matchups.get(league_id, [])]
+            ).items():
+                subscription.put(update)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+        self.everything.discard(subscription)
+        for index, keys in ((self.by_league, subscription.leagues), (self.by_player, subscription.players)):
+            for key in keys or ():
+                index[key].discard(subscription)
+                if not index[key]:
+                    del index[key]
+
+    def apply(self, events):
+        """Apply one batch of events and publish what changed; returns the number of updates sent"""
+        start = time.perf_counter()
+        rows, matchups = self.scorer.apply(events)
+        sent = self.publish(rows, matchups) if self.subscriptions else 0
+        self.batches += 1
+        self.events += len(events)
+        metrics.observe('live_batch_seconds', time.perf_counter() - start)
+        metrics.inc('live_events_total', len(events))
+        return sent
+
+    def publish(self, rows, matchups):
+        """Queue player and league updates for the subscribers following them; each update is built once"""
+        scorer, sent = self.scorer, 0
+        if self.everything or self.by_player:
+            for row in rows:
+                subscribers = self.by_player.get(scorer.player_ids[row], ())
+                if subscribers or self.everything:
+                    update = scorer.player_update(row)
+                    for subscription in (*subscribers, *self.everything):
+                        subscription.put(update)
+                        sent += 1
+
+        if self.by_league and not self.everything:
+            followed = [scorer.league_codes[league_id] for league_id in self.by_league if league_id in scorer.league_codes]
+            matchups = matchups[np.isin(scorer.matchup_league_array[matchups], followed)]
+        if len(matchups) and (self.everything or self.by_league):
+            for league_id, update in scorer.league_updates(matchups).items():
+                for subscription in (*self.by_league.get(league_id, ()), *self.everything):
+                    subscription.put(update)
+                    sent += 1
+        return sent
+
+    async def run(self, feed):
+        """Consume an async iterable of event batches (replay(), poll_totals()) until it ends"""
+        async for events in feed:
+            if events:
+                self.apply(events)
+
+    def close(self):
+        for subscription in list(self.subscriptions):
+            subscription.close()
+
+
+# Feeds
+
+async def replay(path, speed=1.0, batch_seconds=1.0):
+    """
+    Event batches from a JSON-lines replay file. Each line is an event with
+    't', seconds since the start of the slate; events within batch_seconds
+    are delivered together, paced at speed x real time (0 = no waiting).
+    """
+    batch, batch_start, started = [], None, time.monotonic()
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            at = float(event.pop('t', 0.0))
+            if batch and at - batch_start >= batch_seconds:
+                yield batch
+                batch = []
+            if not batch:
+                batch_start = at
+                if speed:
+                    await asyncio.sleep(max(0.0, at / speed - (time.monotonic() - started)))
+            batch.append(event)
+    if batch:
+        yield batch
+
+
+async def poll_totals(scorer, fetch, interval=10.0):
+    """
+    Event batches from polling a cumulative stats feed. fetch is a coroutine
+    function returning {player_id: stats}; an unchanged payload (e.g. the
+    same object back from a 304) is skipped without diffing.
+    """
+    previous = None
+    while True:
+        totals = await fetch()
+        if totals is not None and totals is not previous:
+            previous = totals
+            yield scorer.totals_events(totals)
+        await asyncio.sleep(interval)
+
+
+def scorer_from_data_manager(data_manager, league_ids, week=None, profile='ppr'):
+    """LiveScorer for the week's matchups in several Sleeper leagues, with projections as the pregame baseline"""
+    scorer = LiveScorer()
+    registry = data_manager.get_registry()
+    projections = data_manager.get_week_projections(week)
+    player_ids = list(registry.players)
+    scorer.add_players(
+        player_ids,
+        [registry.players[player_id].get('team') for player_id in player_ids],
+        projections['points'].reindex(player_ids).fillna(0).to_numpy() if projections is not None else None
+    )
+    for league_id, matchups in data_manager.get_league_matchups_many(league_ids, week).items():
+        if matchups:
+            scorer.add_league(league_id, matchups, profile)
+    return scorer
+
+
+async def _watch(scoreboard, feed, league_ids):
+    subscription = scoreboard.subscribe(leagues=league_ids)
+
+    async def show():
+        async for update in subscription:
+            for matchup_id, teams in update['matchups'].items():
+                line = '  vs  '.join(
+                    f"{team} {score['points']} ({score['projected_final']} proj)" for team, score in teams.items()
+                )
+                print(f"[{update['league_id']} #{matchup_id}] {line}")
+
+    printer = asyncio.create_task(show())
+    try:
+        await scoreboard.run(feed)
+    finally:
+        scoreboard.close()
+        await printer
+
+
+def main():
+    import argparse
+
+    from config import BATCH_CONFIG
+    from data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Live matchup scores for Sleeper leagues")
+    parser.add_argument('league_ids', nargs='*', help="default: SLEEPER_LEAGUE_IDS / SLEEPER_LEAGUE_ID")
+    parser.add_argument('--week', type=int)
+    parser.add_argument('--replay', help="JSON-lines event file to replay instead of polling Sleeper")
+    parser.add_argument('--speed', type=float, default=1.0, help="replay speed (0 = as fast as possible)")
+    parser.add_argument('--interval', type=float, default=10.0, help="seconds between live stat polls")
+    args = parser.parse_args()
+
+    league_ids = args.league_ids or BATCH_CONFIG['LEAGUE_IDS']
+    if not league_ids:
+        parser.error("no league ids given and SLEEPER_LEAGUE_IDS is not set")
+
+    data_manager = DataManager()
+    try:
+        scorer = scorer_from_data_manager(data_manager, league_ids, args.week)
+        if args.replay:
+            feed = replay(args.replay, args.speed)
+        else:
+            feed = poll_totals(scorer, lambda: data_manager.get_live_stats_async(args.week), args.interval)
+        asyncio.run(_watch(LiveScoreboard(scorer), feed, league_ids))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        data_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,23 @@ import json
 from datetime import datetime
 from pathlib import Path
 import os
+import sys
+
+from compact_players import PlayerTable
+from lineup_optimizer import LineupOptimizer
+from metrics import metrics
+from query_parser import QueryParser
 
 class FantasyFootballAssistant:
     def __init__(self):
         self.data_path = Path(__file__).parent / 'data'
         self.data_path.mkdir(exist_ok=True)
+        self.lineup_optimizer = LineupOptimizer()
         self.load_data()
 
     def load_data(self):
-        """Load sample player data and stats"""
-        self.players = {
+        """Load sample player data and stats into the compact player table"""
+        self.players = PlayerTable.from_dicts({
             "Patrick Mahomes": {
                 "position": "QB",
                 "team": "KC",
@@ -33,7 +40,11 @@ class FantasyFootballAssistant:
                 "projected_points": 22.1,
                 "status": "Questionable"
             }
-        }
+        })
+        self.query_parser = QueryParser()
+        for name in self.players:
+            self.query_parser.add_player(name)
+        self.query_parser.build()
 
     def get_player_stats(self, player_name):
         """Get stats for a specific player"""
@@ -48,26 +59,43 @@ class FantasyFootballAssistant:
         return f"Player {player_name} not found."
 
     def get_lineup_recommendation(self):
-        """Provide lineup recommendations based on projected points"""
-        recommendations = []
-        for name, data in self.players.items():
-            if data['status'] == "Active" and data['projected_points'] > 15:
-                recommendations.append(f"{name} ({data['position']}) - Projected: {data['projected_points']}")
-        return "\n".join(recommendations) if recommendations else "No recommendations available."
+        """Provide the lineup that maximizes projected points for the roster slots"""
+        lineup = self.lineup_optimizer.optimize(self.players)
+        if not lineup['starters']:
+            return "No recommendations available."
+
+        recommendations = [
+            f"{slot}: {player['name']} ({player['position']}) - Projected: {player['projected_points']}"
+            for slot, player in lineup['starters']
+        ]
+        if lineup['empty_slots']:
+            recommendations.append(f"Open slots: {', '.join(lineup['empty_slots'])}")
+        if lineup['bench']:
+            recommendations.append("Bench: " + ", ".join(
+                f"{player['name']} ({player['status']})" if player['status'] != "Active" else player['name']
+                for player in lineup['bench']
+            ))
+        recommendations.append(f"Total Projected: {lineup['projected_points']}")
+        return "\n".join(recommendations)
 
     def process_query(self, query):
         """Process user queries and provide responses"""
-        query = query.lower()
-        
-        if "stats" in query and "for" in query:
-            # Extract player name after "for"
-            player_name = query.split("for")[-1].strip().title()
+        with metrics.timer('query_parse_seconds'):
+            parsed = self.query_parser.parse(query)
+        with metrics.timer('query_seconds', intent=parsed.intent or 'help'):
+            return self._answer(parsed)
+
+    def _answer(self, parsed):
+        """Build the response for a parsed query"""
+        if parsed.intent == 'stats' and (parsed.players or parsed.phrase):
+            # Known player (exact, nickname or typo match), else echo what was asked for
+            player_name = parsed.players[0] if parsed.players else parsed.phrase.title()
             return self.get_player_stats(player_name)
         
-        elif "lineup" in query or "who should i start" in query:
+        elif parsed.intent == 'lineup':
             return "Here are my recommendations for your lineup:\n" + self.get_lineup_recommendation()
         
-        elif "injured" in query or "status" in query:
+        elif parsed.intent == 'injuries':
             injured_players = [
                 f"{name} - {data['status']}"
                 for name, data in self.players.items()
@@ -79,9 +107,25 @@ class FantasyFootballAssistant:
             return "I can help you with:\n" + \
                    "- Player stats (e.g., 'Get stats for Patrick Mahomes')\n" + \
                    "- Lineup recommendations (e.g., 'Who should I start?')\n" + \
-                   "- Injury updates (e.g., 'Any injured players?')"
+                   "- Injury updates (e.g., 'Any injured players?')\n" + \
+                   "- Performance metrics (type 'metrics', 'metrics json' or 'metrics prometheus')"
+
+def build_warm_snapshot(path=None):
+    """Fetch current data through DataManager and write its warm-start snapshot"""
+    from data_manager import DataManager
+
+    data_manager = DataManager()
+    try:
+        path = data_manager.save_warm_snapshot(path)
+    finally:
+        data_manager.close()
+    print(f"Warm snapshot written to {path}")
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--build-snapshot':
+        build_warm_snapshot(sys.argv[2] if len(sys.argv) > 2 else None)
+        return
+
     assistant = FantasyFootballAssistant()
     print("Fantasy Football Assistant Ready! (Type 'quit' to exit)")
     
@@ -91,6 +135,18 @@ def main():
         if query.lower() == 'quit':
             print("Goodbye!")
             break
+
+        # 'metrics', 'metrics json' or 'metrics prometheus'
+        command = query.lower().split()
+        if command and command[0] == 'metrics':
+            fmt = command[1] if len(command) > 1 else 'text'
+            if fmt == 'json':
+                print("\n" + metrics.to_json())
+            elif fmt in ('prometheus', 'prom'):
+                print("\n" + metrics.to_prometheus())
+            else:
+                print("\n" + metrics.report())
+            continue
             
         response = assistant.process_query(query)
         print("\n" + response)
@@ -0,0 +1,170 @@
+"""
+Weekly matchup index: the NFL schedule and defense-vs-position strength as
+arrays over team codes, built once per week.
+
+Every table has a neutral sentinel row and column at index -1, so a whole
+player pool is adjusted with one gather, even where a team or position
+is unknown (code -1):
+
+    index = data_manager.get_matchup_index()
+    teams = index.team_codes(pool_teams)       # once per pool
+    adjusted = index.adjust(points, teams, position_codes)
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+from lineup_optimizer import POSITION_CODES, POSITIONS, normalize_position
+
+REGULAR_SEASON_WEEKS = 18
+
+# Games of league-average defense blended into each defense's points allowed,
+# so a couple of outlier games early in the season don't swing the factor
+PRIOR_GAMES = 3
+
+# Alternate abbreviations (nflverse, ESPN, relocated teams) -> Sleeper's
+TEAM_ALIASES = {'LA': 'LAR', 'JAC': 'JAX', 'WSH': 'WAS', 'OAK': 'LV', 'SD': 'LAC', 'STL': 'LAR'}
+
+
+def normalize_team(team):
+    team = (team or '').upper()
+    return TEAM_ALIASES.get(team, team)
+
+
+def estimated_state(today=None):
+    """
+    Calendar estimate of Sleeper's NFL state, for when it can't be fetched:
+    week 1 starts the Tuesday after Labor Day, January and February belong
+    to the previous season.
+    """
+    today = today or date.today()
+    season = today.year if today.month >= 3 else today.year - 1
+    labor_day = date(season, 9, 1)
+    labor_day += timedelta(days=(7 - labor_day.weekday()) % 7)
+    week = (today - labor_day - timedelta(days=1)).days // 7 + 1
+    return {'season': str(season), 'week': min(max(week, 1), REGULAR_SEASON_WEEKS), 'estimated': True}
+
+
+def schedule_games(schedule):
+    """(home, away) pairs from a schedule list (as returned by DataManager.get_matchups)"""
+    games = []
+    for game in schedule or []:
+        home = normalize_team(game.get('home') or game.get('home_team'))
+        away = normalize_team(game.get('away') or game.get('away_team'))
+        if home and away:
+            games.append((home, away))
+    return games
+
+
+class MatchupIndex:
+    """
+    One week's matchups. Per team code: opponent (-1 on bye or unknown),
+    home, bye and remaining_games. Per (team, position):
+    allowed - fantasy points per game the team's defense allows to the position
+    factor  - allowed relative to the league average, shrunk toward 1.0
+    matchup - factor of this week's opponent (0.0 on bye), what a player faces
+    sos     - mean opponent factor over the rest of the season after this week
+    """
+
+    def __init__(self, week, teams, opponent, home, allowed, games, remaining):
+        self.week = week
+        self.teams = list(teams)
+        self.team_index = {team: code for code, team in enumerate(self.teams)}
+        self.positions = list(POSITIONS)
+
+        n_teams, n_positions = len(self.teams), len(self.positions)
+        self.opponent = np.asarray(opponent, dtype=np.int16)
+        self.home = np.asarray(home, dtype=bool)
+        # Without this week's schedule nobody is known to be on bye
+        self.bye = (self.opponent < 0) & (self.opponent >= 0).any()
+        self.games = np.asarray(games, dtype=np.int16)
+        self.allowed = np.asarray(allowed, dtype=np.float64)
+
+        # Shrink each defense toward the league average for its position
+        known = (self.games[:, None] > 0) & ~np.isnan(self.allowed)
+        factor = np.ones((n_teams + 1, n_positions + 1))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average = np.where(known, self.allowed, 0.0).sum(axis=0) / known.sum(axis=0)
+            shrunk = (np.nan_to_num(self.allowed) * self.games[:, None] + average * PRIOR_GAMES) \
+                / (self.games[:, None] + PRIOR_GAMES) / average
+        factor[:n_teams, :n_positions] = np.where(np.isfinite(shrunk), shrunk, 1.0)
+        self.factor = factor
+
+        # Gathers through the sentinel row: byes are zeroed, unknown teams stay neutral
+        self.matchup = np.ones((n_teams + 1, n_positions + 1))
+        self.matchup[:n_teams] = factor[self.opponent]
+        self.matchup[:n_teams][self.bye] = 0.0
+
+        remaining = np.asarray(remaining, dtype=np.int16)  # later weeks x teams
+        played = remaining >= 0
+        self.remaining_games = played.sum(axis=0).astype(np.int16)
+        self.sos = np.ones((n_teams + 1, n_positions + 1))
+        if len(remaining):
+            totals = np.where(played[:, :, None], factor[remaining], 0.0).sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.sos[:n_teams] = np.where(
+                    self.remaining_games[:, None] > 0, totals / self.remaining_games[:, None], 1.0
+                )
+
+    @classmethod
+    def build(cls, week, schedules, allowed=None):
+        """
+        schedules is {week: schedule list} for this week and any later weeks
+        (later ones feed strength of schedule); allowed is
+        HistoricalStatsStore.points_allowed()'s result, or None for neutral.
+        """
+        games_by_week = {w: schedule_games(schedule) for w, schedule in schedules.items()}
+        names = {team for games in games_by_week.values() for game in games for team in game}
+        if allowed is not None:
+            names.update(normalize_team(team) for team in allowed['teams'])
+        teams = sorted(names)
+        codes = {team: code for code, team in enumerate(teams)}
+
+        def opponents(games):
+            row = np.full(len(teams), -1, dtype=np.int16)
+            home = np.zeros(len(teams), dtype=bool)
+            for home_team, away_team in games:
+                row[codes[home_team]], row[codes[away_team]] = codes[away_team], codes[home_team]
+                home[codes[home_team]] = True
+            return row, home
+
+        opponent, home = opponents(games_by_week.get(week, []))
+        remaining = [opponents(games)[0] for w, games in sorted(games_by_week.items()) if w > week]
+
+        points = np.zeros((len(teams), len(POSITIONS)))
+        games = np.zeros(len(teams), dtype=np.int16)
+        if allowed is not None:
+            # Aliases (e.g. 'LA' and 'LAR' across seasons) fold into one team
+            rows = np.array([codes[normalize_team(team)] for team in allowed['teams']], dtype=np.intp)
+            columns = np.array([POSITION_CODES.get(normalize_position(p), -1) for p in allowed['positions']], dtype=np.intp)
+            known = columns >= 0
+            np.add.at(games, rows, np.asarray(allowed['games'], dtype=np.int16))
+            np.add.at(points, (rows[:, None], columns[known][None, :]), np.asarray(allowed['points'])[:, known])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            points = np.where(games[:, None] > 0, points / games[:, None], np.nan)
+        return cls(week, teams, opponent, home, points, games, np.array(remaining, dtype=np.int16).reshape(len(remaining), len(teams)))
+
+    def team_codes(self, teams):
+        """Team code for each team abbreviation, -1 where unknown"""
+        index = self.team_index
+        return np.fromiter((index.get(normalize_team(team), -1) for team in teams), dtype=np.int16, count=len(teams))
+
+    def adjust(self, points, team_codes, position_codes):
+        """Projected points scaled by each player's opponent this week (0 on bye)"""
+        return np.asarray(points, dtype=np.float64) * self.matchup[team_codes, position_codes]
+
+    def game(self, team):
+        """This week's game for one team: {'opponent', 'home', 'bye'}, or None if unknown"""
+        code = self.team_index.get(normalize_team(team))
+        if code is None:
+            return None
+        opponent = int(self.opponent[code])
+        return {
+            'opponent': self.teams[opponent] if opponent >= 0 else None,
+            'home': bool(self.home[code]),
+            'bye': bool(self.bye[code])
+        }
+
+    def opponents(self):
+        """team -> opponent for teams playing this week (as simulation.opponents_from_schedule)"""
+        return {team: self.teams[code] for team, code in zip(self.teams, self.opponent.tolist()) if code >= 0}
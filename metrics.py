@@ -0,0 +1,227 @@
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from config import METRICS_CONFIG
+
+# Histogram bucket upper bounds (an implicit +Inf bucket follows)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Numeric path segments (player ids, seasons, weeks) collapse to one label value
+_ID_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def endpoint_label(endpoint):
+    """Endpoint with ids templated out, e.g. 'stats/nfl/player/4046' -> 'stats/nfl/player/{id}'"""
+    return _ID_SEGMENT.sub('{id}', '/' + endpoint.strip('/'))[1:]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a running count, sum and max"""
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (max for the +Inf bucket)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+            'max': round(self.max, 6)
+        }
+
+
+class _NullTimer:
+    """Shared no-op timer handed out while metrics are disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'labels', 'buckets', 'start')
+
+    def __init__(self, registry, name, labels, buckets):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.buckets = buckets
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, self.buckets, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms keyed by name and label set.
+    When disabled every recording call returns after one attribute check,
+    and timer() hands back a shared no-op context manager.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.started_at = time.time()
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def timer(self, name, buckets=LATENCY_BUCKETS, **labels):
+        """Context manager observing elapsed seconds into histogram `name`"""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, name, labels, buckets)
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    # Export
+
+    def snapshot(self):
+        """JSON-ready {'counters': [...], 'histograms': [...]} with labels as dicts"""
+        with self.lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {'name': name, 'labels': dict(labels), **histogram.summary()}
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+        return {
+            'enabled': self.enabled,
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'counters': counters,
+            'histograms': histograms
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix='ffa_'):
+        """Prometheus text exposition format"""
+        def labels_text(labels, extra=()):
+            pairs = [
+                '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                for key, value in tuple(labels) + tuple(extra)
+            ]
+            return '{' + ','.join(pairs) + '}' if pairs else ''
+
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}{name} counter")
+                    typed.add(name)
+                lines.append(f"{prefix}{name}{labels_text(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {prefix}{name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{prefix}{name}_bucket{labels_text(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{labels_text(labels)} {histogram.sum}")
+                lines.append(f"{prefix}{name}_count{labels_text(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def report(self):
+        """Human-readable summary for the CLI 'metrics' command"""
+        if not self.enabled:
+            return "Metrics are disabled (set METRICS_ENABLED=1 to enable)."
+        snapshot = self.snapshot()
+        if not snapshot['counters'] and not snapshot['histograms']:
+            return "No metrics recorded yet."
+
+        def label_text(labels):
+            return ", ".join(f"{key}={value}" for key, value in labels.items())
+
+        lines = [f"Metrics (uptime {snapshot['uptime_seconds']}s):"]
+        for entry in snapshot['histograms']:
+            if entry['name'].endswith('_seconds'):
+                values = (f"n={entry['count']} mean={entry['mean'] * 1000:.2f}ms "
+                          f"p50<={entry['p50'] * 1000:.2f}ms p99<={entry['p99'] * 1000:.2f}ms "
+                          f"max={entry['max'] * 1000:.2f}ms")
+            else:
+                values = f"n={entry['count']} mean={entry['mean']:.0f} max={entry['max']:.0f}"
+            lines.append(f"  {entry['name']} [{label_text(entry['labels'])}] {values}")
+        for entry in snapshot['counters']:
+            lines.append(f"  {entry['name']} [{label_text(entry['labels'])}] {entry['value']}")
+        return "\n".join(lines)
+
+
+# Process-wide registry used by DataManager, TieredCache, AsyncHttpClient and the CLI
+metrics = MetricsRegistry(enabled=METRICS_CONFIG['ENABLED'])
+
+
+def record_upstream(source, endpoint, seconds, size=None, status='ok'):
+    """Record one upstream API call: latency, response size and outcome"""
+    if not metrics.enabled:
+        return
+    endpoint = endpoint_label(endpoint)
+    metrics.observe('upstream_request_seconds', seconds, source=source, endpoint=endpoint)
+    if size is not None:
+        metrics.observe('upstream_response_bytes', size, SIZE_BUCKETS, source=source, endpoint=endpoint)
+    metrics.inc('upstream_requests_total', source=source, endpoint=endpoint, status=status)
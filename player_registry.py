@@ -0,0 +1,240 @@
+import json
+import re
+import time
+from pathlib import Path
+
+from config import UPDATE_INTERVALS
+
+# Fields kept from the Sleeper player dump; everything else is dropped
+PLAYER_FIELDS = (
+    'full_name',
+    'first_name',
+    'last_name',
+    'position',
+    'team',
+    'status',
+    'injury_status',
+    'age',
+    'years_exp'
+)
+
+# How long after a failed player dump fetch before Sleeper is asked again
+REFRESH_RETRY_SECONDS = 300
+
+_NON_NAME_CHARS = re.compile(r"[^a-z0-9 ]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(name):
+    """Normalize a player name for index lookups ("D.K. Metcalf" -> "dk metcalf")"""
+    if not name:
+        return ''
+    name = _NON_NAME_CHARS.sub('', name.lower().replace('-', ' '))
+    return _WHITESPACE.sub(' ', name).strip()
+
+
+def compact_player(data):
+    """Reduce a raw Sleeper player entry to the fields the assistant uses"""
+    record = {field: data.get(field) for field in PLAYER_FIELDS}
+    if not record['full_name'] and (record['first_name'] or record['last_name']):
+        # Team defenses only carry first/last name ("Kansas City" "Chiefs")
+        record['full_name'] = f"{record['first_name'] or ''} {record['last_name'] or ''}".strip()
+    return record
+
+
+class PlayerRegistry:
+    """
+    Indexed, on-disk backed copy of the Sleeper player universe.
+
+    Lookups only read the in-memory indexes; the network is touched by
+    refresh(), which runs at most once per UPDATE_INTERVALS['players'].
+
+    Updates are applied to copies of the record dict and indexes, which
+    are then swapped in with one assignment, so readers on other threads
+    never see a half-applied refresh or a dict changing size under them.
+    Writers (load/refresh/update) still need to be serialized by the caller.
+    """
+
+    def __init__(self, fetch_players, data_dir, refresh_interval=None):
+        self.fetch_players = fetch_players
+        self.snapshot_path = Path(data_dir) / 'players_snapshot.json'
+        self.refresh_interval = refresh_interval or UPDATE_INTERVALS['players']
+        self.last_refresh = 0
+        self.retry_at = 0  # earliest time to retry after a failed refresh
+
+        # (players, name_index, team_index, position_index):
+        # player id -> compact record, normalized name -> [player ids],
+        # team -> {player ids}, position -> {player ids}
+        self._indexes = ({}, {}, {}, {})
+
+    @property
+    def players(self):
+        return self._indexes[0]
+
+    @property
+    def name_index(self):
+        return self._indexes[1]
+
+    @property
+    def team_index(self):
+        return self._indexes[2]
+
+    @property
+    def position_index(self):
+        return self._indexes[3]
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player_id):
+        return str(player_id) in self.players
+
+    def load(self):
+        """Load the on-disk snapshot, refreshing from Sleeper if it is missing or stale"""
+        if not self.players and self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path) as f:
+                    snapshot = json.load(f)
+                self._apply(snapshot['players'])
+                self.last_refresh = snapshot['updated_at']
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading player snapshot: {e}")
+        self.refresh_if_stale()
+        return self
+
+    def is_stale(self):
+        now = time.time()
+        return now - self.last_refresh >= self.refresh_interval and now >= self.retry_at
+
+    def refresh_if_stale(self):
+        if self.is_stale():
+            return self.refresh()
+        return {}
+
+    def refresh(self):
+        """
+        Pull the player dump and apply only the records that changed.
+        Returns {'added': [...], 'updated': [...], 'removed': [...]} ids.
+        """
+        raw = self.fetch_players()
+        if not raw:
+            # Keep serving the previous snapshot; back off briefly rather than a whole interval
+            self.retry_at = time.time() + REFRESH_RETRY_SECONDS
+            return {}
+        return self.update({pid: compact_player(data) for pid, data in raw.items()})
+
+    def update(self, records):
+        """Replace the registry contents with compact records, re-indexing only the deltas"""
+        changes = self._apply(records)
+        self.last_refresh = time.time()
+        if any(changes.values()) or not self.snapshot_path.exists():
+            self.save()
+        return changes
+
+    def save(self):
+        """Write a compact snapshot of the registry under data/"""
+        tmp_path = self.snapshot_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'updated_at': self.last_refresh, 'players': self.players}, f, separators=(',', ':'))
+        tmp_path.replace(self.snapshot_path)
+
+    def state(self):
+        """Records plus prebuilt indexes, for embedding in a binary warm-start snapshot"""
+        return {
+            'updated_at': self.last_refresh,
+            'players': self.players,
+            'name_index': self.name_index,
+            'team_index': self.team_index,
+            'position_index': self.position_index
+        }
+
+    def restore(self, state):
+        """Adopt a state() dict as-is, skipping the re-index load() would do"""
+        self._indexes = (state['players'], state['name_index'], state['team_index'], state['position_index'])
+        self.last_refresh = state['updated_at']
+        return self
+
+    def _apply(self, records):
+        players, name_index, team_index, position_index = (dict(index) for index in self._indexes)
+        owned = set()
+
+        def own(index, key, empty):
+            # Copy an index entry the first time this update changes it; the live one stays untouched
+            if (id(index), key) not in owned:
+                owned.add((id(index), key))
+                index[key] = type(empty)(index.get(key, empty))
+            return index.setdefault(key, type(empty)())
+
+        def add(pid, record):
+            name = normalize_name(record.get('full_name'))
+            if name:
+                ids = own(name_index, name, [])
+                # Players on an NFL roster win name collisions over free agents
+                if record.get('team'):
+                    ids.insert(0, pid)
+                else:
+                    ids.append(pid)
+            if record.get('team'):
+                own(team_index, record['team'], set()).add(pid)
+            if record.get('position'):
+                own(position_index, record['position'], set()).add(pid)
+
+        def remove(pid, record):
+            name = normalize_name(record.get('full_name'))
+            if pid in name_index.get(name, ()):
+                ids = own(name_index, name, [])
+                ids.remove(pid)
+                if not ids:
+                    del name_index[name]
+            for index, key in ((team_index, record.get('team')), (position_index, record.get('position'))):
+                if key in index:
+                    entries = own(index, key, set())
+                    entries.discard(pid)
+                    if not entries:
+                        del index[key]
+
+        added, updated = [], []
+        for pid, record in records.items():
+            previous = players.get(pid)
+            if previous == record:
+                continue
+            if previous is None:
+                added.append(pid)
+            else:
+                updated.append(pid)
+                remove(pid, previous)
+            players[pid] = record
+            add(pid, record)
+
+        removed = [pid for pid in players if pid not in records]
+        for pid in removed:
+            remove(pid, players.pop(pid))
+
+        self._indexes = (players, name_index, team_index, position_index)
+        return {'added': added, 'updated': updated, 'removed': removed}
+
+    def find_id(self, player_name):
+        """Return the Sleeper id for a player name, or None"""
+        ids = self.name_index.get(normalize_name(player_name))
+        return ids[0] if ids else None
+
+    def get(self, player_id):
+        """Return the compact record for a player id, or None"""
+        return self.players.get(str(player_id))
+
+    def find(self, player_name):
+        """Return (player_id, record) for a player name, or (None, None)"""
+        players, name_index = self._indexes[:2]
+        ids = name_index.get(normalize_name(player_name))
+        return (ids[0], players[ids[0]]) if ids else (None, None)
+
+    def ids_for(self, team=None, position=None):
+        """Return the ids of players matching a team and/or position"""
+        players, _, team_index, position_index = self._indexes
+        if team is None and position is None:
+            return set(players)
+        if team is None:
+            return set(position_index.get(position, ()))
+        if position is None:
+            return set(team_index.get(team, ()))
+        return team_index.get(team, set()) & position_index.get(position, set())
@@ -0,0 +1,194 @@
+import difflib
+import re
+from collections import deque, namedtuple
+from functools import lru_cache
+
+from player_registry import normalize_name
+
+# Checked in order; the first matching intent wins
+INTENT_PATTERNS = [
+    ('stats', re.compile(r"\bstats?\b|\bhow is .+ doing\b|\bwhat about\b")),
+    ('lineup', re.compile(r"\blineup\b|\bwho should i start\b|\bshould i start\b|\bstart .+ or\b")),
+    ('injuries', re.compile(r"\binjur(?:y|ies|ed)\b|\bstatus\b|\bhurt\b"))
+]
+
+# Phrases that usually follow the player name in a stats/start question
+PLAYER_PHRASE_PATTERNS = [
+    re.compile(r"stats? for (.+?)(?:\?|$)"),
+    re.compile(r"how is (.+?) doing"),
+    re.compile(r"what about (.+?)(?:\?|$)"),
+    re.compile(r"start (.+?) or"),
+    re.compile(r"should i start (.+?)(?:\?|$)")
+]
+
+# "kelce's" -> "kelce", so possessive names still match the automaton and phrases
+POSSESSIVE_PATTERN = re.compile(r"(?<=\w)['\u2019]s\b")
+
+POSITION_PATTERN = re.compile(r"(?<![A-Z/])(QB|RB|WR|TE|K|DST|D/ST|DEF)(?![A-Z/])")
+POSITION_ALIASES = {'D/ST': 'DST', 'DEF': 'DST'}
+
+# Common nicknames -> full player name; only used when that player is known
+NICKNAMES = {
+    'cmc': 'christian mccaffrey',
+    'ajb': 'aj brown',
+    'arsb': 'amon ra st brown',
+    'sun god': 'amon ra st brown',
+    'tk': 'travis kelce',
+    'jjetas': 'justin jefferson',
+    'chubb': 'nick chubb',
+    'king henry': 'derrick henry',
+    'hollywood': 'marquise brown',
+    'megatron': 'calvin johnson'
+}
+
+FUZZY_CUTOFF = 0.8
+
+ParsedQuery = namedtuple('ParsedQuery', ['intent', 'players', 'position', 'phrase'])
+
+
+def extract_position(text):
+    """Position mentioned as a standalone token (so "STATS" does not match TE)"""
+    match = POSITION_PATTERN.search(text.upper())
+    if not match:
+        return None
+    return POSITION_ALIASES.get(match.group(1), match.group(1))
+
+
+class NameAutomaton:
+    """
+    Aho-Corasick automaton over normalized player names and nicknames.
+    One pass over the query finds every whole-word name it contains.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.terminal = [[]]  # node -> [(name length, value)] ending exactly here
+        self.output = [[]]  # terminal plus everything reachable via failure links
+        self.built = False
+
+    def add(self, name, value):
+        name = normalize_name(name)
+        if not name:
+            return
+        node = 0
+        for char in name:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.terminal.append([])
+            node = next_node
+        self.terminal[node].append((len(name), value))
+        self.built = False
+
+    def build(self):
+        """Compute failure links and merged outputs breadth-first"""
+        self.output = [list(outputs) for outputs in self.terminal]
+        queue = deque(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        self.built = True
+
+    def search(self, text):
+        """Return [(start, end, value)] whole-word matches in normalized text, in order of appearance"""
+        if not self.built:
+            self.build()
+        matches = []
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, value in self.output[node]:
+                start = end - length
+                if (start == 0 or text[start - 1] == ' ') and (end == len(text) or text[end] == ' '):
+                    matches.append((start, end, value))
+
+        # Drop matches nested inside a longer one ("mike" inside "mike evans")
+        matches.sort(key=lambda m: (m[0] - m[1], m[0]))
+        taken, result = [], []
+        for start, end, value in matches:
+            if all(end <= s or start >= e for s, e in taken):
+                taken.append((start, end))
+                result.append((start, end, value))
+        return sorted(result)
+
+
+class QueryParser:
+    """
+    Resolves a chat query to an intent, player values and a position.
+    Player names come from add_player(); parsed queries are LRU-cached.
+    """
+
+    def __init__(self, cache_size=4096):
+        self.automaton = NameAutomaton()
+        self.names = {}  # normalized name -> value, for fuzzy fallback
+        self.last_names = {}  # last name -> [values]
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def add_player(self, name, value=None):
+        """
+        Register a player name; value (defaults to the name) is what parse()
+        returns. Call build() once all players are added.
+        """
+        value = name if value is None else value
+        normalized = normalize_name(name)
+        if not normalized:
+            return
+        self.automaton.add(normalized, value)
+        self.names[normalized] = value
+        last_name = normalized.rsplit(' ', 1)[-1]
+        if last_name != normalized:
+            self.last_names.setdefault(last_name, []).append(value)
+
+    def build(self):
+        """Finish registration: add nicknames and unambiguous last names, then compile"""
+        for nickname, name in NICKNAMES.items():
+            if name in self.names:
+                self.automaton.add(nickname, self.names[name])
+        for last_name, values in self.last_names.items():
+            if len(values) == 1 and last_name not in self.names:
+                self.automaton.add(last_name, values[0])
+        self.automaton.build()
+        self.parse.cache_clear()
+        return self
+
+    @classmethod
+    def from_registry(cls, registry):
+        """Parser over every player in a PlayerRegistry, returning Sleeper ids"""
+        parser = cls()
+        for player_id, record in registry.players.items():
+            parser.add_player(record.get('full_name'), player_id)
+        return parser.build()
+
+    def _parse(self, query):
+        text = POSSESSIVE_PATTERN.sub('', query.lower().strip())
+        intent = next((name for name, pattern in INTENT_PATTERNS if pattern.search(text)), None)
+
+        phrase = None
+        for pattern in PLAYER_PHRASE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                phrase = match.group(1).strip()
+                break
+
+        players = tuple(value for _, _, value in self.automaton.search(normalize_name(text)))
+        if not players and phrase:
+            # Typo fallback: closest registered name to the extracted phrase
+            close = difflib.get_close_matches(normalize_name(phrase), self.names, n=1, cutoff=FUZZY_CUTOFF)
+            if close:
+                players = (self.names[close[0]],)
+
+        return ParsedQuery(intent, players, extract_position(query), phrase)
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+
+from config import RATE_LIMITS
+
+# RATE_LIMITS key -> window length in seconds
+RATE_WINDOWS = {
+    'requests_per_second': 1,
+    'requests_per_minute': 60,
+    'requests_per_hour': 3600,
+    'requests_per_day': 86400
+}
+
+
+class TokenBucket:
+    """
+    Token bucket for one rate window. reserve() always takes a token and
+    returns how long the caller must wait before using it, so a burst of
+    callers is queued at the refill rate instead of being rejected.
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+
+
+class RateLimiter:
+    """Enforces every window declared for one API in config.RATE_LIMITS"""
+
+    def __init__(self, name, limits):
+        self.name = name
+        self.buckets = [
+            TokenBucket(limit, RATE_WINDOWS[window])
+            for window, limit in limits.items()
+            if window in RATE_WINDOWS
+        ]
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @classmethod
+    def for_source(cls, source):
+        """Build the limiter for a DataManager source name ('ESPN', 'NFL', 'Sleeper')"""
+        name = f"{source.upper()}_API"
+        return cls(name, RATE_LIMITS.get(name, {}))
+
+    def _reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = max((bucket.reserve(now) for bucket in self.buckets), default=0.0)
+            self.requests += 1
+            if delay > 0:
+                self.throttled += 1
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+                self.total_wait += delay
+                self.max_wait = max(self.max_wait, delay)
+            return delay
+
+    def _release(self):
+        with self.lock:
+            self.queue_depth -= 1
+
+    def acquire(self):
+        """Block the calling thread until a request is allowed; returns the wait"""
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            finally:
+                self._release()
+        return delay
+
+    async def acquire_async(self):
+        """Suspend the calling task until a request is allowed; returns the wait"""
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._release()
+        return delay
+
+    def stats(self):
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'total_wait': round(self.total_wait, 3),
+                'avg_wait': round(self.total_wait / self.throttled, 3) if self.throttled else 0.0,
+                'max_wait': round(self.max_wait, 3)
+            }
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls from threads into one execution"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # key -> [event, result]
+        self.coalesced = 0
+
+    def call(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = [threading.Event(), None]
+            else:
+                self.coalesced += 1
+        if not leader:
+            call[0].wait()
+            return call[1]
+        try:
+            call[1] = fn()
+            return call[1]
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call[0].set()
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent identical awaits on one event loop into one execution"""
+
+    def __init__(self):
+        self.calls = {}  # key -> future
+        self.coalesced = 0
+
+    async def call(self, key, coro_fn):
+        future = self.calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(coro_fn())
+        self.calls[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.calls.get(key) is future:
+                del self.calls[key]
@@ -0,0 +1,186 @@
+import heapq
+import threading
+import time
+
+from config import UPDATE_INTERVALS
+
+
+def index_by_player(snapshot):
+    """Key a snapshot by player id: dicts pass through, lists use each entry's 'player_id'"""
+    if snapshot is None:
+        return {}
+    if isinstance(snapshot, dict):
+        return snapshot
+    if hasattr(snapshot, 'to_dict'):
+        # DataFrame rows; drop NaNs so unchanged missing stats don't compare unequal
+        return {
+            key: {column: value for column, value in row.items() if value == value}
+            for key, row in snapshot.to_dict('index').items()
+        }
+    return {str(entry.get('player_id')): entry for entry in snapshot if isinstance(entry, dict)}
+
+
+def diff_snapshots(old, new):
+    """Changes between two keyed snapshots: {'added': {}, 'removed': {}, 'changed': {k: {'old', 'new'}}}"""
+    added = {key: value for key, value in new.items() if key not in old}
+    removed = {key: value for key, value in old.items() if key not in new}
+    changed = {
+        key: {'old': old[key], 'new': value}
+        for key, value in new.items()
+        if key in old and old[key] != value
+    }
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+class RefreshJob:
+    def __init__(self, name, interval, fetch, store=None, index=index_by_player, key=None):
+        self.name = name
+        self.interval = interval
+        self.fetch = fetch
+        self.store = store
+        self.index = index
+        self.key = key
+        self.snapshot = None
+        self.keyed = {}
+        self.refreshed_at = None
+        self.failures = 0
+
+
+class RefreshScheduler:
+    """
+    Refreshes each dataset on its UPDATE_INTERVALS cadence from a background
+    thread, diffs the new snapshot against the previous one, and publishes
+    only the changes to subscribers.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self.subscribers = []  # (callback, dataset names or None)
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_job(self, name, interval, fetch, store=None, index=index_by_player, key=None):
+        """
+        Register a dataset. fetch() returns the new snapshot (None keeps the
+        old one); store(snapshot) publishes it, e.g. into the DataManager
+        cache; index(snapshot) keys it for diffing. With key, key() is called
+        once per refresh and passed on as fetch(key) and store(snapshot, key),
+        so both see the same week even across a rollover.
+        """
+        self.jobs[name] = RefreshJob(name, interval, fetch, store, index, key)
+        return self
+
+    def subscribe(self, callback, datasets=None):
+        """Call callback(dataset, changes) whenever a dataset changes"""
+        self.subscribers.append((callback, set(datasets) if datasets else None))
+
+    def snapshot(self, name):
+        """Latest snapshot of a dataset (no upstream call)"""
+        return self.jobs[name].snapshot
+
+    def refresh(self, name):
+        """Refresh one dataset now; returns the published changes (empty if none)"""
+        job = self.jobs[name]
+        try:
+            args = (job.key(),) if job.key is not None else ()
+            snapshot = job.fetch(*args)
+            if snapshot is None:
+                job.failures += 1
+                return {}
+            keyed = job.index(snapshot)
+            if job.store is not None:
+                job.store(snapshot, *args)
+        except Exception as e:
+            print(f"Error refreshing {name}: {e}")
+            job.failures += 1
+            return {}
+
+        with self.lock:
+            changes = diff_snapshots(job.keyed, keyed)
+            first_load = job.snapshot is None
+            job.snapshot, job.keyed = snapshot, keyed
+            job.refreshed_at = time.time()
+
+        if not first_load and any(changes.values()):
+            for callback, datasets in list(self.subscribers):
+                if datasets is None or name in datasets:
+                    try:
+                        callback(name, changes)
+                    except Exception as e:
+                        print(f"Error in {name} subscriber: {e}")
+            return changes
+        return {}
+
+    def start(self, refresh_now=True):
+        """Start the background thread; by default every dataset is loaded before returning"""
+        if self._thread is not None:
+            return self
+        if refresh_now:
+            for name in self.jobs:
+                self.refresh(name)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        now = time.monotonic()
+        queue = [(now + job.interval, name) for name, job in self.jobs.items()]
+        heapq.heapify(queue)
+        while queue and not self._stop.is_set():
+            due, name = queue[0]
+            if self._stop.wait(max(0.0, due - time.monotonic())):
+                break
+            heapq.heapreplace(queue, (time.monotonic() + self.jobs[name].interval, name))
+            self.refresh(name)
+
+
+def data_manager_scheduler(data_manager):
+    """
+    Scheduler with the default DataManager datasets. Snapshots are written
+    into the DataManager cache with a TTL of twice the refresh interval, so
+    readers always hit a warm entry while the scheduler is running.
+    """
+    dm = data_manager
+    scheduler = RefreshScheduler()
+
+    def cache_store(category, key_fn, interval):
+        return lambda snapshot, *args: dm.cache.set(category, key_fn(*args), snapshot, ttl=interval * 2)
+
+    def week_key():
+        return dm._season_week()
+
+    scheduler.add_job(
+        'injury_reports', UPDATE_INTERVALS['injury_reports'],
+        lambda: dm._get_sleeper_data("injuries/nfl"),
+        cache_store('injuries', lambda: 'nfl', UPDATE_INTERVALS['injury_reports'])
+    )
+    scheduler.add_job(
+        'projections', UPDATE_INTERVALS['projections'],
+        lambda week: dm.http.run(dm._fetch_week_projections_async(*week)),
+        cache_store('projections', lambda week: "week_%s_%s" % week, UPDATE_INTERVALS['projections']),
+        key=week_key
+    )
+    scheduler.add_job(
+        'trending', UPDATE_INTERVALS['trending'],
+        lambda: dm._get_sleeper_data("stats/nfl/trending/add"),
+        cache_store('trending', lambda: 'add', UPDATE_INTERVALS['trending'])
+    )
+
+    def fetch_players():
+        # First run loads the on-disk snapshot (refreshing only if stale); later runs re-pull the dump
+        registry = dm.get_registry()
+        if scheduler.snapshot('players') is not None:
+            with dm._registry_lock:
+                registry.refresh()
+        return dict(registry.players)
+
+    scheduler.add_job('players', UPDATE_INTERVALS['players'], fetch_players)
+    return scheduler
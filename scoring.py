@@ -0,0 +1,134 @@
+import sys
+
+import numpy as np
+
+from config import SCORING_SETTINGS
+
+# Stat column -> SCORING_SETTINGS key. The column order is the layout of
+# every stats matrix the engine scores.
+STAT_SCORING_KEYS = {
+    'passing_yards': 'passing_yard',
+    'passing_touchdowns': 'passing_touchdown',
+    'interceptions': 'interception',
+    'rushing_yards': 'rushing_yard',
+    'rushing_touchdowns': 'rushing_touchdown',
+    'receptions': 'reception',
+    'receiving_yards': 'receiving_yard',
+    'receiving_touchdowns': 'receiving_touchdown',
+    'fumbles_lost': 'fumble_lost',
+    'two_point_conversions': 'two_point_conversion'
+}
+STAT_COLUMNS = list(STAT_SCORING_KEYS)
+
+SCORING_PROFILES = {
+    'ppr': {**SCORING_SETTINGS, 'reception': 1.0},
+    'half_ppr': {**SCORING_SETTINGS, 'reception': 0.5},
+    'standard': {**SCORING_SETTINGS, 'reception': 0.0}
+}
+
+# Weights DataManager uses for the stats half of a player's trade value:
+# yardage and touchdowns only, no reception/turnover adjustments
+VALUE_SCORING = {
+    'passing_yard': 0.04,
+    'passing_touchdown': 4,
+    'rushing_yard': 0.1,
+    'rushing_touchdown': 6,
+    'receiving_yard': 0.1,
+    'receiving_touchdown': 6
+}
+PROJECTION_VALUE_WEIGHT = 0.5
+
+
+def scoring_vector(scoring_settings):
+    """Weights for one scoring profile, aligned with STAT_COLUMNS (missing keys score 0)"""
+    return np.array(
+        [scoring_settings.get(STAT_SCORING_KEYS[column], 0) for column in STAT_COLUMNS],
+        dtype=np.float64
+    )
+
+
+def _is_frame(table):
+    """DataFrame check that doesn't import pandas (nothing can be a DataFrame until it's loaded)"""
+    pd = sys.modules.get('pandas')
+    return pd is not None and isinstance(table, pd.DataFrame)
+
+
+def stats_matrix(stats_table):
+    """
+    Convert a stats table to an (n, len(STAT_COLUMNS)) float matrix.
+    Accepts a DataFrame, a {column: array} mapping, a list of stat dicts, or
+    an array already laid out in STAT_COLUMNS order. Missing stats count as 0.
+    """
+    if _is_frame(stats_table):
+        matrix = stats_table.reindex(columns=STAT_COLUMNS, fill_value=0).to_numpy(dtype=np.float64)
+    elif isinstance(stats_table, dict):
+        length = len(next(iter(stats_table.values()))) if stats_table else 0
+        matrix = np.column_stack([
+            np.asarray(stats_table[column], dtype=np.float64) if column in stats_table else np.zeros(length)
+            for column in STAT_COLUMNS
+        ]) if length else np.zeros((0, len(STAT_COLUMNS)))
+    elif isinstance(stats_table, (list, tuple)) and (not stats_table or isinstance(stats_table[0], dict)):
+        matrix = np.array(
+            [[stats.get(column, 0) or 0 for column in STAT_COLUMNS] for stats in stats_table],
+            dtype=np.float64
+        ).reshape(len(stats_table), len(STAT_COLUMNS))
+    else:
+        matrix = np.asarray(stats_table, dtype=np.float64)
+    if np.isnan(matrix).any():
+        matrix = np.nan_to_num(matrix)
+    return matrix
+
+
+class ScoringEngine:
+    """
+    Scores a whole pool of player-weeks against several scoring profiles in
+    one matrix product: (players x stats) @ (stats x profiles).
+    """
+
+    def __init__(self, profiles=None):
+        self.profiles = {}
+        self.profile_names = []
+        self.weights = np.zeros((len(STAT_COLUMNS), 0))
+        for name, settings in (profiles or SCORING_PROFILES).items():
+            self.add_profile(name, settings)
+
+    def add_profile(self, name, scoring_settings):
+        """Register (or replace) a scoring profile, e.g. a league's custom settings"""
+        vector = scoring_vector(scoring_settings)
+        if name in self.profiles:
+            self.weights[:, self.profile_names.index(name)] = vector
+        else:
+            self.profile_names.append(name)
+            self.weights = np.column_stack([self.weights, vector])
+        self.profiles[name] = dict(scoring_settings)
+
+    def score(self, stats_table, profiles=None):
+        """
+        Return a players x profiles points matrix. DataFrame input returns a
+        DataFrame with the same index and one column per profile.
+        """
+        weights, names = self.weights, self.profile_names
+        if profiles is not None:
+            columns = [self.profile_names.index(name) for name in profiles]
+            weights, names = weights[:, columns], list(profiles)
+
+        points = np.round(stats_matrix(stats_table) @ weights, 2)
+        if _is_frame(stats_table):
+            import pandas as pd
+            return pd.DataFrame(points, index=stats_table.index, columns=names)
+        return points
+
+
+def score_stats(stats, scoring_settings=SCORING_SETTINGS):
+    """Fantasy points for a single stats dict under one scoring profile"""
+    return round(float(stats_matrix([stats])[0] @ scoring_vector(scoring_settings)), 2)
+
+
+def player_values(stats_table, projected_points):
+    """
+    Vectorized trade value: yardage/touchdown production plus half the
+    projected points, for every row of stats_table.
+    """
+    stats_value = stats_matrix(stats_table) @ scoring_vector(VALUE_SCORING)
+    projected = np.nan_to_num(np.asarray(projected_points, dtype=np.float64))
+    return stats_value + projected * PROJECTION_VALUE_WEIGHT
@@ -0,0 +1,289 @@
+"""
+Async HTTP / websocket front end for FantasyFootballAssistant.
+
+One event loop per worker process serves every connection. The assistant
+and a single DataManager (with its cache, rate limiters and pooled
+sessions) are shared by all requests in that worker. Assistant answers
+are in-memory and fast, so they run on the loop. DataManager calls that
+block on upstream I/O run in a bounded thread pool, or use the async
+fetchers directly, so a slow upstream never stalls other clients.
+
+    python server.py --port 8080 --workers 4
+
+With --workers > 1 every process binds the same port with SO_REUSEPORT
+and the kernel balances connections across them. Workers share the disk
+cache tier but each one has its own DataManager.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import WSMsgType, web
+
+from config import SERVER_CONFIG
+from main import FantasyFootballAssistant
+from metrics import metrics
+
+ASSISTANT = web.AppKey('assistant', FantasyFootballAssistant)
+DATA_MANAGER = web.AppKey('data_manager', object)
+EXECUTOR = web.AppKey('executor', ThreadPoolExecutor)
+
+
+# Structured versions of the assistant's text answers
+
+def player_json(record):
+    return {
+        'name': record['name'],
+        'position': record['position'],
+        'team': record['team'],
+        'status': record['status'],
+        'projected_points': record['projected_points'],
+        'stats': dict(record['stats'])
+    }
+
+
+def lineup_json(assistant):
+    lineup = assistant.lineup_optimizer.optimize(assistant.players)
+    return {
+        'starters': [{'slot': slot, **player_json(player)} for slot, player in lineup['starters']],
+        'bench': [player_json(player) for player in lineup['bench']],
+        'empty_slots': lineup['empty_slots'],
+        'projected_points': lineup['projected_points']
+    }
+
+
+def injuries_json(assistant):
+    return [
+        {'name': name, 'status': player['status']}
+        for name, player in assistant.players.items()
+        if player['status'] != "Active"
+    ]
+
+
+def structured_answer(assistant, query):
+    """Text answer plus the parsed intent and a JSON form of the same data"""
+    parsed = assistant.query_parser.parse(query)
+    data = None
+    if parsed.intent == 'stats' and parsed.players:
+        player = assistant.players.get(parsed.players[0])
+        data = player_json(player) if player else None
+    elif parsed.intent == 'lineup':
+        data = lineup_json(assistant)
+    elif parsed.intent == 'injuries':
+        data = injuries_json(assistant)
+    return {
+        'query': query,
+        'intent': parsed.intent,
+        'players': parsed.players,
+        'answer': assistant.process_query(query),
+        'data': data
+    }
+
+
+async def run_blocking(request, fn, *args):
+    """Run a blocking DataManager call on the worker's thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app[EXECUTOR], fn, *args)
+
+
+# Handlers
+
+async def handle_query(request):
+    if request.method == 'POST':
+        try:
+            body = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Expected a JSON body like {\"query\": \"...\"}")
+        query = body.get('query') if isinstance(body, dict) else None
+    else:
+        query = request.query.get('q')
+    if not query:
+        raise web.HTTPBadRequest(text="Missing query")
+    return web.json_response(structured_answer(request.app[ASSISTANT], query))
+
+
+async def handle_player(request):
+    name = request.match_info['name']
+    assistant = request.app[ASSISTANT]
+    matches = assistant.query_parser.parse(f"stats for {name}").players
+    player = assistant.players.get(matches[0] if matches else name)
+    if player is None:
+        raise web.HTTPNotFound(text=f"Player {name} not found.")
+    return web.json_response(player_json(player))
+
+
+async def handle_lineup(request):
+    return web.json_response(lineup_json(request.app[ASSISTANT]))
+
+
+async def handle_injuries(request):
+    return web.json_response(injuries_json(request.app[ASSISTANT]))
+
+
+async def handle_live_stats(request):
+    """Combined ESPN/NFL/Sleeper stats through the shared DataManager (async fetchers)"""
+    stats = await request.app[DATA_MANAGER].get_player_stats_async(request.match_info['name'])
+    if stats is None:
+        raise web.HTTPNotFound(text=f"No stats for {request.match_info['name']}.")
+    return web.json_response(stats)
+
+
+async def handle_waivers(request):
+    try:
+        limit = int(request.query.get('limit', 20))
+    except ValueError:
+        raise web.HTTPBadRequest(text="limit must be an integer")
+    data_manager = request.app[DATA_MANAGER]
+    recommendations = await run_blocking(
+        request, data_manager.get_waiver_recommendations, request.query.get('position'), limit
+    )
+    return web.json_response(recommendations, dumps=_dumps)
+
+
+async def handle_trade(request):
+    try:
+        body = await request.json()
+        giving, receiving = list(body['giving']), list(body['receiving'])
+    except (ValueError, KeyError, TypeError):
+        raise web.HTTPBadRequest(text="Expected {\"giving\": [...], \"receiving\": [...]}")
+    result = await run_blocking(request, request.app[DATA_MANAGER].evaluate_trade, giving, receiving)
+    return web.json_response(result)
+
+
+async def handle_metrics(request):
+    if request.query.get('format') == 'json':
+        return web.json_response(metrics.snapshot())
+    return web.Response(text=metrics.to_prometheus(), content_type='text/plain')
+
+
+async def handle_chat(request):
+    """Websocket chat: each text frame is a query, answered with structured_answer()"""
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+    assistant = request.app[ASSISTANT]
+    async for message in ws:
+        if message.type == WSMsgType.TEXT:
+            await ws.send_json(structured_answer(assistant, message.data))
+        elif message.type == WSMsgType.ERROR:
+            break
+    return ws
+
+
+def _json_safe(value):
+    """Replace NaN (missing projections) with None, which JSON can represent"""
+    if isinstance(value, float) and value != value:
+        return None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def _dumps(value):
+    return json.dumps(_json_safe(value))
+
+
+@web.middleware
+async def instrument(request, handler):
+    route = request.match_info.route.resource.canonical if request.match_info.route.resource else 'unmatched'
+    with metrics.timer('http_request_seconds', route=route, method=request.method):
+        try:
+            response = await handler(request)
+        except web.HTTPException as e:
+            metrics.inc('http_responses_total', route=route, status=str(e.status))
+            raise
+    metrics.inc('http_responses_total', route=route, status=str(response.status))
+    return response
+
+
+# App setup
+
+def create_app(assistant=None, data_manager=None, threads=None):
+    """
+    Build the aiohttp app. assistant/data_manager default to fresh
+    instances created at startup and closed on shutdown.
+    """
+    app = web.Application(middlewares=[instrument])
+    app[ASSISTANT] = assistant or FantasyFootballAssistant()
+    app[EXECUTOR] = ThreadPoolExecutor(
+        max_workers=threads or SERVER_CONFIG['THREADS'], thread_name_prefix='blocking-io'
+    )
+
+    async def open_resources(app):
+        if data_manager is None:
+            from data_manager import DataManager
+            app[DATA_MANAGER] = DataManager()
+            app[DATA_MANAGER].load_warm_snapshot()
+        else:
+            app[DATA_MANAGER] = data_manager
+
+    async def close_resources(app):
+        app[EXECUTOR].shutdown(wait=False, cancel_futures=True)
+        if data_manager is None:
+            await asyncio.to_thread(app[DATA_MANAGER].close)
+
+    app.on_startup.append(open_resources)
+    app.on_cleanup.append(close_resources)
+
+    app.router.add_route('GET', '/query', handle_query)
+    app.router.add_route('POST', '/query', handle_query)
+    app.router.add_get('/players/{name}', handle_player)
+    app.router.add_get('/players/{name}/live', handle_live_stats)
+    app.router.add_get('/lineup', handle_lineup)
+    app.router.add_get('/injuries', handle_injuries)
+    app.router.add_get('/waivers', handle_waivers)
+    app.router.add_post('/trade', handle_trade)
+    app.router.add_get('/metrics', handle_metrics)
+    app.router.add_get('/chat', handle_chat)
+    return app
+
+
+def _serve(host, port, reuse_port):
+    web.run_app(create_app(), host=host, port=port, reuse_port=reuse_port, print=None)
+
+
+def serve(host=None, port=None, workers=None):
+    """Run the server; with several workers each process binds the port with SO_REUSEPORT"""
+    host = host or SERVER_CONFIG['HOST']
+    port = port or SERVER_CONFIG['PORT']
+    workers = workers or SERVER_CONFIG['WORKERS']
+    print(f"Fantasy Football Assistant serving on http://{host}:{port} ({workers} worker(s))")
+    if workers <= 1:
+        _serve(host, port, reuse_port=False)
+        return
+
+    if not hasattr(os, 'fork') or not hasattr(socket, 'SO_REUSEPORT'):
+        print("Multiple workers need SO_REUSEPORT; running a single worker")
+        _serve(host, port, reuse_port=False)
+        return
+
+    processes = [
+        multiprocessing.Process(target=_serve, args=(host, port, True), name=f"server-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Fantasy Football Assistant over HTTP and websockets")
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Monte Carlo matchup simulator: correlated weekly fantasy point outcomes
+for whole lineups, drawn in one matrix product per matchup.
+
+Lineups come from Sleeper ids through DataManager.get_projections, and NFL
+opponents (for same-game correlation) from DataManager.get_matchups:
+
+    simulate_rosters(data_manager, ids_a, ids_b, seed=7)
+    simulate_league_week(data_manager, league_id, processes=4)
+
+    python simulation.py --league 1234567890 --sims 20000 --workers 4
+    python simulation.py --team-a 4046,6794 --team-b 4984,5859
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lineup_optimizer import normalize_position
+
+# Weekly standard deviation as a fraction of the projection
+POSITION_VARIANCE = {
+    'QB': 0.35,
+    'RB': 0.50,
+    'WR': 0.60,
+    'TE': 0.65,
+    'D/ST': 0.75,
+    'K': 0.50
+}
+DEFAULT_VARIANCE = 0.55
+# Minimum weekly standard deviation in points, so low projections still vary
+MIN_STD_DEV = 2.0
+
+# Correlation between two players on the same NFL team, by position pair
+SAME_TEAM_CORRELATION = {
+    frozenset(['QB', 'WR']): 0.35,
+    frozenset(['QB', 'TE']): 0.30,
+    frozenset(['QB', 'RB']): 0.10,
+    frozenset(['QB', 'K']): 0.15,
+    frozenset(['WR']): -0.05,
+    frozenset(['WR', 'TE']): -0.05,
+    frozenset(['RB']): -0.15,
+    frozenset(['RB', 'D/ST']): 0.10
+}
+# Correlation between players on opposing NFL teams in the same game
+OPPONENT_CORRELATION = {
+    frozenset(['QB']): 0.15,
+    frozenset(['QB', 'WR']): 0.10,
+    frozenset(['D/ST']): 0.0
+}
+OPPONENT_DEFENSE_CORRELATION = -0.20  # a D/ST against the opposing offense
+
+DEFAULT_SIMULATIONS = 20000
+
+
+def opponents_from_schedule(schedule):
+    """Build team -> opponent from a schedule list (as returned by DataManager.get_matchups)"""
+    opponents = {}
+    for game in schedule or []:
+        home = game.get('home') or game.get('home_team')
+        away = game.get('away') or game.get('away_team')
+        if home and away:
+            opponents[home] = away
+            opponents[away] = home
+    return opponents
+
+
+def lineup_from_ids(data_manager, player_ids):
+    """Build a simulator lineup from Sleeper ids using the registry and projections"""
+    registry = data_manager.get_registry()
+    lineup = []
+    for player_id in player_ids:
+        record = registry.get(player_id) or {}
+        projections = data_manager.get_projections(player_id) or {}
+        lineup.append({
+            'player_id': str(player_id),
+            'name': record.get('full_name'),
+            'position': record.get('position'),
+            'team': record.get('team'),
+            'projected_points': projections.get('points', 0.0)
+        })
+    return lineup
+
+
+def _pair_correlation(a, b, opponents):
+    pos_a, pos_b = normalize_position(a.get('position')), normalize_position(b.get('position'))
+    team_a, team_b = a.get('team'), b.get('team')
+    if not team_a or not team_b:
+        return 0.0
+    if team_a == team_b:
+        return SAME_TEAM_CORRELATION.get(frozenset([pos_a, pos_b]), 0.0)
+    if opponents.get(team_a) == team_b:
+        if (pos_a == 'D/ST') != (pos_b == 'D/ST'):
+            return OPPONENT_DEFENSE_CORRELATION
+        return OPPONENT_CORRELATION.get(frozenset([pos_a, pos_b]), 0.0)
+    return 0.0
+
+
+def outcome_model(players, opponents=None):
+    """Mean vector, standard deviations and Cholesky factor of the correlation matrix"""
+    opponents = opponents or {}
+    means = np.array([p.get('projected_points') or 0.0 for p in players], dtype=np.float64)
+    spreads = np.array(
+        [POSITION_VARIANCE.get(normalize_position(p.get('position')), DEFAULT_VARIANCE) for p in players]
+    )
+    std_devs = np.maximum(means * spreads, MIN_STD_DEV)
+
+    count = len(players)
+    correlation = np.eye(count)
+    for i in range(count):
+        for j in range(i + 1, count):
+            correlation[i, j] = correlation[j, i] = _pair_correlation(players[i], players[j], opponents)
+
+    # Hand-set correlations are not guaranteed positive definite; nudge the diagonal until they are
+    jitter = 0.0
+    while True:
+        try:
+            factor = np.linalg.cholesky(correlation + jitter * np.eye(count))
+            break
+        except np.linalg.LinAlgError:
+            jitter = jitter * 2 if jitter else 1e-6
+    return means, std_devs, factor
+
+
+def simulate_points(players, n_sims=DEFAULT_SIMULATIONS, rng=None, opponents=None):
+    """Draw (n_sims x players) correlated fantasy point outcomes, floored at 0"""
+    rng = rng if rng is not None else np.random.default_rng()
+    if not players:
+        return np.zeros((n_sims, 0))
+    means, std_devs, factor = outcome_model(players, opponents)
+    draws = rng.standard_normal((n_sims, len(players))) @ factor.T
+    return np.maximum(means + draws * std_devs, 0.0)
+
+
+def _distribution(totals):
+    percentiles = np.percentile(totals, [10, 25, 50, 75, 90])
+    return {
+        'mean': round(float(totals.mean()), 2),
+        'std_dev': round(float(totals.std()), 2),
+        'percentiles': {p: round(float(v), 2) for p, v in zip((10, 25, 50, 75, 90), percentiles)}
+    }
+
+
+def simulate_matchup(lineup_a, lineup_b, n_sims=DEFAULT_SIMULATIONS, seed=None, opponents=None):
+    """
+    Head-to-head simulation of two fantasy lineups. Players from both
+    lineups are drawn jointly so shared NFL games stay correlated.
+    """
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    points = simulate_points(list(lineup_a) + list(lineup_b), n_sims, rng, opponents)
+    totals_a = points[:, :len(lineup_a)].sum(axis=1)
+    totals_b = points[:, len(lineup_a):].sum(axis=1)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'win_probability_a': round(float((totals_a > totals_b).mean()), 4),
+        'win_probability_b': round(float((totals_b > totals_a).mean()), 4),
+        'tie_probability': round(float((totals_a == totals_b).mean()), 4),
+        'team_a': _distribution(totals_a),
+        'team_b': _distribution(totals_b),
+        'margin': _distribution(totals_a - totals_b),
+        'simulations': n_sims,
+        'simulations_per_second': round(n_sims / elapsed) if elapsed else None
+    }
+
+
+def simulate_start_sit(lineup, candidates, opponent_lineup, n_sims=DEFAULT_SIMULATIONS, seed=None, opponents=None):
+    """
+    Win probability with each candidate added to the rest of the lineup,
+    best first. The rest of the lineup and the opponent are drawn once;
+    each candidate is then drawn conditionally on those outcomes with the
+    same noise, so candidates are compared on identical opponent scores.
+    """
+    rng = np.random.default_rng(seed)
+    opponents = opponents or {}
+    fixed = list(lineup) + list(opponent_lineup)
+    normals = rng.standard_normal((n_sims, len(fixed)))
+    noise = rng.standard_normal(n_sims)
+    if fixed:
+        means, std_devs, factor = outcome_model(fixed, opponents)
+        points = np.maximum(means + (normals @ factor.T) * std_devs, 0.0)
+    else:
+        factor, points = np.zeros((0, 0)), np.zeros((n_sims, 0))
+    own = points[:, :len(lineup)].sum(axis=1)
+    against = points[:, len(lineup):].sum(axis=1)
+
+    results = []
+    for candidate in candidates:
+        mean, std_dev, _ = outcome_model([candidate])
+        # Correlated part from the fixed players' normals, independent remainder from the shared noise
+        loadings = np.linalg.solve(factor, [_pair_correlation(candidate, p, opponents) for p in fixed]) \
+            if fixed else np.zeros(0)
+        draws = normals @ loadings + np.sqrt(max(1.0 - float(loadings @ loadings), 0.0)) * noise
+        totals = own + np.maximum(mean[0] + draws * std_dev[0], 0.0)
+        results.append({
+            'player': candidate,
+            'win_probability': round(float((totals > against).mean()), 4),
+            'expected_points': round(float(totals.mean()), 2)
+        })
+    return sorted(results, key=lambda r: r['win_probability'], reverse=True)
+
+
+def _simulate_matchup_task(args):
+    lineup_a, lineup_b, n_sims, seed, opponents = args
+    return simulate_matchup(lineup_a, lineup_b, n_sims, seed, opponents)
+
+
+def simulate_week(matchups, n_sims=DEFAULT_SIMULATIONS, seed=None, opponents=None, processes=None):
+    """
+    Simulate a league-week of (lineup_a, lineup_b) matchups across a process
+    pool. Each matchup gets its own child seed, so results repeat exactly for
+    a given seed regardless of worker count or scheduling.
+    """
+    started = time.perf_counter()
+    seeds = np.random.SeedSequence(seed).spawn(len(matchups))
+    tasks = [(a, b, n_sims, child, opponents) for (a, b), child in zip(matchups, seeds)]
+
+    processes = processes if processes is not None else os.cpu_count()
+    if processes and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(tasks))) as pool:
+            results = list(pool.map(_simulate_matchup_task, tasks))
+    else:
+        results = [_simulate_matchup_task(task) for task in tasks]
+
+    elapsed = time.perf_counter() - started
+    total = n_sims * len(tasks)
+    return {
+        'matchups': results,
+        'simulations': total,
+        'elapsed_seconds': round(elapsed, 4),
+        'simulations_per_second': round(total / elapsed) if elapsed else None
+    }
+
+
+def simulate_rosters(data_manager, player_ids_a, player_ids_b, n_sims=DEFAULT_SIMULATIONS, seed=None, week=None):
+    """simulate_matchup for two lists of Sleeper ids, with the week's NFL schedule for correlation"""
+    opponents = opponents_from_schedule(data_manager.get_matchups(week))
+    return simulate_matchup(
+        lineup_from_ids(data_manager, player_ids_a), lineup_from_ids(data_manager, player_ids_b),
+        n_sims, seed, opponents
+    )
+
+
+def simulate_league_week(data_manager, league_id, n_sims=DEFAULT_SIMULATIONS, seed=None, week=None, processes=None):
+    """
+    simulate_week for every head-to-head matchup in a Sleeper league's
+    week, using each roster's starters. Matchup results carry matchup_id
+    and the two roster ids; None if the league's matchups can't be fetched.
+    """
+    league_matchups = data_manager.get_league_matchups(league_id, week)
+    if league_matchups is None:
+        return None
+    pairs = [
+        (matchup_id, list(rosters.items()))
+        for matchup_id, rosters in sorted(league_matchups.items(), key=lambda item: int(item[0]))
+        if len(rosters) == 2
+    ]
+    lineups = [
+        (lineup_from_ids(data_manager, starters_a), lineup_from_ids(data_manager, starters_b))
+        for _, ((_, starters_a), (_, starters_b)) in pairs
+    ]
+    opponents = opponents_from_schedule(data_manager.get_matchups(week))
+    result = simulate_week(lineups, n_sims, seed, opponents, processes)
+    for (matchup_id, ((roster_a, _), (roster_b, _))), outcome in zip(pairs, result['matchups']):
+        outcome.update({'matchup_id': matchup_id, 'roster_a': roster_a, 'roster_b': roster_b})
+    return result
+
+
+def main():
+    from data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Monte Carlo win probabilities for fantasy matchups")
+    parser.add_argument('--league', help="Sleeper league id: simulate every matchup of the week")
+    parser.add_argument('--team-a', help="comma-separated Sleeper ids of one lineup")
+    parser.add_argument('--team-b', help="comma-separated Sleeper ids of the other lineup")
+    parser.add_argument('--week', type=int)
+    parser.add_argument('--sims', type=int, default=DEFAULT_SIMULATIONS)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    if not args.league and not (args.team_a and args.team_b):
+        parser.error("give --league, or both --team-a and --team-b")
+
+    data_manager = DataManager()
+    try:
+        if args.league:
+            result = simulate_league_week(data_manager, args.league, args.sims, args.seed, args.week, args.workers)
+            if result is None:
+                print(f"No matchups found for league {args.league}")
+                return
+            matchups = result['matchups']
+        else:
+            result = simulate_rosters(
+                data_manager, args.team_a.split(','), args.team_b.split(','), args.sims, args.seed, args.week
+            )
+            matchups = [result]
+    finally:
+        data_manager.close()
+
+    for matchup in matchups:
+        label = f"Matchup {matchup['matchup_id']}: roster {matchup['roster_a']} vs {matchup['roster_b']}" \
+            if 'matchup_id' in matchup else "Team A vs Team B"
+        print(f"{label}: {matchup['win_probability_a']:.1%} / {matchup['win_probability_b']:.1%}, "
+              f"projected {matchup['team_a']['mean']} - {matchup['team_b']['mean']}")
+    print(f"{result['simulations']} simulations ({result['simulations_per_second']}/s)")
+
+
+if __name__ == "__main__":
+    main()
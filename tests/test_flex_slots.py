@@ -0,0 +1,69 @@
+"""Flex slots: no player starts twice, and narrower flex slots are filled first"""
+import numpy as np
+import pytest
+
+from lineup_optimizer import LineupOptimizer
+from trade_engine import TradeEngine
+
+# One QB and two RBs: after QB and RB, the second RB is the best FLEX and
+# the best SUPER_FLEX candidate, but can only fill one of them
+SUPER_FLEX_ROSTER = [
+    {'name': 'q1', 'position': 'QB', 'projected_points': 20.0, 'status': 'Active'},
+    {'name': 'r1', 'position': 'RB', 'projected_points': 15.0, 'status': 'Active'},
+    {'name': 'r2', 'position': 'RB', 'projected_points': 12.0, 'status': 'Active'},
+    {'name': 'w1', 'position': 'WR', 'projected_points': 5.0, 'status': 'Active'}
+]
+SUPER_FLEX_SLOTS = {'QB': 1, 'RB': 1, 'FLEX': 1, 'SUPER_FLEX': 1, 'BE': 2}
+
+# After the dedicated slots a WR (10) and an RB (5) are left. FLEX is listed
+# first, but REC_FLEX must take the WR, or it stays empty
+NESTED_ROSTER = [
+    {'name': 'r1', 'position': 'RB', 'projected_points': 20.0, 'status': 'Active'},
+    {'name': 'w1', 'position': 'WR', 'projected_points': 18.0, 'status': 'Active'},
+    {'name': 'w2', 'position': 'WR', 'projected_points': 10.0, 'status': 'Active'},
+    {'name': 'r2', 'position': 'RB', 'projected_points': 5.0, 'status': 'Active'}
+]
+NESTED_SLOTS = {'RB': 1, 'WR': 1, 'FLEX': 1, 'REC_FLEX': 1, 'BE': 2}
+
+
+def trade_engine(slots, roster):
+    engine = TradeEngine(slots, bench_weight=0.0)
+    return engine.refresh(
+        {'team': [p['name'] for p in roster]},
+        {p['name']: p['projected_points'] for p in roster},
+        {p['name']: p['position'] for p in roster}
+    )
+
+
+def test_optimizer_starts_each_player_once():
+    lineup = LineupOptimizer(SUPER_FLEX_SLOTS).optimize(SUPER_FLEX_ROSTER)
+    starters = {slot: player['name'] for slot, player in lineup['starters']}
+    assert starters == {'QB': 'q1', 'RB': 'r1', 'FLEX': 'r2', 'SUPER_FLEX': 'w1'}
+    assert lineup['projected_points'] == 52.0
+
+
+def test_optimizer_fills_narrowest_flex_first():
+    lineup = LineupOptimizer(NESTED_SLOTS).optimize(NESTED_ROSTER)
+    starters = {slot: player['name'] for slot, player in lineup['starters']}
+    assert starters == {'RB': 'r1', 'WR': 'w1', 'REC_FLEX': 'w2', 'FLEX': 'r2'}
+    assert not lineup['empty_slots']
+
+
+def test_trade_engine_starts_each_player_once():
+    assert trade_engine(SUPER_FLEX_SLOTS, SUPER_FLEX_ROSTER).roster_value('team') == pytest.approx(52.0)
+
+
+def test_trade_engine_fills_narrowest_flex_first():
+    assert trade_engine(NESTED_SLOTS, NESTED_ROSTER).roster_value('team') == pytest.approx(53.0)
+
+
+def test_trade_engine_matches_optimizer_across_candidates():
+    # Batched candidate rosters (trading each player away for nothing) agree with the optimizer
+    engine = trade_engine(SUPER_FLEX_SLOTS, SUPER_FLEX_ROSTER)
+    optimizer = LineupOptimizer(SUPER_FLEX_SLOTS)
+    removed = np.arange(len(SUPER_FLEX_ROSTER))[:, None]
+    nobody = np.zeros((len(removed), 0), dtype=np.int64)
+    values = engine._roster_values('team', removed, nobody.astype(float), nobody)
+    for i, value in enumerate(values):
+        rest = SUPER_FLEX_ROSTER[:i] + SUPER_FLEX_ROSTER[i + 1:]
+        assert value == pytest.approx(optimizer.optimize(rest)['projected_points'])
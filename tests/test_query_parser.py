@@ -0,0 +1,21 @@
+import pytest
+
+from query_parser import QueryParser
+
+
+@pytest.fixture
+def parser():
+    parser = QueryParser()
+    for name in ("Travis Kelce", "Justin Jefferson", "D'Andre Swift"):
+        parser.add_player(name)
+    return parser.build()
+
+
+@pytest.mark.parametrize('query, player', [
+    ("what are travis kelce's stats", "Travis Kelce"),
+    ("justin jefferson’s replacement", "Justin Jefferson"),
+    ("what about kelce's?", "Travis Kelce"),
+    ("how is d'andre swift doing", "D'Andre Swift")
+])
+def test_possessive_and_apostrophe_names_resolve(parser, query, player):
+    assert parser.parse(query).players == (player,)
@@ -0,0 +1,63 @@
+import pytest
+
+from simulation import simulate_matchup, simulate_start_sit, simulate_week
+
+OPPONENTS = {'KC': 'BUF', 'BUF': 'KC'}
+
+
+def player(position, team, points, name=None):
+    return {'name': name or f"{team} {position}", 'position': position, 'team': team, 'projected_points': points}
+
+
+LINEUP_A = [player('QB', 'KC', 22.0), player('WR', 'KC', 15.0), player('RB', 'SF', 14.0)]
+LINEUP_B = [player('QB', 'BUF', 21.0), player('WR', 'BUF', 13.0), player('TE', 'DAL', 10.0)]
+LINEUP_C = [player('RB', 'NYJ', 16.0), player('WR', 'MIA', 12.0)]
+LINEUP_D = [player('QB', 'DET', 20.0), player('K', 'DET', 8.0)]
+
+TIMING_FIELDS = ('simulations_per_second', 'elapsed_seconds')
+
+
+def without_timing(result):
+    return {key: value for key, value in result.items() if key not in TIMING_FIELDS}
+
+
+def test_matchup_repeats_for_a_seed():
+    first = simulate_matchup(LINEUP_A, LINEUP_B, 5000, seed=7, opponents=OPPONENTS)
+    second = simulate_matchup(LINEUP_A, LINEUP_B, 5000, seed=7, opponents=OPPONENTS)
+    assert without_timing(first) == without_timing(second)
+    assert without_timing(first) != without_timing(simulate_matchup(LINEUP_A, LINEUP_B, 5000, seed=8, opponents=OPPONENTS))
+
+
+def test_week_is_the_same_for_any_process_count():
+    matchups = [(LINEUP_A, LINEUP_B), (LINEUP_C, LINEUP_D), (LINEUP_B, LINEUP_C)]
+    serial = simulate_week(matchups, 5000, seed=11, opponents=OPPONENTS, processes=1)
+    parallel = simulate_week(matchups, 5000, seed=11, opponents=OPPONENTS, processes=2)
+    assert [without_timing(m) for m in serial['matchups']] == [without_timing(m) for m in parallel['matchups']]
+    assert serial['simulations'] == parallel['simulations'] == 3 * 5000
+
+
+def test_start_sit_repeats_for_a_seed():
+    candidates = [player('WR', 'KC', 12.0, 'a'), player('WR', 'BUF', 12.5, 'b'), player('TE', 'NYJ', 11.0, 'c')]
+    first = simulate_start_sit(LINEUP_A[:2], candidates, LINEUP_B, 5000, seed=3, opponents=OPPONENTS)
+    second = simulate_start_sit(LINEUP_A[:2], candidates, LINEUP_B, 5000, seed=3, opponents=OPPONENTS)
+    assert first == second
+
+
+def test_start_sit_compares_candidates_on_the_same_outcomes():
+    # Identical candidates must score identically, whatever else is on the list
+    twin = player('RB', 'NYJ', 12.0, 'twin')
+    alone = simulate_start_sit(LINEUP_A[:2], [twin], LINEUP_B, 5000, seed=5, opponents=OPPONENTS)
+    crowded = simulate_start_sit(
+        LINEUP_A[:2], [player('WR', 'BUF', 30.0), dict(twin), twin], LINEUP_B, 5000, seed=5, opponents=OPPONENTS
+    )
+    twins = [r for r in crowded if r['player']['name'] == 'twin']
+    assert twins[0]['win_probability'] == twins[1]['win_probability'] == alone[0]['win_probability']
+    assert twins[0]['expected_points'] == alone[0]['expected_points']
+
+
+def test_start_sit_matches_a_joint_simulation():
+    candidate = player('WR', 'BUF', 12.0)
+    conditional = simulate_start_sit(LINEUP_A[:2], [candidate], LINEUP_B, 100000, seed=1, opponents=OPPONENTS)[0]
+    joint = simulate_matchup(LINEUP_A[:2] + [candidate], LINEUP_B, 100000, seed=2, opponents=OPPONENTS)
+    assert conditional['win_probability'] == pytest.approx(joint['win_probability_a'], abs=0.01)
+    assert conditional['expected_points'] == pytest.approx(joint['team_a']['mean'], rel=0.01)
@@ -0,0 +1,204 @@
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from config import DEFAULT_LEAGUE_SETTINGS
+from lineup_optimizer import FLEX_ELIGIBILITY, POSITION_CODES, POSITIONS, normalize_position
+from scoring import player_values
+
+# Share of a bench player's value that counts toward roster value
+BENCH_WEIGHT = 0.25
+
+
+@lru_cache(maxsize=64)
+def _trade_index(size_a, size_b, max_players):
+    """
+    candidate_trades() arrays for two roster sizes. They only depend on the
+    sizes, so a league scan reuses them across team pairs (read-only).
+    """
+    def sides(size):
+        rows = [list(c) + [-1] * (max_players - k) for k in range(1, max_players + 1)
+                for c in combinations(range(size), k)]
+        return np.array(rows, dtype=np.int64).reshape(-1, max_players)
+
+    sides_a, sides_b = sides(size_a), sides(size_b)
+    multi_a, multi_b = (sides_a >= 0).sum(axis=1) > 1, (sides_b >= 0).sum(axis=1) > 1
+    pick_a, pick_b = np.meshgrid(np.arange(len(sides_a)), np.arange(len(sides_b)), indexing='ij')
+    # Skip n-for-m trades where both sides move more than one player
+    keep = ~(multi_a[pick_a] & multi_b[pick_b])
+    gives_a, gives_b = sides_a[pick_a[keep]], sides_b[pick_b[keep]]
+    gives_a.flags.writeable = gives_b.flags.writeable = False
+    return gives_a, gives_b
+
+
+def player_value_vector(data_manager, player_ids, stats_table=None, week=None):
+    """
+    Trade value for each player id, from the week's bulk projections and an
+    optional season stats DataFrame indexed by player id.
+    """
+    player_ids = [str(player_id) for player_id in player_ids]
+    projections = data_manager.get_week_projections(week)
+    if projections is not None:
+        projected = projections['points'].reindex(player_ids).fillna(0).to_numpy()
+    else:
+        projected = np.zeros(len(player_ids))
+    if stats_table is not None:
+        stats_table = stats_table.reindex(player_ids)
+    else:
+        stats_table = [{}] * len(player_ids)
+    return dict(zip(player_ids, player_values(stats_table, projected)))
+
+
+class TradeEngine:
+    """
+    Scores candidate trades by how much each side's roster value changes.
+    Roster value counts starters at full value (including the best FLEX
+    candidate) and bench depth at BENCH_WEIGHT, so trades that consolidate
+    depth into a starter or fill a hole can benefit both teams.
+    """
+
+    def __init__(self, roster_positions=None, bench_weight=BENCH_WEIGHT):
+        roster_positions = roster_positions or DEFAULT_LEAGUE_SETTINGS['roster_positions']
+        self.bench_weight = bench_weight
+        self.starters = np.zeros(len(POSITIONS), dtype=np.int64)
+        self.flex_rows = []
+        for slot, count in roster_positions.items():
+            slot = normalize_position(slot)
+            if slot in POSITION_CODES:
+                self.starters[POSITION_CODES[slot]] += count
+            elif slot in FLEX_ELIGIBILITY:
+                self.flex_rows.append(([POSITION_CODES[p] for p in FLEX_ELIGIBILITY[slot]], count))
+        # Narrowest flex slots are filled first, as LineupOptimizer does
+        self.flex_rows.sort(key=lambda row: len(row[0]))
+        self.rosters = {}
+
+    def refresh(self, rosters, values, positions):
+        """
+        Precompute per-team arrays. rosters maps team -> [player ids];
+        values and positions map player id -> value / position.
+        """
+        self.rosters = {}
+        for team, player_ids in rosters.items():
+            player_ids = [str(player_id) for player_id in player_ids]
+            self.rosters[team] = {
+                'ids': player_ids,
+                'values': np.array([values.get(pid, 0.0) for pid in player_ids], dtype=np.float64),
+                'positions': np.array(
+                    [POSITION_CODES.get(normalize_position(positions.get(pid)), -1) for pid in player_ids],
+                    dtype=np.int64
+                )
+            }
+        return self
+
+    def _roster_values(self, team, removed, added_values, added_positions):
+        """
+        Roster value for a batch of candidate rosters of one team.
+        removed: (n x g) roster indexes leaving the team (-1 = none).
+        added_values/added_positions: (n x r) players joining (position -1 = none).
+        """
+        roster = self.rosters[team]
+        count = len(removed)
+        size = len(roster['values'])
+        width = size + added_values.shape[1]
+
+        # (candidates x positions x slots) grid of player values, 0 where empty
+        grid = np.zeros((count, len(POSITIONS), width))
+        keep = np.ones((count, size), dtype=bool)
+        rows = np.repeat(np.arange(count), removed.shape[1])
+        flat_removed = removed.ravel()
+        valid = flat_removed >= 0
+        keep[rows[valid], flat_removed[valid]] = False
+
+        known = roster['positions'] >= 0
+        columns = np.arange(size)[known]
+        grid[:, roster['positions'][known], columns] = np.where(keep[:, known], roster['values'][known], 0.0)
+        for j in range(added_values.shape[1]):
+            joining = added_positions[:, j] >= 0
+            grid[np.arange(count)[joining], added_positions[joining, j], size + j] = added_values[joining, j]
+
+        ranked = -np.sort(-grid, axis=2)
+        starter_mask = np.arange(width)[None, :] < self.starters[:, None]
+        value = self.bench_weight * ranked.sum(axis=(1, 2))
+        value += (1 - self.bench_weight) * (ranked * starter_mask).sum(axis=(1, 2))
+
+        # FLEX slots take the best players left over after the dedicated slots
+        # and any narrower flex slot; taken counts the players used per position
+        taken = np.repeat(self.starters[None, :], count, axis=0)
+        for flex_positions, flex_count in self.flex_rows:
+            offsets = taken[:, flex_positions, None] + np.arange(flex_count)
+            leftovers = np.where(
+                offsets < width,
+                np.take_along_axis(ranked[:, flex_positions], np.minimum(offsets, width - 1), axis=2),
+                0.0
+            ).reshape(count, -1)
+            # Stable, so ties within a position are taken in rank order
+            best = np.argsort(-leftovers, axis=1, kind='stable')[:, :flex_count]
+            value += (1 - self.bench_weight) * np.take_along_axis(leftovers, best, axis=1).sum(axis=1)
+            picked = best // flex_count
+            for k, p in enumerate(flex_positions):
+                taken[:, p] += (picked == k).sum(axis=1)
+        return value
+
+    def roster_value(self, team):
+        empty = np.zeros((1, 0), dtype=np.int64)
+        return float(self._roster_values(team, empty - 1, np.zeros((1, 0)), empty)[0])
+
+    def candidate_trades(self, team_a, team_b, max_players=2):
+        """
+        Index arrays for every 1-for-1, 2-for-1 and 1-for-2 trade (up to
+        max_players per side). Returns (gives_a, gives_b), each (n x max_players)
+        with -1 padding.
+        """
+        return _trade_index(len(self.rosters[team_a]['ids']), len(self.rosters[team_b]['ids']), max_players)
+
+    def _incoming(self, team, gives):
+        roster = self.rosters[team]
+        valid = gives >= 0
+        values = np.where(valid, roster['values'][gives], 0.0)
+        positions = np.where(valid, roster['positions'][gives], -1)
+        return values, positions
+
+    def score_trades(self, team_a, team_b, gives_a, gives_b):
+        """Roster value change for both teams across a batch of candidate trades"""
+        values_a, positions_a = self._incoming(team_a, gives_a)
+        values_b, positions_b = self._incoming(team_b, gives_b)
+        delta_a = self._roster_values(team_a, gives_a, values_b, positions_b) - self.roster_value(team_a)
+        delta_b = self._roster_values(team_b, gives_b, values_a, positions_a) - self.roster_value(team_b)
+        return delta_a, delta_b
+
+    def best_trades(self, team_a, team_b, top_k=10, max_players=2, mutual_only=True):
+        """
+        Top-K trades between two rosters ranked by mutual benefit (the smaller
+        of the two teams' gains, then the combined gain).
+        """
+        gives_a, gives_b = self.candidate_trades(team_a, team_b, max_players)
+        if not len(gives_a):
+            return []
+        delta_a, delta_b = self.score_trades(team_a, team_b, gives_a, gives_b)
+
+        mutual = np.minimum(delta_a, delta_b)
+        candidates = np.flatnonzero(mutual > 0) if mutual_only else np.arange(len(mutual))
+        order = candidates[np.lexsort((-(delta_a + delta_b)[candidates], -mutual[candidates]))][:top_k]
+
+        ids_a, ids_b = self.rosters[team_a]['ids'], self.rosters[team_b]['ids']
+        return [
+            {
+                'team_a': team_a,
+                'team_b': team_b,
+                'team_a_gives': [ids_a[i] for i in gives_a[n] if i >= 0],
+                'team_b_gives': [ids_b[i] for i in gives_b[n] if i >= 0],
+                'team_a_gain': round(float(delta_a[n]), 2),
+                'team_b_gain': round(float(delta_b[n]), 2),
+                'mutual_benefit': round(float(mutual[n]), 2)
+            }
+            for n in order
+        ]
+
+    def league_trades(self, top_k=25, max_players=2):
+        """Best mutually beneficial trades across every pair of teams in the league"""
+        trades = []
+        for team_a, team_b in combinations(self.rosters, 2):
+            trades.extend(self.best_trades(team_a, team_b, top_k, max_players))
+        trades.sort(key=lambda t: (t['mutual_benefit'], t['team_a_gain'] + t['team_b_gain']), reverse=True)
+        return trades[:top_k]
@@ -0,0 +1,157 @@
+import numpy as np
+
+
+def trend_label(trend_value):
+    """Label for a trend value (recent-half average minus earlier-half average)"""
+    if trend_value > 3:
+        return "Strongly Improving"
+    elif trend_value > 1:
+        return "Slightly Improving"
+    elif trend_value < -3:
+        return "Strongly Declining"
+    elif trend_value < -1:
+        return "Slightly Declining"
+    else:
+        return "Stable"
+
+
+def trend_labels(trend_values):
+    """Vectorized trend_label; NaN (too little history) maps to None"""
+    trend_values = np.asarray(trend_values, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        labels = np.select(
+            [trend_values > 3, trend_values > 1, trend_values < -3, trend_values < -1],
+            ["Strongly Improving", "Slightly Improving", "Strongly Declining", "Slightly Declining"],
+            default="Stable"
+        ).astype(object)
+    labels[np.isnan(trend_values)] = None
+    return labels
+
+
+class TrendEngine:
+    """
+    Rolling means, EWMAs and least-squares slopes over several windows for
+    every player at once. update() folds in one week in O(players): each
+    window keeps running sums of y and x*y, and a ring buffer supplies the
+    value that falls out of the window.
+    """
+
+    def __init__(self, player_ids, positions=None, windows=(3, 4, 8), ewma_spans=(3, 6)):
+        self.player_ids = [str(player_id) for player_id in player_ids]
+        self.index = {player_id: i for i, player_id in enumerate(self.player_ids)}
+        self.positions = np.array(
+            [(positions or {}).get(player_id) for player_id in self.player_ids], dtype=object
+        )
+        self.windows = tuple(sorted(windows))
+        self.ewma_spans = tuple(ewma_spans)
+        self.weeks = 0
+
+        count = len(self.player_ids)
+        self.history = np.zeros((count, max(self.windows)))
+        self.count = np.zeros(count, dtype=np.int64)
+        self.sum_y = {w: np.zeros(count) for w in self.windows}
+        self.sum_xy = {w: np.zeros(count) for w in self.windows}
+        self.ewma = {span: np.full(count, np.nan) for span in self.ewma_spans}
+
+    def _aligned(self, week_points):
+        if isinstance(week_points, dict):
+            values = np.full(len(self.player_ids), np.nan)
+            for player_id, points in week_points.items():
+                i = self.index.get(str(player_id))
+                if i is not None:
+                    values[i] = points
+            return values
+        return np.asarray(week_points, dtype=np.float64)
+
+    def update(self, week_points):
+        """
+        Fold in one week of points: an array aligned with player_ids or a
+        {player_id: points} dict. NaN / missing players (byes, injuries) are
+        skipped and keep their previous state.
+        """
+        values = self._aligned(week_points)
+        played = np.flatnonzero(~np.isnan(values))
+        y = values[played]
+        seen = self.count[played]
+        depth = self.history.shape[1]
+
+        for w in self.windows:
+            full = seen >= w
+            dropped = np.where(full, self.history[played, (seen - w) % depth], 0.0)
+            sum_y = self.sum_y[w][played]
+            # Full window: every x shifts down by one as the oldest point leaves
+            self.sum_xy[w][played] = np.where(
+                full,
+                self.sum_xy[w][played] - (sum_y - dropped) + (w - 1) * y,
+                self.sum_xy[w][played] + seen * y
+            )
+            self.sum_y[w][played] = sum_y - dropped + y
+
+        for span in self.ewma_spans:
+            alpha = 2.0 / (span + 1)
+            previous = self.ewma[span][played]
+            self.ewma[span][played] = np.where(np.isnan(previous), y, alpha * y + (1 - alpha) * previous)
+
+        self.history[played, seen % depth] = y
+        self.count[played] += 1
+        self.weeks += 1
+
+    def rolling_mean(self, window):
+        n = np.minimum(self.count, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(n > 0, self.sum_y[window] / n, np.nan)
+
+    def slope(self, window):
+        """Least-squares points-per-week slope over the last `window` games (NaN under 2 games)"""
+        n = np.minimum(self.count, window).astype(np.float64)
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        denominator = n * sum_xx - sum_x ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope = (n * self.sum_xy[window] - sum_x * self.sum_y[window]) / denominator
+        return np.where(n >= 2, slope, np.nan)
+
+    def metrics(self, window=4):
+        """
+        DataFrame indexed by player id: rolling mean, EWMAs, slope, numeric
+        trend (slope scaled to the half-window difference calculate_trend
+        uses) and its label.
+        """
+        if window not in self.windows:
+            raise ValueError(f"Window {window} is not tracked; choose from {self.windows}")
+        import pandas as pd
+
+        slope = self.slope(window)
+        n = np.minimum(self.count, window)
+        # For a linear run of n games, mean(second half) - mean(first half) = slope * n / 2
+        trend = slope * n / 2
+        frame = pd.DataFrame({
+            'position': self.positions,
+            'games': self.count,
+            f'mean_{window}': self.rolling_mean(window),
+            **{f'ewma_{span}': self.ewma[span] for span in self.ewma_spans},
+            'slope': slope,
+            'trend': trend,
+            'label': trend_labels(trend)
+        }, index=pd.Index(self.player_ids, name='player_id'))
+        return frame
+
+    def trending(self, position=None, direction='up', window=4, top=10, min_games=2):
+        """Players with the strongest up (or down) trend, optionally at one position"""
+        frame = self.metrics(window)
+        frame = frame[frame['games'] >= min_games]
+        if position is not None:
+            frame = frame[frame['position'] == position]
+        return frame.sort_values('trend', ascending=(direction != 'up')).head(top)
+
+    @classmethod
+    def from_history(cls, store, seasons=None, points_column='fantasy_points_ppr', **kwargs):
+        """Seed an engine week by week from a HistoricalStatsStore"""
+        frame = store.query([points_column], seasons=seasons)
+        positions = dict(zip(frame['player_id'], frame['position']))
+        engine = cls(list(positions), positions, **kwargs)
+        table = frame.pivot_table(index=['season', 'week'], columns='player_id', values=points_column)
+        table = table.reindex(columns=engine.player_ids)
+        for row in table.to_numpy():
+            engine.update(row)
+        return engine
@@ -1,5 +1,8 @@
-import re
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from query_parser import PLAYER_PHRASE_PATTERNS, extract_position
+from scoring import score_stats
+from trends import trend_label
 
 # Constants for scoring settings (standard scoring)
 SCORING_SETTINGS = {
@@ -30,17 +33,10 @@ class TextProcessor:
     @staticmethod
     def extract_player_name(text):
         """Extract player name from user input"""
-        # Common patterns for player name queries
-        patterns = [
-            r"stats for (.+?)(?:\?|$)",
-            r"how is (.+?) doing",
-            r"what about (.+?)(?:\?|$)",
-            r"start (.+?) or",
-            r"should i start (.+?)(?:\?|$)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text.lower())
+        # Common patterns for player name queries (precompiled in query_parser)
+        text = text.lower()
+        for pattern in PLAYER_PHRASE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip().title()
         return None
@@ -48,38 +44,13 @@ class TextProcessor:
     @staticmethod
     def extract_position(text):
         """Extract position from user input"""
-        positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DST']
-        text = text.upper()
-        for pos in positions:
-            if pos in text:
-                return pos
-        return None
+        return extract_position(text)
 
 class StatCalculator:
     @staticmethod
     def calculate_fantasy_points(stats, scoring_settings=SCORING_SETTINGS):
         """Calculate fantasy points based on player stats and scoring settings"""
-        points = 0
-        
-        # Passing points
-        points += stats.get('passing_yards', 0) * scoring_settings['passing_yard']
-        points += stats.get('passing_touchdowns', 0) * scoring_settings['passing_touchdown']
-        points += stats.get('interceptions', 0) * scoring_settings['interception']
-        
-        # Rushing points
-        points += stats.get('rushing_yards', 0) * scoring_settings['rushing_yard']
-        points += stats.get('rushing_touchdowns', 0) * scoring_settings['rushing_touchdown']
-        
-        # Receiving points
-        points += stats.get('receptions', 0) * scoring_settings['reception']
-        points += stats.get('receiving_yards', 0) * scoring_settings['receiving_yard']
-        points += stats.get('receiving_touchdowns', 0) * scoring_settings['receiving_touchdown']
-        
-        # Miscellaneous
-        points += stats.get('fumbles_lost', 0) * scoring_settings['fumble_lost']
-        points += stats.get('two_point_conversions', 0) * scoring_settings['two_point_conversion']
-        
-        return round(points, 2)
+        return score_stats(stats, scoring_settings)
 
     @staticmethod
     def calculate_trend(historical_points, weeks=4):
@@ -88,21 +59,16 @@ class StatCalculator:
             return None
             
         recent_points = historical_points[-weeks:]
-        avg_first_half = sum(recent_points[:len(recent_points)//2]) / (len(recent_points)//2)
-        avg_second_half = sum(recent_points[len(recent_points)//2:]) / (len(recent_points)//2)
-        
-        trend_value = avg_second_half - avg_first_half
+        # The later half gets the odd game out
+        first_half = recent_points[:len(recent_points)//2]
+        second_half = recent_points[len(recent_points)//2:]
+        if not first_half or not second_half:
+            # A window under two games (e.g. weeks=1) has nothing to compare
+            return None
+        avg_first_half = sum(first_half) / len(first_half)
+        avg_second_half = sum(second_half) / len(second_half)
         
-        if trend_value > 3:
-            return "Strongly Improving"
-        elif trend_value > 1:
-            return "Slightly Improving"
-        elif trend_value < -3:
-            return "Strongly Declining"
-        elif trend_value < -1:
-            return "Slightly Declining"
-        else:
-            return "Stable"
+        return trend_label(avg_second_half - avg_first_half)
 
 def format_player_stats(stats, include_projections=True):
     """Format player stats into readable string"""